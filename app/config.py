@@ -17,6 +17,17 @@ config.py
 # Chroma 벡터 DB 저장 경로
 VECTOR_DB_PATH = "chroma_db"
 
+# NumPy 벡터 인덱스 저장 경로 (VECTOR_BACKEND = "numpy"일 때 사용)
+# - vectors.npy: 정규화된 float32 임베딩 행렬 / documents.json: 문서 본문 + 메타데이터
+NUMPY_INDEX_PATH = "numpy_index"
+
+# FAISS 인덱스 저장 경로 (VECTOR_BACKEND = "faiss"일 때 사용)
+# - index.faiss: FAISS 인덱스 / documents.json: 문서 본문 + 메타데이터
+FAISS_INDEX_PATH = "faiss_index"
+
+# BM25 lexical 색인 파일 이름 (create_vector_db 실행 시 벡터 인덱스와 같은 스냅샷 폴더에 생성, USE_HYBRID_SEARCH일 때 사용)
+LEXICAL_INDEX_PATH = "lexical_index.json"
+
 
 # ===============================
 # 🤖 LLM 설정
@@ -36,14 +47,132 @@ LLM_TEMPERATURE = 0.1
 # 임베딩 모델 이름
 EMBEDDING_MODEL_NAME = "text-embedding-3-small"
 
+# 임베딩 캐시 사용 여부
+# - key: (임베딩 모델 이름, 정규화된 텍스트) → 같은 검색어 / 문서는 임베딩 API를 다시 호출하지 않음
+# - 질의 임베딩과 create_vector_db의 문서 임베딩 모두 적용
+USE_EMBEDDING_CACHE = False
+
+# 메모리에 보관할 최대 벡터 수 (LRU)
+EMBEDDING_CACHE_MAX_SIZE = 10000
+
+# SQLite 영속화 경로 (None이면 메모리에만 보관)
+EMBEDDING_CACHE_DB_PATH = "cache/embedding_cache.sqlite3"
+
+
+# ===============================
+# 🧹 색인 전 중복 제거 (create_vector_db)
+# ===============================
+
+# 근중복 QA 문서 병합 사용 여부
+# - 문자 n-gram MinHash + LSH로 후보를 찾고 실제 Jaccard 유사도로 확인 (임베딩 API 호출 없음)
+# - 군집별 대표 문서(본문이 가장 긴 문서)만 색인하고, 병합된 doc_id는 metadata["merged_doc_ids"]에 쉼표로 기록
+# - 색인에서 문서가 빠지므로 기본값은 사용 안 함. 켜려면 True로 바꾸고 create_vector_db를 다시 실행
+# - 무엇이 빠지는지 확인: create_vector_db가 "대표 doc_id <- 병합된 doc_id" 목록을 출력하므로
+#   먼저 새 스냅샷을 만들어 목록을 검토하고, 의도치 않은 병합이면 DEDUP_JACCARD_THRESHOLD를 높이거나 끈 뒤 다시 생성
+USE_DEDUP = False
+
+# 병합 범위: 이 metadata 값이 모두 같은 문서끼리만 비교
+# (반납 / 불용 / 처분처럼 장만 다르고 문장 틀이 같은 QA가 병합되지 않도록 매뉴얼 장 파일 단위로 제한)
+DEDUP_SCOPE_FIELDS = ["source"]
+
+# 근중복 판단 Jaccard 유사도 기준
+DEDUP_JACCARD_THRESHOLD = 0.8
+
+# shingle 문자 수 / MinHash 해시 수 / LSH band 수 (DEDUP_NUM_PERM은 DEDUP_BANDS의 배수)
+DEDUP_SHINGLE_SIZE = 5
+DEDUP_NUM_PERM = 128
+DEDUP_BANDS = 32
+
 
 # ===============================
 # 🔍 Retriever 설정
 # ===============================
 
+# 벡터 검색 백엔드
+# - "chroma": Chroma(HNSW) 벡터 DB (VECTOR_DB_PATH)
+# - "numpy": memmap .npy 기반 브루트포스 검색 (NUMPY_INDEX_PATH), 수천 건 규모에서 클라이언트 오버헤드 없음
+# - "faiss": FAISS 인덱스 (FAISS_INDEX_PATH, 종류는 FAISS_INDEX_TYPE)
+# 백엔드를 바꾸면 scripts_/create_vector_db.py로 인덱스를 다시 생성해야 합니다.
+VECTOR_BACKEND = "chroma"
+
+# NumPy 인덱스 양자화 형식 (create_vector_db 생성 시점에 적용, 검색 코드는 저장된 형식을 자동 인식)
+# - None: float32 행렬만 저장 / 전체 스캔
+# - "int8": 차원별 scale int8 code 행렬을 추가 저장 → code 행렬(float32의 1/4)만 전체 스캔하고
+#   상위 후보는 memmap float32 행으로 정확한 점수를 다시 계산 (반환 score는 float32 결과와 동일)
+NUMPY_QUANTIZATION = None
+
+# int8 근사 검색 후 정확히 재계산할 후보 배수 (top_k * factor)
+QUANTIZATION_RESCORE_FACTOR = 4
+
 # 검색 시 가져올 문서 개수
 RETRIEVER_TOP_K = 25
 
+# Hybrid 검색 (dense + BM25 lexical) 사용 여부
+# - 한국어 문자 bigram BM25 결과와 dense 결과를 RRF(Reciprocal Rank Fusion)로 병합
+# - 병합 결과 score는 0~1 범위의 의사 거리(낮을수록 상위)로 반환되어 threshold / 정렬 로직과 호환
+# - 정확한 용어 매칭이 보완되므로 RETRIEVER_TOP_K를 줄여 Re-ranking 비용을 낮출 수 있음
+USE_HYBRID_SEARCH = False
+
+# FAISS 인덱스 종류 ("flat" | "hnsw" | "ivfpq")
+# - flat: 정확 검색 / hnsw: 그래프 기반 근사 검색 / ivfpq: 클러스터 + 곱 양자화 압축 근사 검색
+FAISS_INDEX_TYPE = "flat"
+
+# HNSW: 노드당 연결 수, 생성 / 검색 시 탐색 폭
+FAISS_HNSW_M = 32
+FAISS_HNSW_EF_CONSTRUCTION = 200
+FAISS_HNSW_EF_SEARCH = 64
+
+# IVF-PQ: 클러스터 수, 검색 시 탐색할 클러스터 수, PQ 서브벡터 수(임베딩 차원의 약수), 코드 비트 수
+# (문서 수가 적으면 생성 시 nlist / nbits를 자동으로 줄임)
+FAISS_IVF_NLIST = 64
+FAISS_IVF_NPROBE = 8
+FAISS_PQ_M = 64
+FAISS_PQ_NBITS = 8
+
+# lexical 검색에서 가져올 후보 수 (None이면 RETRIEVER_TOP_K와 동일)
+HYBRID_LEXICAL_TOP_K = None
+
+# RRF 상수 k (score = Σ 1 / (k + rank))
+RRF_K = 60
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Multi-query 검색 사용 여부
+# - 검색어 정제 단계에서 MULTI_QUERY_COUNT개의 검색어 변형을 생성하고, 원본 질문과 함께
+#   embed_documents 1회로 임베딩한 뒤 병렬 검색하여 RRF로 병합 (Re-ranking은 대표 검색어 기준)
+# - 병합 결과 score는 Hybrid 검색과 같은 0~1 의사 거리
+USE_MULTI_QUERY = False
+
+# 생성할 검색어 변형 수 (2~4 권장)
+MULTI_QUERY_COUNT = 3
+
+# 검색어 변형 병렬 검색에 사용할 최대 스레드 수 (요청 간 공유)
+MULTI_QUERY_MAX_WORKERS = 8
+
+# 메타데이터 필터 검색 사용 여부
+# - Planner가 출력한 장(chapter) 또는 검색어 키워드로 추정한 장으로 검색 범위를 좁힘
+#   (Chroma: where 절 push-down / NumPy·FAISS·BM25: 해당 장 문서만 대상으로 검색)
+# - 문서 메타데이터의 chapter_major(장 대분류 번호) 필드를 사용하므로 scripts_/create_vector_db.py로 인덱스를 다시 생성해야 합니다.
+USE_METADATA_FILTER = False
+
+# 필터 검색 결과가 이 값보다 적으면 필터 없이 전체 검색으로 재시도
+METADATA_FILTER_MIN_RESULTS = 3
+
+# 장(대분류 번호)별 검색어 키워드 (공백 제거 후 포함 여부로 판단)
+# - 한 장의 키워드만 포함된 경우에만 필터 적용 (여러 장에 걸친 질문은 전체 검색)
+METADATA_FILTER_CHAPTER_KEYWORDS = {
+    "1": ["취득"],
+    "2": ["운용대장", "운용정보", "라벨", "물품고유번호"],
+    "3": ["반납"],
+    "4": ["불용"],
+    "5": ["처분"],
+    "6": ["보유현황"],
+    "7": ["사용주기", "수명예측"],
+    "8": ["챗봇"],
+}
+
 # 유사도/거리 점수 threshold
 # 값이 작을수록 더 유사하며, threshold 초과 문서는 폐기
 SIMILARITY_SCORE_THRESHOLD = 10.0
@@ -70,9 +199,93 @@ RERANK_CANDIDATE_K = 15
 # Re-ranking 이후 최종 Context 개수
 RERANK_TOP_N = 10
 
+# Cross-Encoder 실행 백엔드
+# - "torch": sentence-transformers CrossEncoder (PyTorch)
+# - "onnx": ONNX로 변환한 모델을 onnxruntime으로 실행 (CPU 전용 노드용, 점수는 torch와 동일 수준)
+# - "onnx-int8": ONNX 모델에 동적 int8 양자화를 적용해 실행 (가장 빠르지만 점수가 약간 달라질 수 있음)
+# ONNX 모델은 최초 로딩 시 RERANKER_ONNX_DIR/<모델 이름>에 변환 / 저장한 뒤 재사용 (onnx / onnxruntime 필요)
+RERANKER_BACKEND = "torch"
+
+# ONNX 변환 모델 저장 경로
+RERANKER_ONNX_DIR = "models/reranker_onnx"
+
+# onnxruntime 연산 스레드 수 (None이면 onnxruntime 기본값 - 물리 코어 수)
+RERANKER_ONNX_THREADS = None
+
+# Cross-Encoder 채점 배치 크기 (predict batch_size, CPU에서는 작을수록 padding 낭비가 적음, 측정: scripts_/benchmark_reranker.py)
+RERANK_BATCH_SIZE = 8
+
+# (질의, 문서) 쌍 최대 토큰 길이 - 초과분은 잘라서 채점 (None이면 모델 기본값)
+RERANK_MAX_LENGTH = 512
+
+# 길이 기반 배치 구성 사용 여부
+# - (질의, 문서) 쌍을 길이순으로 정렬해 비슷한 길이끼리 같은 배치로 채점 → 배치 내 padding 감소
+# - 점수는 원래 후보 순서로 복원하여 반환
+RERANK_LENGTH_BUCKETING = True
+
+# Re-ranking 점수 캐시 사용 여부
+# - key: (refined query 해시[연속 공백만 축약], 문서 doc_id + 본문 해시, 모델 버전 해시[모델 이름 + max_length + RERANKER_BACKEND])
+# - 캐시에 없는 (질의, 문서) 쌍만 Cross-Encoder로 채점, 적중률은 rag.rerank_cache.hits / misses 지표로 확인
+USE_RERANK_CACHE = False
+
+# 메모리에 보관할 최대 점수 수 (LRU)
+RERANK_CACHE_MAX_SIZE = 20000
+
 # Re-ranking score 로그 출력 여부 (디버깅/평가용)
 RERANK_DEBUG = False
 
+# Cascade Re-ranking 사용 여부
+# - 저렴한 점수(CASCADE_SCORER)로 후보를 먼저 정렬해 상위 CASCADE_PREFILTER_K개만 Cross-Encoder로 채점
+# - 저렴한 점수 1위와 2위 차이가 CASCADE_SKIP_MARGIN 이상이면(확실한 1위) Cross-Encoder를 생략
+# - 품질 영향은 scripts_/eval_cascade.py로 QA 정답셋 기준 측정
+USE_CASCADE_RERANK = False
+
+# 저렴한 점수 종류
+# - "retrieval": 검색 단계 거리 점수 재사용 (추가 연산 없음, 후보는 이미 거리순이므로 사실상 상위 K개 절단 + 생략 판단만 수행)
+# - "lexical": 검색어 토큰(한글 bigram / 영문·숫자 단어) 중 문서에 포함된 비율 (0~1, 검색 순서와 독립적인 신호)
+CASCADE_SCORER = "retrieval"
+
+# Cross-Encoder로 채점할 최대 후보 수
+CASCADE_PREFILTER_K = 5
+
+# 1위 / 2위 저렴한 점수 차이가 이 값 이상이면 Cross-Encoder 생략 (None이면 항상 채점)
+# - "retrieval": dense 검색 거리(정규화 벡터의 squared L2 = 2 - 2cos, Chroma / NumPy / FAISS) 기준으로 맞춘 값
+#   USE_HYBRID_SEARCH / USE_MULTI_QUERY 결과는 RRF 의사 거리(1 - rrf / 최대 rrf)라 상위 후보끼리 값이 촘촘하여
+#   같은 margin을 쓸 수 없으므로 생략 판단을 끄고 상위 CASCADE_PREFILTER_K개 채점만 수행
+# - "lexical": 검색 방식과 무관하게 검색어 토큰 포함 비율 차이 기준
+CASCADE_SKIP_MARGIN = 0.15
+
+# 적응형 후보 수(Adaptive Depth) 사용 여부
+# - 검색 거리 점수 분포를 보고 Re-ranking 후보 수 / 최종 Context 수를 질의마다 결정
+#   (최상위 문서 대비 ADAPTIVE_SCORE_MARGIN 밖의 후보 제외 + 가장 큰 점수 간격에서 자르기)
+# - RERANK_CANDIDATE_K / RERANK_TOP_N / TOP_N_CONTEXT는 상한으로 사용
+# - 점수 기준값은 거리(squared L2) 척도 기준이며, Hybrid 검색(RRF 의사 거리)에서는 간격이 작아 거의 자르지 않음
+USE_ADAPTIVE_DEPTH = False
+
+# 최소 후보 수 (이보다 적게 자르지 않음)
+ADAPTIVE_MIN_CANDIDATES = 3
+
+# 최상위 문서 거리 + margin을 넘는 후보는 제외 (None이면 적용 안 함)
+ADAPTIVE_SCORE_MARGIN = 0.3
+
+# 인접 후보 간 거리 간격이 이 값 이상이면 그 지점에서 자름
+ADAPTIVE_MIN_SCORE_GAP = 0.08
+
+# MMR(Maximal Marginal Relevance) 기반 Context 선택 사용 여부
+# - Re-ranking(또는 상위 N개 선택) 이후 문서들 중 서로 겹치는 문서를 덜어내고, CONTEXT_TOKEN_BUDGET 안에서 다양한 문서를 고름
+# - 문서 임베딩은 색인에 저장된 벡터를 재사용 (임베딩 API 호출 없음, 벡터를 못 구하면 순위 순서로 토큰 예산만 적용)
+USE_MMR_CONTEXT = False
+
+# relevance(Re-ranking 순위) 대 다양성 가중치 (1.0이면 순위 그대로, 낮을수록 다양성 우선)
+MMR_LAMBDA = 0.7
+
+# 최종 Context에 넣을 문서 본문의 최대 토큰 수 (tiktoken, LLM_MODEL_NAME 기준)
+# (최상위 문서 1개는 예산을 넘더라도 항상 포함)
+CONTEXT_TOKEN_BUDGET = 2000
+
+# 이미 선택된 문서와 임베딩 코사인 유사도가 이 값 이상이면 중복으로 보고 제외 (None이면 적용 안 함)
+MMR_REDUNDANCY_THRESHOLD = 0.95
+
 
 # ===============================
 # 🗣️ 프롬프트 관련 설정
@@ -92,5 +305,111 @@ ENABLE_SAFETY_PROMPT = True
 # Function Calling 판단 규칙 포함 여부
 ENABLE_FUNCTION_DECISION_PROMPT = True
 
+# CLI(app/main.py) 답변 토큰 스트리밍 출력 여부
+ENABLE_STREAMING = True
+
 # 시스템 오류(네트워크, API 등) 발생 시 나갈 메시지
-TECHNICAL_ERROR_RESPONSE = "시스템 오류가 발생하여 답변을 생성할 수 없습니다. 잠시 후 다시 시도해주세요."
\ No newline at end of file
+TECHNICAL_ERROR_RESPONSE = "시스템 오류가 발생하여 답변을 생성할 수 없습니다. 잠시 후 다시 시도해주세요."
+
+# ===============================
+# 🛠️ Tool 실행 설정
+# ===============================
+
+# Router가 여러 도구를 호출한 경우 병렬 실행 여부
+# - ToolMessage 순서는 호출 순서대로 유지되며, 도구별 오류는 개별 처리됨
+TOOL_PARALLEL_EXECUTION = True
+
+# 도구 병렬 실행에 사용할 최대 스레드 수 (백엔드 HTTP 동시 요청 수 상한)
+TOOL_MAX_WORKERS = 4
+
+
+# ===============================
+# 🧭 Planner 설정
+# ===============================
+
+# Planner 모드 사용 여부
+# - True: Router 호출 1회로 도구 호출 / NEED_RAG 여부 / 검색어 정제를 함께 판단
+# - 출력 파싱 실패 시 기존 다단계 경로(Classifier → Refiner)로 자동 전환
+USE_PLANNER = False
+
+
+# ===============================
+# ⚡ Speculative Execution 설정
+# ===============================
+
+# Router(도구 판단) 호출과 동시에 Classifier / 검색어 정제 + 검색을 미리 시작할지 여부
+# - 도구 경로가 선택되면 선행 작업 결과는 폐기(취소)됩니다.
+# - Planner 모드(USE_PLANNER)에서는 분류/정제 호출이 없으므로 적용되지 않습니다.
+USE_SPECULATIVE_EXECUTION = False
+
+# 동기 체인에서 선행 작업을 실행할 스레드 수 (요청당 2개 작업 사용)
+SPECULATIVE_MAX_WORKERS = 8
+
+
+# ===============================
+# 🗃️ Semantic Answer Cache 설정
+# ===============================
+
+# 질의 임베딩 기반 답변 캐시 사용 여부
+# - Router가 도구를 선택하지 않은 질문만 조회 (도구/페이지 이동 질문에는 캐시된 답변을 쓰지 않음)
+# - 도구/페이지 이동 응답(실시간 자산 데이터)과 오류 응답은 캐시하지 않음
+# - 조회에 쓴 질의 임베딩은 검색 단계에서 재사용 (검색어가 원본 질문과 같을 때 / Multi-query의 원본 질문)
+# - 벡터 DB 또는 faq_data.json이 바뀌면 자동 무효화
+USE_SEMANTIC_CACHE = False
+
+# 캐시 적중으로 판단할 최소 코사인 유사도
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# 캐시 항목 유효 시간 (초)
+SEMANTIC_CACHE_TTL_SECONDS = 3600
+
+# 캐시 최대 저장 개수 (초과 시 LRU 제거)
+SEMANTIC_CACHE_MAX_SIZE = 512
+
+
+# ===============================
+# 🧷 Stage Memoization 설정
+# ===============================
+
+# 질문 분류 / 검색어 정제 결과 메모이제이션 사용 여부
+# - key: 정규화된 질문 + 프롬프트 템플릿 해시 + LLM 설정(모델 이름, temperature) (템플릿이나 모델이 바뀌면 자동으로 새 key 사용)
+USE_STAGE_MEMO = False
+
+# 메모리에 보관할 최대 항목 수 (LRU)
+STAGE_MEMO_MAX_SIZE = 4096
+
+# SQLite 영속화 경로 (None이면 메모리에만 보관)
+# 예: "cache/stage_memo.sqlite3"
+STAGE_MEMO_DB_PATH = None
+
+
+# ===============================
+# 📊 Metrics (단계별 계측) 설정
+# ===============================
+
+# 결과 dict에 단계별 측정값("timings" 블록) 포함 여부
+# - 전역 지표 저장소(rag.metrics.get_metrics_registry) 집계는 설정과 무관하게 항상 수행
+INCLUDE_TIMINGS_IN_RESULT = False
+
+# 단계 latency 히스토그램 구간 상한 (밀리초)
+METRICS_LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+# 단계 토큰 사용량 히스토그램 구간 상한 (input + output 토큰)
+METRICS_TOKEN_BUCKETS = [50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000]
+
+# 후보 / Context 문서 수 히스토그램 구간 상한
+METRICS_COUNT_BUCKETS = [1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 25, 50]
+
+
+# ===============================
+# 🔄 Index Snapshot (무중단 교체) 설정
+# ===============================
+
+# create_vector_db 실행 시 보관할 이전 스냅샷 수 (현재 버전 제외, 공개(PUBLISHED)된 버전만 대상)
+# - 현재 버전의 직전 공개 버전(롤백 대상)은 이 값과 무관하게 항상 보관
+# - <인덱스 경로>/versions/<버전>에 생성 후 <인덱스 경로>/CURRENT를 원자적으로 교체
+VECTOR_SNAPSHOT_KEEP = 2
+
+# 서비스 프로세스가 CURRENT 변경을 확인하는 주기 (초)
+# - 새 스냅샷은 백그라운드에서 로딩 / 예열 후 요청 사이에 교체
+VECTOR_RELOAD_INTERVAL_SECONDS = 10
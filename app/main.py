@@ -4,9 +4,10 @@ import os
 from dotenv import load_dotenv                      # 환경 변수 로드
 from langchain_openai import ChatOpenAI             # LLM
 from ingestion.embedder import get_embedding_model  # 임베딩
-from vectorstore.chroma_store import load_chroma_db # DB 로드
-from rag.chain import run_rag_chain                 # RAG 체인
-from app.config import VECTOR_DB_PATH, LLM_MODEL_NAME, LLM_TEMPERATURE
+from vectorstore.store_factory import get_vector_store_path # DB 경로
+from vectorstore.hot_reload import VectorStoreReloader  # DB 로드 + 무중단 교체
+from rag.chain import RagPipeline  # RAG 체인
+from app.config import LLM_MODEL_NAME, LLM_TEMPERATURE, ENABLE_STREAMING
 
 # ==========================================
 # 🔇 Windows 한글 깨짐 방지용 출력 인코딩 설정
@@ -20,8 +21,9 @@ def main():
     print("🤖 챗봇 시스템 로딩 중... (DB 연결)")
 
     # DB 존재 여부 확인
-    if not os.path.exists(VECTOR_DB_PATH):
-        print(f"❌ 오류: '{VECTOR_DB_PATH}' 폴더가 없습니다.")
+    vector_db_path = get_vector_store_path()
+    if not os.path.exists(vector_db_path):
+        print(f"❌ 오류: '{vector_db_path}' 폴더가 없습니다.")
         print("👉 create_vector_db.py를 먼저 실행하세요.")
         return
 
@@ -29,9 +31,10 @@ def main():
     embeddings = get_embedding_model()
 
 
-    # 벡터 DB 로드
+    # 벡터 DB 로드 (CURRENT 스냅샷) - create_vector_db로 새 버전이 만들어지면 백그라운드에서 로딩 후 교체
     try:
-        vectordb = load_chroma_db(embeddings, VECTOR_DB_PATH)
+        reloader = VectorStoreReloader(embeddings, vector_db_path)
+        vectordb = reloader.vectordb
         print("✅ 지식 데이터베이스 연결 성공!")
     except Exception as e:
         print("❌ DB 연결 실패")
@@ -41,6 +44,10 @@ def main():
     model=LLM_MODEL_NAME,
     temperature=LLM_TEMPERATURE
 )
+
+    # RAG 파이프라인 준비 (도구 바인딩 / 체인 / 프롬프트를 한 번만 구성)
+    pipeline = RagPipeline(llm, vectordb)
+    reloader.start()
     print("=" * 50)
     print("🎓 대학 물품 관리 AI 챗봇이 준비되었습니다!")
     print("👉 질문을 입력하세요. ('종료' 입력 시 종료)")
@@ -52,22 +59,52 @@ def main():
 
         if user_input == "종료":
             print("👋 시스템을 종료합니다. 안녕히 가세요!")
+            reloader.stop()
             break
 
         if not user_input:
             continue
 
+        # 새 인덱스 스냅샷이 준비되었으면 요청 사이에 교체
+        if reloader.swap_into(pipeline):
+            print("🔄 지식 데이터베이스가 최신 버전으로 교체되었습니다.")
+
         print("🤔 Thinking...", end="", flush=True)
 
         # # RAG 실행 (기존 코드)
         # answer = run_rag_chain(llm, vectordb, user_input)
 
-        # RAG 실행 (정확한 인자 순서)
-        answer = run_rag_chain(
-            llm=llm,
-            vectordb=vectordb,
-            user_query=user_input
-        )
+        # 스트리밍 출력: 토큰이 도착하는 대로 바로 출력
+        if ENABLE_STREAMING:
+            answer = None
+            started = False
+
+            for event in pipeline.stream(user_input):
+                if event["type"] == "token":
+                    if not started:
+                        print("\r🤖 AI 답변:")
+                        started = True
+                    print(event["content"], end="", flush=True)
+                elif event["type"] == "reset":
+                    # 답변 일부 출력 후 오류 -> 이후 토큰 / 최종 답변으로 대체
+                    if started:
+                        print("\n⚠️ 답변 생성 중 오류가 발생하여 위 답변은 무효입니다. 다시 답변합니다.")
+                        print("🤔 Thinking...", end="", flush=True)
+                        started = False
+                elif event["type"] == "final":
+                    answer = event["result"]
+
+            # 토큰 없이 끝난 경우 (고정 응답, 화면 이동 등) 최종 답변을 한 번에 출력
+            if started:
+                print()
+            else:
+                print("\r🤖 AI 답변:")
+                print(answer["answer"])
+            print("-" * 50)
+            continue
+
+        # RAG 실행
+        answer = pipeline.run(user_input)
 
 
         # 출력 정리
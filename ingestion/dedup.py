@@ -0,0 +1,157 @@
+# 색인 전 근중복(near-duplicate) 문서 병합
+# - 문자 n-gram shingle → MinHash 서명 → LSH banding으로 후보 쌍 탐색 → 실제 Jaccard 유사도로 확인
+# - 병합은 같은 범위(DEDUP_SCOPE_FIELDS, 기본: 같은 매뉴얼 장 파일) 안에서만 수행
+#   (반납 / 불용 / 처분처럼 문장 틀이 같은 다른 장의 QA는 병합하지 않음)
+# - 같은 군집은 대표 문서 1개만 남기고, 병합된 doc_id는 대표 문서 metadata["merged_doc_ids"]에 기록 (출처 표시용)
+# - 임베딩 API 호출 없이 create_vector_db 시점에 수행
+
+import hashlib
+import logging
+import re
+import unicodedata
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.config import DEDUP_SHINGLE_SIZE, DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_JACCARD_THRESHOLD, DEDUP_SCOPE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# MinHash 해시 함수 (a * x + b) mod p 의 소수 p (Mersenne prime 2^61 - 1)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+# metadata에 병합 doc_id를 기록하는 구분자 (Chroma metadata는 문자열 / 숫자만 허용)
+MERGED_DOC_IDS_SEPARATOR = ","
+
+
+def shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> set:
+    """
+    정규화(NFKC, 소문자, 공백 축약)한 텍스트의 문자 n-gram 집합
+    """
+    text = re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text).lower()).strip()
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _permutations(num_perm: int):
+    # 실행마다 같은 결과가 나오도록 고정 seed 사용
+    rng = np.random.default_rng(1)
+    a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(shingle_set: set, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    MinHash 서명 (num_perm개의 최소 해시값)
+    shingle 해시를 32비트(crc32)로 두어 a * x + b 계산이 uint64 범위를 넘지 않도록 함
+    """
+    if not shingle_set:
+        return np.full(a.shape[0], _MERSENNE_PRIME, dtype=np.uint64)
+
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingle_set),
+        dtype=np.uint64,
+        count=len(shingle_set)
+    )
+    return ((np.outer(hashes, a) + b) % _MERSENNE_PRIME).min(axis=0)
+
+
+def find_duplicate_clusters(texts: List[str], threshold: float = DEDUP_JACCARD_THRESHOLD,
+                            num_perm: int = DEDUP_NUM_PERM, bands: int = DEDUP_BANDS) -> List[List[int]]:
+    """
+    Jaccard 유사도 threshold 이상인 텍스트끼리 묶은 군집 목록 (2개 이상인 군집만, 각 군집은 오름차순 index)
+    """
+    if num_perm % bands != 0:
+        raise ValueError(f"DEDUP_NUM_PERM({num_perm})은 DEDUP_BANDS({bands})의 배수여야 합니다.")
+    rows = num_perm // bands
+
+    shingle_sets = [shingles(text) for text in texts]
+    a, b = _permutations(num_perm)
+    signatures = [minhash_signature(shingle_set, a, b) for shingle_set in shingle_sets]
+
+    # LSH: band별 서명 조각이 같은 문서끼리 후보 쌍
+    candidates = set()
+    for band in range(bands):
+        buckets = {}
+        for i, signature in enumerate(signatures):
+            key = hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest()
+            buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    candidates.add((members[x], members[y]))
+
+    # 후보 쌍은 실제 Jaccard 유사도로 확인 후 union-find로 군집화
+    parent = list(range(len(texts)))
+
+    def _find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in candidates:
+        if jaccard(shingle_sets[i], shingle_sets[j]) >= threshold:
+            root_i, root_j = _find(i), _find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters = {}
+    for i in range(len(texts)):
+        clusters.setdefault(_find(i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def collapse_near_duplicates(documents: List[Document], threshold: float = DEDUP_JACCARD_THRESHOLD,
+                             scope_fields: List[str] = DEDUP_SCOPE_FIELDS) -> Tuple[List[Document], int]:
+    """
+    근중복 문서를 군집별 대표 문서 1개로 병합합니다.
+    scope_fields 메타데이터 값이 모두 같은 문서끼리만 비교합니다.
+    대표 문서는 본문이 가장 긴 문서(동일하면 먼저 나온 문서)이며, 원래 순서를 유지합니다.
+
+    Returns
+    -------
+    (병합 후 문서 리스트, 제거된 문서 수)
+    """
+    scopes = {}
+    for i, doc in enumerate(documents):
+        scopes.setdefault(tuple(doc.metadata.get(field) for field in scope_fields), []).append(i)
+
+    clusters = []
+    for members in scopes.values():
+        for cluster in find_duplicate_clusters([documents[i].page_content for i in members], threshold):
+            clusters.append([members[i] for i in cluster])
+
+    removed = set()
+    canonical = {}
+    for members in clusters:
+        representative = max(members, key=lambda i: (len(documents[i].page_content), -i))
+        merged = [i for i in members if i != representative]
+        removed.update(merged)
+        canonical[representative] = merged
+
+    collapsed = []
+    for i, doc in enumerate(documents):
+        if i in removed:
+            continue
+        if i in canonical:
+            merged_ids = [str(documents[j].metadata.get("doc_id", j)) for j in canonical[i]]
+            doc = Document(
+                page_content=doc.page_content,
+                metadata={**doc.metadata, "merged_doc_ids": MERGED_DOC_IDS_SEPARATOR.join(merged_ids)}
+            )
+        collapsed.append(doc)
+
+    if removed:
+        logger.info(f"[Dedup] 근중복 군집 {len(clusters)}개, 문서 {len(removed)}건 병합 ({len(documents)} -> {len(collapsed)})")
+    return collapsed, len(removed)
@@ -4,8 +4,25 @@
 # OpenAI / HuggingFace embedding 연결 지점
 
 from langchain_openai import OpenAIEmbeddings  # 임베딩 클래스
-from app.config import EMBEDDING_MODEL_NAME
+from app.config import (
+    EMBEDDING_MODEL_NAME,
+    USE_EMBEDDING_CACHE,
+    EMBEDDING_CACHE_MAX_SIZE,
+    EMBEDDING_CACHE_DB_PATH
+)
+from ingestion.embedding_cache import CachedEmbeddings
 
 def get_embedding_model():
     # 임베딩 모델 생성 함수
-    return OpenAIEmbeddings(model=EMBEDDING_MODEL_NAME)
+    embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL_NAME)
+
+    # 캐시 사용 시: 같은 텍스트는 네트워크 호출 없이 저장된 벡터 재사용
+    if USE_EMBEDDING_CACHE:
+        return CachedEmbeddings(
+            embeddings,
+            model_name=EMBEDDING_MODEL_NAME,
+            max_size=EMBEDDING_CACHE_MAX_SIZE,
+            db_path=EMBEDDING_CACHE_DB_PATH
+        )
+
+    return embeddings
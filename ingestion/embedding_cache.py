@@ -0,0 +1,167 @@
+# 임베딩 결과 캐시
+# - key: (임베딩 모델 이름, 정규화된 텍스트)
+# - 메모리 LRU + SQLite 영속화 (재시작 후에도 재사용)
+# - 질의 임베딩(embed_query)과 색인 생성 시 문서 임베딩(embed_documents) 모두 적용
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    캐시 key용 텍스트 정규화: 유니코드 정규화(NFKC), 연속 공백 축약, 앞뒤 공백 제거
+    (대소문자 / 문장부호는 임베딩 결과에 영향을 주므로 유지)
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 모델 래퍼 (LangChain Embeddings 인터페이스 유지)
+
+    Parameters
+    ----------
+    embeddings : Embeddings
+        실제 임베딩 모델 (예: OpenAIEmbeddings)
+    model_name : str
+        캐시 key에 포함할 모델 이름 (모델이 바뀌면 기존 항목은 사용되지 않음)
+    max_size : int
+        메모리에 보관할 최대 벡터 수 (초과 시 LRU 제거)
+    db_path : str, optional
+        SQLite 파일 경로. None이면 메모리에만 보관합니다.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str, max_size: int, db_path: Optional[str] = None):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        self.hits = 0
+        self.misses = 0
+
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                    "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[Embedding Cache] SQLite 초기화 실패 -> 메모리 캐시만 사용: {e}")
+                self._conn = None
+
+    def _make_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: List[float]):
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> dict:
+        """
+        key 목록 중 캐시에 있는 항목을 {key: vector}로 반환 (메모리 → SQLite 순)
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+
+            missing = [key for key in keys if key not in found]
+            if self._conn is None or not missing:
+                return found
+
+            try:
+                # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embedding_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                        self._remember(key, vector)
+                        found[key] = vector
+            except sqlite3.Error as e:
+                logger.warning(f"[Embedding Cache] SQLite 조회 실패: {e}")
+
+        return found
+
+    def _store(self, items: dict):
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+
+            if self._conn is None:
+                return
+
+            try:
+                now = time.time()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (key, model, vector, created_at) VALUES (?, ?, ?, ?)",
+                    [
+                        (key, self.model_name, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                        for key, vector in items.items()
+                    ]
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[Embedding Cache] SQLite 저장 실패: {e}")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        캐시에 없는 텍스트만 모아서 한 번에 임베딩합니다. (중복 텍스트도 1회만 요청)
+        """
+        keys = [self._make_key(text) for text in texts]
+        found = self._lookup(list(dict.fromkeys(keys)))
+
+        miss_texts = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in miss_texts:
+                miss_texts[key] = text
+
+        self.hits += len(texts) - sum(1 for key in keys if key in miss_texts)
+        self.misses += len(miss_texts)
+
+        if miss_texts:
+            vectors = self.embeddings.embed_documents(list(miss_texts.values()))
+            new_items = dict(zip(miss_texts.keys(), vectors))
+            self._store(new_items)
+            found.update(new_items)
+
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._make_key(text)
+        found = self._lookup([key])
+        if key in found:
+            self.hits += 1
+            return found[key]
+
+        self.misses += 1
+        vector = self.embeddings.embed_query(text)
+        self._store({key: vector})
+        return vector
@@ -0,0 +1,73 @@
+# 적응형 후보 수(Adaptive Depth)
+# - 검색 거리 점수 분포가 뾰족하면(최상위 문서가 확실하면) Re-ranking 후보 / Context 수를 줄임
+# - 분포가 평평하면 설정 상한(RERANK_CANDIDATE_K 등)까지 그대로 사용
+# - 결정 결과는 로그와 전역 지표(rag.adaptive_depth.*)로 남겨 기준값 튜닝에 사용
+
+import bisect
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+from app.config import (
+    USE_ADAPTIVE_DEPTH,
+    ADAPTIVE_MIN_CANDIDATES,
+    ADAPTIVE_SCORE_MARGIN,
+    ADAPTIVE_MIN_SCORE_GAP,
+    METRICS_COUNT_BUCKETS
+)
+from rag.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+def decide_depth(scores: List[float], max_candidates: int, max_context: int) -> Tuple[int, int]:
+    """
+    후보 수 / Context 수 결정
+
+    Parameters
+    ----------
+    scores : list
+        오름차순 정렬된 검색 거리 점수 (낮을수록 유사)
+    max_candidates : int
+        후보 수 상한 (Re-ranking 시 RERANK_CANDIDATE_K, 미사용 시 TOP_N_CONTEXT)
+    max_context : int
+        Context 수 상한 (Re-ranking 시 RERANK_TOP_N, 미사용 시 TOP_N_CONTEXT)
+
+    Returns
+    -------
+    (candidate_k, context_n)
+        비활성화 시 (min(len(scores), max_candidates), max_context) - 기존 동작과 동일
+    """
+    n = min(len(scores), max_candidates)
+    if not USE_ADAPTIVE_DEPTH:
+        return n, max_context
+
+    cut = n
+    reason = "flat"
+
+    if n > ADAPTIVE_MIN_CANDIDATES:
+        top = [float(score) for score in scores[:n]]
+
+        # 1. 최상위 문서 대비 margin 밖의 후보 제외
+        if ADAPTIVE_SCORE_MARGIN is not None:
+            within = bisect.bisect_right(top, top[0] + ADAPTIVE_SCORE_MARGIN)
+            if within < cut:
+                cut, reason = max(ADAPTIVE_MIN_CANDIDATES, within), "margin"
+
+        # 2. 남은 후보 중 가장 큰 점수 간격(최소 후보 수 이후)에서 자르기
+        gaps = np.diff(top[:cut])[ADAPTIVE_MIN_CANDIDATES - 1:]
+        if gaps.size:
+            largest = int(np.argmax(gaps))
+            if gaps[largest] >= ADAPTIVE_MIN_SCORE_GAP:
+                cut, reason = largest + ADAPTIVE_MIN_CANDIDATES, "gap"
+
+    context_n = min(max_context, cut)
+
+    registry = get_metrics_registry()
+    registry.observe("rag.adaptive_depth.candidates", cut, buckets=METRICS_COUNT_BUCKETS)
+    registry.observe("rag.adaptive_depth.context", context_n, buckets=METRICS_COUNT_BUCKETS)
+    registry.increment(f"rag.adaptive_depth.reason.{reason}")
+
+    logger.info(f"[Adaptive Depth] 후보 {n} -> {cut} | context {context_n} | 기준={reason}")
+    return cut, context_n
@@ -0,0 +1,132 @@
+# Cascade Re-ranking
+# - 1단계: 저렴한 점수(검색 거리 또는 lexical 일치율)로 후보 정렬
+# - 1위가 margin 이상 앞서면 Cross-Encoder 없이 1단계 순서를 그대로 사용
+#   ("retrieval" 점수의 margin은 dense 거리 기준이므로 Hybrid / Multi-query(RRF 의사 거리) 결과에서는 생략 판단 안 함)
+# - 아니면 상위 CASCADE_PREFILTER_K개만 Cross-Encoder로 채점 (나머지는 1단계 순서로 뒤에 붙임)
+# - 생략 / 채점 비율과 채점 쌍 수는 전역 지표 rag.cascade.*로 기록
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.config import (
+    CASCADE_SCORER,
+    CASCADE_PREFILTER_K,
+    CASCADE_SKIP_MARGIN,
+    METRICS_COUNT_BUCKETS,
+    USE_HYBRID_SEARCH,
+    USE_MULTI_QUERY
+)
+from rag.metrics import get_metrics_registry
+from vectorstore.lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+def cheap_scores(query: str, docs_with_scores: list, scorer: str = CASCADE_SCORER) -> np.ndarray:
+    """
+    후보별 저렴한 점수 (높을수록 관련)
+    """
+    if scorer == "retrieval":
+        # 검색 거리 점수는 낮을수록 유사하므로 부호 반전
+        return -np.asarray([score for _, score in docs_with_scores], dtype=np.float64)
+
+    if scorer == "lexical":
+        query_tokens = set(tokenize(query))
+        if not query_tokens:
+            return np.zeros(len(docs_with_scores))
+        return np.asarray([
+            len(query_tokens & set(tokenize(doc.page_content))) / len(query_tokens)
+            for doc, _ in docs_with_scores
+        ])
+
+    raise ValueError(f"지원하지 않는 CASCADE_SCORER: {scorer}")
+
+
+def cascade_prefilter(query: str, docs_with_scores: list, scorer: str = CASCADE_SCORER,
+                      prefilter_k: int = CASCADE_PREFILTER_K,
+                      margin: Optional[float] = CASCADE_SKIP_MARGIN) -> Tuple[list, list, bool]:
+    """
+    저렴한 점수로 후보를 정렬하고 Cross-Encoder 채점 대상을 나눕니다.
+
+    Returns
+    -------
+    (head, tail, decided)
+        head : Cross-Encoder로 채점할 후보 [(Document, retrieval_score), ...]
+        tail : 채점 없이 1단계 순서로 뒤에 붙일 후보
+        decided : True이면 1위가 margin 이상 앞서므로 Cross-Encoder 생략 (head + tail 순서 그대로 사용)
+    """
+    scores = cheap_scores(query, docs_with_scores, scorer)
+    # 동점이면 원래(검색) 순서 유지
+    order = np.argsort(-scores, kind="stable")
+    ranked = [docs_with_scores[i] for i in order]
+
+    decided = (
+        margin is not None
+        and len(ranked) > 1
+        and scores[order[0]] - scores[order[1]] >= margin
+    )
+    return ranked[:prefilter_k], ranked[prefilter_k:], decided
+
+
+def _skip_margin() -> Optional[float]:
+    """
+    생략 판단에 쓸 margin (검색 결과가 RRF로 병합되면 "retrieval" 점수의 margin은 적용하지 않음)
+    """
+    if CASCADE_SCORER == "retrieval" and (USE_HYBRID_SEARCH or USE_MULTI_QUERY):
+        return None
+    return CASCADE_SKIP_MARGIN
+
+
+def _record(decided_count: int, cross_encoded: List[int]):
+    registry = get_metrics_registry()
+    registry.increment("rag.cascade.skipped", decided_count)
+    registry.increment("rag.cascade.cross_encoded", len(cross_encoded))
+    for pairs in cross_encoded:
+        registry.observe("rag.cascade.pairs", pairs, buckets=METRICS_COUNT_BUCKETS)
+
+
+def cascade_rerank(reranker, query: str, docs_with_scores: list, top_n: int) -> list:
+    """
+    CrossEncoderReranker.rerank와 같은 입력 / 출력 (Document 리스트)
+    """
+    head, tail, decided = cascade_prefilter(
+        query, docs_with_scores, CASCADE_SCORER, CASCADE_PREFILTER_K, _skip_margin()
+    )
+
+    if decided:
+        _record(1, [])
+        logger.info(f"[Cascade] 1위 점수 차이가 margin 이상 -> Cross-Encoder 생략 (후보 {len(docs_with_scores)})")
+        return [doc for doc, _ in head + tail][:top_n]
+
+    _record(0, [len(head)])
+    logger.info(f"[Cascade] Cross-Encoder 채점 {len(head)}/{len(docs_with_scores)}")
+    top_docs = reranker.rerank(query=query, docs_with_scores=head, top_n=top_n)
+    return (top_docs + [doc for doc, _ in tail])[:top_n]
+
+
+def cascade_rerank_batch(reranker, queries: list, docs_with_scores_list: list, top_n: int) -> list:
+    """
+    CrossEncoderReranker.rerank_batch와 같은 입력 / 출력
+    생략되지 않은 질의의 채점 대상만 모아 rerank_batch 1회로 채점합니다.
+    """
+    margin = _skip_margin()
+    prefiltered = [
+        cascade_prefilter(query, docs_with_scores, CASCADE_SCORER, CASCADE_PREFILTER_K, margin)
+        for query, docs_with_scores in zip(queries, docs_with_scores_list)
+    ]
+    pending = [i for i, (_, _, decided) in enumerate(prefiltered) if not decided]
+    _record(len(prefiltered) - len(pending), [len(prefiltered[i][0]) for i in pending])
+
+    reranked = dict(zip(pending, reranker.rerank_batch(
+        queries=[queries[i] for i in pending],
+        docs_with_scores_list=[prefiltered[i][0] for i in pending],
+        top_n=top_n
+    ))) if pending else {}
+
+    results = []
+    for i, (head, tail, decided) in enumerate(prefiltered):
+        top_docs = [doc for doc, _ in head] if decided else reranked[i]
+        results.append((top_docs + [doc for doc, _ in tail])[:top_n])
+    return results
@@ -1,23 +1,50 @@
 import traceback
 import logging
 import json
+import re
+import asyncio
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_core.messages import HumanMessage, ToolMessage, SystemMessage
 
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
-from vectorstore.retriever import retrieve_docs
-from rag.prompt import assemble_prompt, build_question_classifier_prompt, build_query_refine_prompt, build_tool_aware_system_prompt
+from vectorstore.retriever import retrieve_docs, retrieve_docs_by_vector, retrieve_docs_multi, fuse_ranked_results
+from vectorstore.metadata_filter import infer_metadata_filter, normalize_metadata_filter
+from rag.prompt import KST, assemble_prompt, build_question_classifier_prompt, build_query_refine_prompt, build_multi_query_refine_prompt, build_tool_aware_system_prompt, build_planner_prompt
 from rag.tools import get_item_detail_info, open_usage_prediction_page
 from rag.reranker import CrossEncoderReranker
+from rag.semantic_cache import get_semantic_cache, compute_knowledge_fingerprint, faq_fingerprint
+from rag.stage_memo import get_stage_memo, llm_config_key
+from rag.metrics import RequestTrace
+from rag.adaptive_depth import decide_depth
+from rag.context_selection import select_context
+from rag.cascade import cascade_rerank, cascade_rerank_batch
+from ingestion.dedup import MERGED_DOC_IDS_SEPARATOR
 from app.config import (
     NO_CONTEXT_RESPONSE, TECHNICAL_ERROR_RESPONSE, SIMILARITY_SCORE_THRESHOLD, TOP_N_CONTEXT, RETRIEVER_TOP_K,
     RERANKER_MODEL_NAME,
     RERANK_CANDIDATE_K,
     RERANK_TOP_N,
     USE_RERANKING,
-    RERANK_DEBUG
+    USE_CASCADE_RERANK,
+    RERANK_DEBUG,
+    USE_PLANNER,
+    USE_METADATA_FILTER,
+    USE_MULTI_QUERY,
+    USE_MMR_CONTEXT,
+    MULTI_QUERY_COUNT,
+    USE_SPECULATIVE_EXECUTION,
+    SPECULATIVE_MAX_WORKERS,
+    USE_SEMANTIC_CACHE,
+    USE_STAGE_MEMO,
+    TOOL_PARALLEL_EXECUTION,
+    TOOL_MAX_WORKERS,
+    INCLUDE_TIMINGS_IN_RESULT
 )
 
 # [설정] 민감 정보 키 목록 정의
@@ -41,149 +68,1061 @@ for tool in TOOLS:
         raise ValueError(f"Duplicate tool name detected: {tool.name}")
     TOOL_MAP[tool.name] = tool
 
+# 3. 도구 병렬 실행용 스레드 풀 (요청 간 공유, 백엔드 동시 요청 수 제한)
+_TOOL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=TOOL_MAX_WORKERS,
+    thread_name_prefix="rag-tool"
+)
 
-def run_rag_chain(
-    llm,
-    vectordb,
+# 4. Speculative Execution 전용 스레드 풀 (요청 간 공유)
+_SPECULATIVE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SPECULATIVE_MAX_WORKERS,
+    thread_name_prefix="rag-speculative"
+)
+
+
+# ==============================================================================
+# 단계별 공통 헬퍼
+# - 동기(run_rag_chain) / 비동기(arun_rag_chain) 체인이 같은 로직을 공유하도록
+#   I/O가 없는 판단·가공 로직만 분리해 둡니다.
+# ==============================================================================
+
+def _sanitize_tool_args(tool_args):
+    """
+    로깅용 도구 인자 정제 (Sanitization + Redaction)
+    """
+    if isinstance(tool_args, dict):
+        safe_args = {}
+        for k, v in tool_args.items():
+            # [보안] 1. 민감한 키(Key)인지 확인 -> 마스킹 처리
+            if str(k).lower() in SENSITIVE_KEYS:
+                safe_args[k] = "[REDACTED]" # 혹은 "*****"
+
+            # [기존] 2. 일반 데이터는 길이 제한 (Truncation)
+            else:
+                val_str = str(v).replace("\n", "\\n")
+                safe_args[k] = val_str[:100] + "..." if len(val_str) > 100 else val_str
+        return safe_args
+
+    # 딕셔너리가 아닌 경우 (단일 문자열 등) -> 기존 방식 유지
+    return str(tool_args)[:100].replace("\n", "\\n")
+
+
+def _execute_tool_call(tool_call, user_query: str):
+    """
+    단일 도구 호출을 실행하고 결과를 분류합니다.
+
+    Returns
+    -------
+    tuple
+        (navigation, tool_message)
+        - 정의되지 않은 도구: (None, None)
+        - 페이지 이동 요청: (navigation dict, None)
+        - 정보 조회 / 실행 실패: (None, ToolMessage)
+    """
+    tool_name = tool_call["name"]
+    tool_args = tool_call["args"]
+
+    # [안전장치 1] 정의되지 않은 도구 무시
+    if tool_name not in TOOL_MAP:
+        logger.warning(f"[Tool Execution] 정의되지 않은 도구 요청 무시: {tool_name}")
+        return None, None
+
+    # [안전장치 2] 로깅 보안 (Sanitization + Redaction)
+    safe_args = _sanitize_tool_args(tool_args)
+
+    logger.info(f"[Tool Execution] '{tool_name}' 실행 중... | 인자: {safe_args}")
+
+    try:
+        # 도구 객체 가져오기 및 실행
+        selected_tool = TOOL_MAP[tool_name]
+        tool_output_str = selected_tool.invoke(tool_args)
+
+        # 결과 분석: JSON 파싱 시도
+        parsed_output = None
+        try:
+            parsed_output = json.loads(tool_output_str)
+        except (json.JSONDecodeError, TypeError):
+            # JSON 파싱에 실패한 경우, 도구 출력은 일반 텍스트로 처리하기 위해 parsed_output을 None으로 유지합니다.
+            parsed_output = None
+
+        # -------------------------------------------------------
+        # [Case A] 페이지 이동 (Navigate) -> 임시 저장 (즉시 종료 X)
+        # -------------------------------------------------------
+        if (
+            isinstance(parsed_output, dict)
+            and parsed_output.get("action") == "navigate"
+            and parsed_output.get("target_url")
+        ):
+            logger.info("[Tool Output] 페이지 이동 요청 감지 -> 다른 작업 완료 후 이동 예정")
+
+            # 즉시 return 하지 않고 호출자에게 넘겨 보관하도록 합니다.
+            navigation = {
+                "answer": parsed_output.get("guide_msg", "페이지로 이동합니다."),
+                "target_url": parsed_output.get("target_url"),
+                "query": user_query,
+                "action": "navigate"
+            }
+            return navigation, None
+
+        # -------------------------------------------------------
+        # [Case B] 정보 조회 (Search) -> 결과 누적(Append)
+        # -------------------------------------------------------
+
+        # 타입 체크 및 안전한 문자열 변환 로직
+        final_content = ""
+
+        if isinstance(tool_output_str, str):
+            # 정상적인 문자열인 경우 그대로 사용
+            final_content = tool_output_str
+        else:
+            # 문자열이 아닌 경우 (예: Dict, List, Int 등)
+            # 1. 코파일럿 지적 반영: 버그를 숨기지 않도록 경고 로그 출력
+            logger.warning(f"[Tool Warning] {tool_name} 도구가 문자열이 아닌 타입({type(tool_output_str)})을 반환했습니다. 자동 변환합니다.")
+
+            # 2. LLM이 이해하기 쉬운 JSON 형태의 문자열로 변환 (실패 시 일반 str 변환)
+            try:
+                final_content = json.dumps(tool_output_str, ensure_ascii=False)
+            except:
+                final_content = str(tool_output_str)
+
+        logger.info(f"[Tool Output] 데이터 조회 완료. (메시지 이력에 추가)")
+
+        return None, ToolMessage(
+            content=final_content,  # 검증된 문자열 사용
+            tool_call_id=tool_call["id"],
+            name=tool_name
+        )
+
+    except Exception as e:
+        # 개별 도구 에러 처리 (멈추지 않고 에러 메시지를 LLM에게 전달)
+        logger.error(f"[Tool Execution Error] {tool_name} 실행 실패: {e}", exc_info=True)
+        return None, ToolMessage(
+            content=f"Error: {str(e)}",
+            tool_call_id=tool_call["id"],
+            name=tool_name,
+        )
+
+
+def _execute_tool_calls(tool_calls, user_query: str):
+    """
+    여러 도구 호출을 실행합니다.
+    TOOL_PARALLEL_EXECUTION 활성화 시 스레드 풀에서 동시에 실행하며,
+    결과는 항상 호출 순서대로 반환됩니다. (도구별 오류는 _execute_tool_call에서 개별 처리)
+    """
+    if not TOOL_PARALLEL_EXECUTION or len(tool_calls) <= 1:
+        return [_execute_tool_call(tool_call, user_query) for tool_call in tool_calls]
+
+    logger.info(f"[Tool Execution] {len(tool_calls)}건 병렬 실행")
+    return list(_TOOL_EXECUTOR.map(lambda tool_call: _execute_tool_call(tool_call, user_query), tool_calls))
+
+
+async def _aexecute_tool_calls(tool_calls, user_query: str):
+    """
+    _execute_tool_calls의 비동기 버전
+    도구는 동기 HTTP 호출이므로 도구 전용 스레드 풀에서 실행합니다.
+    """
+    loop = asyncio.get_running_loop()
+
+    if not TOOL_PARALLEL_EXECUTION or len(tool_calls) <= 1:
+        results = []
+        for tool_call in tool_calls:
+            results.append(
+                await loop.run_in_executor(_TOOL_EXECUTOR, _execute_tool_call, tool_call, user_query)
+            )
+        return results
+
+    logger.info(f"[Tool Execution] {len(tool_calls)}건 병렬 실행")
+    # gather는 입력 순서대로 결과를 반환
+    return await asyncio.gather(*[
+        loop.run_in_executor(_TOOL_EXECUTOR, _execute_tool_call, tool_call, user_query)
+        for tool_call in tool_calls
+    ])
+
+
+def _collect_tool_results(results):
+    """
+    도구 실행 결과 목록을 (tool_messages, pending_navigation)으로 정리합니다.
+    여러 이동 요청이 있으면 마지막 요청을 사용합니다. (기존 순차 실행과 동일)
+    """
+    tool_messages = []          # 결과 누적용 리스트
+    pending_navigation = None   # 페이지 이동 명령 대기용 변수
+
+    for navigation, tool_message in results:
+        if navigation is not None:
+            pending_navigation = navigation
+        if tool_message is not None:
+            tool_messages.append(tool_message)
+
+    return tool_messages, pending_navigation
+
+
+def _finalize_tool_response(final_answer_text: str, pending_navigation):
+    """
+    도구 경로의 최종 반환값을 구성합니다.
+    """
+    # 1. 화면 이동 명령이 있는 경우
+    if pending_navigation:
+        logger.info(f"[Final Step] 페이지 이동 명령 실행: {pending_navigation.get('target_url')}")
+
+        # LLM이 만든 답변(혹은 기본 문구)을 이동 명령 패키지에 담음
+        pending_navigation["answer"] = final_answer_text
+
+        # 이동 명령 반환 (RAG 스킵)
+        return pending_navigation
+
+    # 2. 이동 없이 답변만 있는 경우
+    return {
+        "answer": final_answer_text,
+        "attribution": []
+    }
+
+
+def _build_router_system_prompt() -> str:
+    """
+    Router 단계 시스템 프롬프트
+    Planner 모드에서는 분류/검색어 정제 지침을 함께 전달합니다.
+    """
+    system_instruction = build_tool_aware_system_prompt()
+    if USE_PLANNER:
+        system_instruction += build_planner_prompt(include_chapter=USE_METADATA_FILTER)
+    return system_instruction
+
+
+def _parse_planner_output(content):
+    """
+    Planner 출력(JSON)을 {"need_rag": bool, "search_query": str}로 파싱합니다.
+    USE_METADATA_FILTER 활성화 시 유효한 chapter가 있으면 "metadata_filter"도 포함합니다.
+    형식이 맞지 않으면 None을 반환하여 기존 다단계 경로로 전환하도록 합니다.
+    """
+    if not isinstance(content, str):
+        return None
+
+    # 코드 블록(```json ... ```)이나 앞뒤 설명이 섞여도 첫 JSON 객체만 추출
+    start, end = content.find("{"), content.rfind("}")
+    if start == -1 or end <= start:
+        return None
+
+    try:
+        parsed = json.loads(content[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+
+    if not isinstance(parsed, dict) or not isinstance(parsed.get("need_rag"), bool):
+        return None
+
+    search_query = parsed.get("search_query")
+    plan = {
+        "need_rag": parsed["need_rag"],
+        "search_query": search_query.strip() if isinstance(search_query, str) else ""
+    }
+
+    if USE_METADATA_FILTER:
+        metadata_filter = normalize_metadata_filter({"chapter": parsed.get("chapter")})
+        if metadata_filter:
+            plan["metadata_filter"] = metadata_filter
+
+    return plan
+
+
+def _plan_from_router_response(tool_check_response):
+    """
+    도구 호출이 없는 Router 응답에서 Planner 결과를 추출합니다. (Planner 모드 전용)
+    """
+    if not USE_PLANNER:
+        return None
+
+    plan = _parse_planner_output(tool_check_response.content)
+    if plan is None:
+        logger.warning("[Planner] 출력 파싱 실패 -> 다단계 경로(Classifier/Refiner)로 전환")
+    else:
+        logger.info(
+            f"[Planner] need_rag={plan['need_rag']} | search_query='{plan['search_query']}'"
+            + (f" | filter={plan['metadata_filter']}" if plan.get("metadata_filter") else "")
+        )
+    return plan
+
+
+def _build_classifier_chain(llm):
+    classifier_prompt = PromptTemplate.from_template(
+        build_question_classifier_prompt()
+    )
+    return classifier_prompt | llm | StrOutputParser()
+
+
+def _build_refine_prompt() -> str:
+    # Multi-query 모드에서는 검색어 변형 여러 개를 줄 단위로 출력하는 프롬프트 사용
+    if USE_MULTI_QUERY:
+        return build_multi_query_refine_prompt(MULTI_QUERY_COUNT)
+    return build_query_refine_prompt()
+
+
+def _build_refine_chain(llm):
+    refine_prompt = PromptTemplate.from_template(
+        _build_refine_prompt()
+    )
+    return refine_prompt | llm | StrOutputParser()
+
+
+# 메모이제이션 대상 단계와 프롬프트 템플릿 (템플릿 해시가 key에 포함됨)
+_MEMO_STAGE_PROMPTS = {
+    "classifier": build_question_classifier_prompt,
+    "refine": _build_refine_prompt,
+}
+
+# 검색어 변형 줄 앞의 번호 / 글머리표 ("1. ", "2) ", "- " 등)
+_QUERY_VARIANT_PREFIX = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def _split_refined_queries(refine_output: str, user_query: str):
+    """
+    검색어 정제 결과 -> (대표 검색어, 검색에 사용할 검색어 목록)
+    Multi-query 모드: 줄 단위 변형(최대 MULTI_QUERY_COUNT개) + 원본 질문, 첫 줄이 대표 검색어(Re-ranking 기준)
+    그 외: 정제 결과 1개
+    """
+    if not USE_MULTI_QUERY:
+        return refine_output, [refine_output]
+
+    variants = [_QUERY_VARIANT_PREFIX.sub("", line).strip() for line in refine_output.splitlines()]
+    variants = [variant for variant in variants if variant][:MULTI_QUERY_COUNT]
+    refined_query = variants[0] if variants else refine_output.strip()
+
+    # 중복 제거 (순서 유지)
+    search_queries = list(dict.fromkeys([*variants, user_query.strip()]))
+    return refined_query, search_queries
+
+
+def _invoke_stage(pipeline, stage: str, user_query: str, trace: RequestTrace) -> str:
+    """
+    분류 / 정제 체인 실행 (USE_STAGE_MEMO 활성화 시 메모 우선 조회)
+    """
+    chain = pipeline.stage_chains[stage]
+    memo = pipeline.stage_memo
+    with trace.stage(stage):
+        if memo is None:
+            return chain.invoke({"question": user_query}, config=trace.llm_config(stage))
+
+        template = pipeline.stage_templates[stage]
+        cached = memo.get(stage, pipeline.llm_config_key, template, user_query)
+        if cached is not None:
+            logger.info(f"[Stage Memo] {stage} 결과 재사용")
+            trace.set_count(stage, "memo_hit", 1)
+            return cached
+
+        output = chain.invoke({"question": user_query}, config=trace.llm_config(stage))
+        memo.set(stage, pipeline.llm_config_key, template, user_query, output)
+        return output
+
+
+async def _ainvoke_stage(pipeline, stage: str, user_query: str, trace: RequestTrace) -> str:
+    """
+    _invoke_stage의 비동기 버전 (SQLite 조회/저장은 로컬 파일 I/O로 짧게 끝남)
+    """
+    chain = pipeline.stage_chains[stage]
+    memo = pipeline.stage_memo
+    with trace.stage(stage):
+        if memo is None:
+            return await chain.ainvoke({"question": user_query}, config=trace.llm_config(stage))
+
+        template = pipeline.stage_templates[stage]
+        cached = memo.get(stage, pipeline.llm_config_key, template, user_query)
+        if cached is not None:
+            logger.info(f"[Stage Memo] {stage} 결과 재사용")
+            trace.set_count(stage, "memo_hit", 1)
+            return cached
+
+        output = await chain.ainvoke({"question": user_query}, config=trace.llm_config(stage))
+        memo.set(stage, pipeline.llm_config_key, template, user_query, output)
+        return output
+
+
+def _batch_stage(pipeline, stage: str, queries: list) -> list:
+    """
+    분류 / 정제 체인을 chain.batch로 한 번에 실행합니다.
+    메모 적중 질문은 제외하며, 개별 실패는 예외 객체로 반환합니다.
+    """
+    outputs = [None] * len(queries)
+
+    chain = pipeline.stage_chains[stage]
+    memo = pipeline.stage_memo
+    template = pipeline.stage_templates[stage]
+    if memo:
+        outputs = [memo.get(stage, pipeline.llm_config_key, template, query) for query in queries]
+
+    miss_idx = [i for i, output in enumerate(outputs) if output is None]
+    if miss_idx:
+        batch_outputs = chain.batch(
+            [{"question": queries[i]} for i in miss_idx],
+            return_exceptions=True
+        )
+        for i, output in zip(miss_idx, batch_outputs):
+            outputs[i] = output
+            if memo and not isinstance(output, Exception):
+                memo.set(stage, pipeline.llm_config_key, template, queries[i], output)
+
+    return outputs
+
+
+def _use_speculation():
+    # Planner 모드에서는 분류/정제 호출 자체가 없으므로 선행 실행 대상이 없음
+    return USE_SPECULATIVE_EXECUTION and not USE_PLANNER
+
+
+def _start_speculation(pipeline, user_query: str, retriever_top_k: int, trace: RequestTrace):
+    """
+    Router 호출과 병렬로 Classifier, 검색어 정제 + 검색을 미리 시작합니다. (동기 체인용)
+
+    Returns
+    -------
+    dict
+        {"classification": Future[str], "retrieval": Future[(refined_query, retrieved_docs)]}
+    """
+    def _refine_and_retrieve():
+        refined_query, search_queries = _split_refined_queries(
+            _invoke_stage(pipeline, "refine", user_query, trace), user_query
+        )
+        metadata_filter = _resolve_metadata_filter(refined_query)
+        return refined_query, _retrieve(
+            pipeline.vectordb, refined_query, retriever_top_k, trace, metadata_filter, search_queries
+        )
+
+    logger.info("[Speculative] Router와 병렬로 분류 / 검색어 정제 / 검색 시작")
+    return {
+        "classification": _SPECULATIVE_EXECUTOR.submit(_invoke_stage, pipeline, "classifier", user_query, trace),
+        "retrieval": _SPECULATIVE_EXECUTOR.submit(_refine_and_retrieve),
+    }
+
+
+def _astart_speculation(pipeline, user_query: str, retriever_top_k: int, trace: RequestTrace):
+    """
+    _start_speculation의 비동기 버전 (asyncio Task 사용)
+    """
+    async def _refine_and_retrieve():
+        refined_query, search_queries = _split_refined_queries(
+            await _ainvoke_stage(pipeline, "refine", user_query, trace), user_query
+        )
+        metadata_filter = _resolve_metadata_filter(refined_query)
+        retrieved_docs = await asyncio.to_thread(
+            _retrieve, pipeline.vectordb, refined_query, retriever_top_k, trace, metadata_filter, search_queries
+        )
+        return refined_query, retrieved_docs
+
+    logger.info("[Speculative] Router와 병렬로 분류 / 검색어 정제 / 검색 시작")
+    return {
+        "classification": asyncio.create_task(_ainvoke_stage(pipeline, "classifier", user_query, trace)),
+        "retrieval": asyncio.create_task(_refine_and_retrieve()),
+    }
+
+
+def _cancel_speculation(speculation, *keys):
+    """
+    사용하지 않게 된 선행 작업을 취소합니다.
+    이미 실행 중인 동기 작업은 중단되지 않고 결과만 폐기됩니다.
+    """
+    if not speculation:
+        return
+    for key in keys or speculation.keys():
+        speculation[key].cancel()
+    logger.info(f"[Speculative] 선행 작업 폐기: {', '.join(keys or speculation.keys())}")
+
+
+def _resolve_metadata_filter(refined_query: str, plan=None):
+    """
+    검색 범위를 좁힐 메타데이터 필터 결정 (USE_METADATA_FILTER 비활성화 시 None)
+    Planner가 장(chapter)을 출력했으면 그대로 사용하고, 아니면 정제된 검색어의 키워드로 추정합니다.
+    """
+    if not USE_METADATA_FILTER:
+        return None
+    if plan is not None and plan.get("metadata_filter"):
+        return plan["metadata_filter"]
+    return infer_metadata_filter(refined_query)
+
+
+def _retrieve(vectordb, refined_query: str, retriever_top_k: int, trace: RequestTrace,
+              metadata_filter=None, search_queries=None, query_vectors=None):
+    """
+    Retrieval (검색) + 소요 시간 / 후보 수 기록
+    search_queries에 검색어가 여러 개면 Multi-query 검색 (임베딩 1회 + 병렬 검색 + RRF)
+    query_vectors({검색어: 벡터})에 이미 계산된 검색어 임베딩은 다시 계산하지 않음
+    """
+    query_vectors = query_vectors or {}
+    with trace.stage("retrieval"):
+        if search_queries and len(search_queries) > 1:
+            logger.info(f"[Multi-query] 검색어 {len(search_queries)}개: {search_queries}")
+            retrieved_docs = retrieve_docs_multi(
+                vectordb=vectordb,
+                queries=search_queries,
+                top_k=retriever_top_k,
+                metadata_filter=metadata_filter,
+                query_vectors=query_vectors
+            )
+            trace.set_count("retrieval", "queries", len(search_queries))
+        elif refined_query.strip() in query_vectors:
+            retrieved_docs = retrieve_docs_by_vector(
+                vectordb=vectordb,
+                embedding=query_vectors[refined_query.strip()],
+                top_k=retriever_top_k,
+                query=refined_query,
+                metadata_filter=metadata_filter
+            )
+        else:
+            retrieved_docs = retrieve_docs(
+                vectordb=vectordb,
+                query=refined_query,
+                top_k=retriever_top_k,
+                metadata_filter=metadata_filter
+            )
+    trace.set_count("retrieval", "candidates", len(retrieved_docs))
+    if metadata_filter:
+        trace.set_count("retrieval", "metadata_filter", 1)
+    return retrieved_docs
+
+
+def _filter_retrieved_docs(retrieved_docs):
+    """
+    유사도 점수 score 기반 필터링 후 오름차순 정렬
+    (Chroma는 score가 낮을수록 유사함)
+    """
+    # threshold 이하 문서만 유지
+    filtered_docs = [
+        (doc, retrieved_score)
+        for doc, retrieved_score in retrieved_docs
+        if retrieved_score <= SIMILARITY_SCORE_THRESHOLD
+    ]
+
+    # reranking 직전 디버깅
+    if USE_RERANKING and RERANK_DEBUG:
+        logger.debug("[DEBUG] Retrieval 결과 (정렬 전):")
+        for i, (doc, score) in enumerate(filtered_docs[:5]):
+            logger.debug(f"  [{i}] doc_id={doc.metadata.get('doc_id')} | score={score:.4f}")
+
+    filtered_docs.sort(key=lambda x: x[1])
+    return filtered_docs
+
+
+def _select_top_docs(pipeline, refined_query: str, filtered_docs, trace: RequestTrace):
+    """
+    Re-ranking(사용 시) 또는 상위 N개 선택으로 최종 context 문서를 고릅니다.
+    CrossEncoder 연산이 포함되므로 비동기 체인에서는 executor에서 실행합니다.
+    """
+    with trace.stage("rerank"):
+        candidate_k, context_n = _decide_depth(filtered_docs)
+        top_docs = _rerank_or_truncate(pipeline, refined_query, filtered_docs, candidate_k, context_n)
+    trace.set_count("rerank", "candidates", candidate_k if USE_RERANKING else len(filtered_docs))
+    trace.set_count("rerank", "selected", len(top_docs))
+
+    # MMR 기반 Context 선택 (겹치는 문서 제외 + 토큰 예산)
+    if USE_MMR_CONTEXT:
+        with trace.stage("context_select"):
+            top_docs = select_context(pipeline.vectordb, top_docs)
+        trace.set_count("context_select", "selected", len(top_docs))
+    return top_docs
+
+
+def _decide_depth(filtered_docs):
+    """
+    Re-ranking 후보 수 / 최종 Context 수 결정 (USE_ADAPTIVE_DEPTH 비활성화 시 설정값 그대로)
+    """
+    if USE_RERANKING:
+        return decide_depth([score for _, score in filtered_docs], RERANK_CANDIDATE_K, RERANK_TOP_N)
+    return decide_depth([score for _, score in filtered_docs], TOP_N_CONTEXT, TOP_N_CONTEXT)
+
+
+def _rerank_or_truncate(pipeline, refined_query: str, filtered_docs, candidate_k: int, context_n: int):
+    # 3. Re-ranking
+    if USE_RERANKING:
+        # Re-ranking 대상 후보 수 제한
+        rerank_candidates = filtered_docs[:candidate_k]
+
+        if RERANK_DEBUG:
+            logger.debug("[DEBUG] Re-ranking 적용")
+
+        reranker = pipeline.reranker
+
+        # 중요: Re-ranking도 '변환된 질문(refined_query)'과 문서를 비교해야 정확
+        # Cascade 모드: 저렴한 점수로 후보를 줄이고, 1위가 확실하면 Cross-Encoder 생략
+        rerank = cascade_rerank if USE_CASCADE_RERANK else _full_rerank
+        top_docs = rerank(reranker, refined_query, rerank_candidates, context_n)
+
+        # Re-ranking 후 결과 확인 로직 (logger 사용)
+        if RERANK_DEBUG:
+            logger.debug("[DEBUG] Re-ranking 후 최종 선택된 문서:")
+            for i, doc in enumerate(top_docs):
+                logger.debug(f"  [{i}] {doc.metadata.get('title', 'No Title')} (ID: {doc.metadata.get('doc_id')})")
+
+        return top_docs
+
+    # Reranking 안 쓰면 상위 N개만 선택
+    return [doc for doc, _ in filtered_docs[:min(candidate_k, context_n)]]
+
+
+def _full_rerank(reranker, refined_query: str, docs_with_scores, top_n: int):
+    return reranker.rerank(query=refined_query, docs_with_scores=docs_with_scores, top_n=top_n)
+
+
+def _select_top_docs_batch(pipeline, refined_queries: list, filtered_docs_list: list):
+    """
+    _select_top_docs의 배치 버전
+    모든 질의의 (query, doc) 쌍을 한 번의 CrossEncoder predict로 채점합니다.
+    """
+    depths = [_decide_depth(docs) for docs in filtered_docs_list]
+
+    if USE_RERANKING:
+        # top_n은 질의별로 다를 수 있으므로 상한으로 채점 후 질의별 context 수만큼 자름
+        candidates_list = [docs[:candidate_k] for docs, (candidate_k, _) in zip(filtered_docs_list, depths)]
+        if USE_CASCADE_RERANK:
+            reranked = cascade_rerank_batch(pipeline.reranker, refined_queries, candidates_list, RERANK_TOP_N)
+        else:
+            reranked = pipeline.reranker.rerank_batch(
+                queries=refined_queries,
+                docs_with_scores_list=candidates_list,
+                top_n=RERANK_TOP_N
+            )
+        top_docs_list = [top_docs[:context_n] for top_docs, (_, context_n) in zip(reranked, depths)]
+    else:
+        top_docs_list = [
+            [doc for doc, _ in docs[:min(candidate_k, context_n)]]
+            for docs, (candidate_k, context_n) in zip(filtered_docs_list, depths)
+        ]
+
+    if USE_MMR_CONTEXT:
+        top_docs_list = [select_context(pipeline.vectordb, top_docs) for top_docs in top_docs_list]
+    return top_docs_list
+
+
+def _attribution_entry(doc):
+    # 색인 시 근중복으로 병합된 문서가 있으면 함께 표시
+    entry = {"doc_id": doc.metadata.get("doc_id")}
+    merged_doc_ids = doc.metadata.get("merged_doc_ids")
+    if merged_doc_ids:
+        entry["merged_doc_ids"] = merged_doc_ids.split(MERGED_DOC_IDS_SEPARATOR)
+    return entry
+
+
+def _build_rag_messages(top_docs, user_query: str):
+    """
+    최종 생성 단계 입력(messages)과 Chunk Attribution 구성
+    """
+    # 4. Context 구성
+    # re-ranking 이후에는 Document 리스트만 사용
+    context = "\n\n".join([
+        doc.page_content for doc in top_docs
+    ])
+
+    # 5. Chunk Attribution 구성
+    attribution = [_attribution_entry(doc) for doc in top_docs]
+
+    # 6. 프롬프트 생성
+    prompt = assemble_prompt(
+        context=context,
+        question=user_query
+    )
+
+    return [HumanMessage(content=prompt)], attribution
+
+
+def _build_no_rag_messages(user_query: str):
+    """
+    RAG가 필요 없는 질문용 입력(messages) 구성
+    """
+    prompt = assemble_prompt(
+        context="",              # context 없이
+        question=user_query
+    )
+    return [HumanMessage(content=prompt)]
+
+
+def _log_chain_failure(e: Exception, user_query: str):
+    logger.error(f"[ERROR] LLM Chain failed: {e}")
+    logger.error(f"[ERROR] Failed query: {user_query}")
+    logger.error(traceback.format_exc())
+
+
+# ==============================================================================
+# 최종 생성 단계 (일반 호출 / 토큰 스트리밍)
+# - 스트리밍 여부와 무관하게 생성된 텍스트는 parts 리스트에 누적됩니다.
+# ==============================================================================
+
+def _token_event(content: str):
+    return {"type": "token", "content": content}
+
+
+def _reset_event():
+    """
+    이미 내보낸 토큰을 폐기하라는 이벤트
+    (토큰 일부를 내보낸 뒤 오류가 나서 다른 답변(RAG 전환 / 오류 안내)으로 대체될 때)
+    """
+    return {"type": "reset"}
+
+
+def _final_event(result: dict, route: str):
+    """
+    마지막 이벤트
+    route: 응답이 만들어진 경로 ("tool" | "no_rag" | "rag" | "no_context" | "error" | "cache")
+    """
+    return {"type": "final", "result": result, "route": route}
+
+
+def _generate(llm, messages, stream: bool, parts: list, trace: RequestTrace, stage: str = "generate"):
+    """
+    최종 답변 생성
+    stream=True이면 llm.stream으로 토큰 이벤트를 순차적으로 내보냅니다.
+    (스트리밍 시 단계 시간에는 호출자가 토큰을 소비하는 시간도 포함되므로 first_token_ms를 함께 기록)
+    """
+    config = trace.llm_config(stage)
+    with trace.stage(stage):
+        if not stream:
+            parts.append(llm.invoke(messages, config=config).content)
+            return
+
+        started = time.perf_counter()
+        for chunk in llm.stream(messages, config=config):
+            if chunk.content:
+                if not parts:
+                    trace.set_count(stage, "first_token_ms", round((time.perf_counter() - started) * 1000, 2))
+                parts.append(chunk.content)
+                yield _token_event(chunk.content)
+
+
+async def _agenerate(llm, messages, stream: bool, parts: list, trace: RequestTrace, stage: str = "generate"):
+    """
+    _generate의 비동기 버전 (ainvoke / astream)
+    """
+    config = trace.llm_config(stage)
+    with trace.stage(stage):
+        if not stream:
+            parts.append((await llm.ainvoke(messages, config=config)).content)
+            return
+
+        started = time.perf_counter()
+        async for chunk in llm.astream(messages, config=config):
+            if chunk.content:
+                if not parts:
+                    trace.set_count(stage, "first_token_ms", round((time.perf_counter() - started) * 1000, 2))
+                parts.append(chunk.content)
+                yield _token_event(chunk.content)
+
+
+# ==============================================================================
+# 계측 (단계별 latency / 토큰 / 후보 수)
+# - 최종 이벤트에서 전역 지표 저장소에 반영하고, 설정 시 결과에 "timings" 블록을 추가합니다.
+# - 시맨틱 캐시 바깥에서 감싸므로 캐시에는 timings 없는 결과만 저장됩니다.
+# ==============================================================================
+
+def _attach_trace(trace: RequestTrace, event):
+    trace.finish(event["route"])
+    if not INCLUDE_TIMINGS_IN_RESULT:
+        return event
+
+    result = dict(event["result"])
+    result["timings"] = trace.to_dict()
+    return {**event, "result": result}
+
+
+def _with_trace(trace: RequestTrace, events):
+    for event in events:
+        if event["type"] == "final":
+            event = _attach_trace(trace, event)
+        yield event
+
+
+async def _awith_trace(trace: RequestTrace, events):
+    async for event in events:
+        if event["type"] == "final":
+            event = _attach_trace(trace, event)
+        yield event
+
+
+# ==============================================================================
+# 시맨틱 답변 캐시
+# - Router가 도구를 선택하지 않은 경우에만 조회합니다. (도구 / 화면 이동 질문에 이전 RAG 답변이 재사용되지 않도록)
+# - 답변 이벤트 스트림을 감싸서 조회/저장만 담당합니다.
+# - 도구 응답은 실시간 자산 데이터에 의존하므로, 오류 응답은 일시적이므로 저장하지 않습니다.
+# ==============================================================================
+
+_CACHEABLE_ROUTES = {"rag", "no_rag", "no_context"}
+
+
+def _semantic_cache_lookup(pipeline, user_query: str):
+    """
+    Returns
+    -------
+    tuple
+        (캐시된 결과 또는 None, 질의 벡터, 지식 베이스 지문)
+        임베딩 실패 등으로 캐시를 쓸 수 없으면 (None, None, None)
+    """
+    try:
+        query_vector = pipeline.vectordb.embeddings.embed_query(user_query)
+        fingerprint = (pipeline.knowledge_fingerprint, faq_fingerprint())
+        return pipeline.semantic_cache.lookup(query_vector, fingerprint), query_vector, fingerprint
+    except Exception as e:
+        logger.warning(f"[Semantic Cache] 조회 실패 -> 캐시 없이 진행: {e}")
+        return None, None, None
+
+
+def _semantic_cache_store(pipeline, query_vector, fingerprint, event):
+    if query_vector is None or event["route"] not in _CACHEABLE_ROUTES:
+        return
+    pipeline.semantic_cache.store(query_vector, event["result"], fingerprint)
+
+
+def _with_semantic_cache(pipeline, user_query: str, trace: RequestTrace, speculation, answer_events):
+    """
+    Router 이후(도구 경로가 아닌 질문) 캐시 조회 / 저장
+    answer_events(query_vectors): 캐시 미적중 시 답변 이벤트 제너레이터를 만드는 함수
+    조회에 쓴 질의 벡터는 검색 단계로 넘겨 같은 질문을 다시 임베딩하지 않도록 합니다.
+    """
+    if pipeline.semantic_cache is None:
+        yield from answer_events({})
+        return
+
+    with trace.stage("semantic_cache"):
+        cached, query_vector, fingerprint = _semantic_cache_lookup(pipeline, user_query)
+    if cached is not None:
+        _cancel_speculation(speculation)
+        yield _final_event(cached, route="cache")
+        return
+
+    for event in answer_events(_query_vectors(user_query, query_vector)):
+        if event["type"] == "final":
+            _semantic_cache_store(pipeline, query_vector, fingerprint, event)
+        yield event
+
+
+async def _awith_semantic_cache(pipeline, user_query: str, trace: RequestTrace, speculation, answer_events):
+    if pipeline.semantic_cache is None:
+        async for event in answer_events({}):
+            yield event
+        return
+
+    # 질의 임베딩은 네트워크 호출이므로 executor에서 실행
+    with trace.stage("semantic_cache"):
+        cached, query_vector, fingerprint = await asyncio.to_thread(
+            _semantic_cache_lookup, pipeline, user_query
+        )
+    if cached is not None:
+        _cancel_speculation(speculation)
+        yield _final_event(cached, route="cache")
+        return
+
+    async for event in answer_events(_query_vectors(user_query, query_vector)):
+        if event["type"] == "final":
+            _semantic_cache_store(pipeline, query_vector, fingerprint, event)
+        yield event
+
+
+def _query_vectors(user_query: str, query_vector) -> dict:
+    # Multi-query 검색어에는 원본 질문이 포함되고, 정제 결과가 원본과 같을 수도 있으므로 원본 질문 기준으로 전달
+    return {user_query.strip(): query_vector} if query_vector is not None else {}
+
+
+# ==============================================================================
+# 파이프라인 엔진
+# - 요청마다 반복되던 준비 작업(도구 바인딩, 분류/정제 체인 조립, Router 시스템 프롬프트,
+#   Re-ranker 생성, 캐시 조회)을 한 번만 수행하고 요청 간 재사용합니다.
+# - run_rag_chain 등 모듈 함수는 (llm, vectordb)별 파이프라인을 재사용하는 얇은 래퍼입니다.
+# ==============================================================================
+
+class RagPipeline:
+    """
+    요청 간 재사용하는 RAG 실행 엔진
+
+    Parameters
+    ----------
+    llm :
+        Router / 분류 / 정제 / 생성에 사용할 Chat 모델
+    vectordb :
+        검색 대상 벡터 DB
+
+    Examples
+    --------
+    >>> pipeline = RagPipeline(llm, vectordb)   # 서버 시작 시 1회
+    >>> pipeline.run("불용 처리 방법 알려줘")
+    """
+
+    def __init__(self, llm, vectordb):
+        self.llm = llm
+        self.vectordb = vectordb
+
+        # Router용 도구 바인딩 LLM
+        self.llm_with_tools = llm.bind_tools(TOOLS)
+
+        # 분류 / 정제 체인 (PromptTemplate | llm | StrOutputParser)
+        self.stage_chains = {
+            "classifier": _build_classifier_chain(llm),
+            "refine": _build_refine_chain(llm),
+        }
+        self.stage_templates = {
+            stage: build_prompt() for stage, build_prompt in _MEMO_STAGE_PROMPTS.items()
+        }
+        # 단계 메모 key에 넣을 LLM 설정 (모델 / temperature가 바뀌면 이전 결과를 재사용하지 않음)
+        self.llm_config_key = llm_config_key(llm)
+
+        # 캐시 (설정에서 꺼져 있으면 None)
+        self.semantic_cache = get_semantic_cache() if USE_SEMANTIC_CACHE else None
+        self.stage_memo = get_stage_memo() if USE_STAGE_MEMO else None
+        # Semantic Cache 무효화 판단용 벡터 DB 지문 (벡터 DB 교체 시에만 다시 계산)
+        self.knowledge_fingerprint = self._compute_knowledge_fingerprint(vectordb)
+
+        # Router 시스템 프롬프트 ((날짜, Planner 여부), SystemMessage)
+        self._router_system_message = (None, None)
+
+        # Re-ranker는 RAG 경로에서 처음 필요할 때 생성
+        self._reranker = None
+        self._reranker_lock = threading.Lock()
+
+    @property
+    def reranker(self) -> CrossEncoderReranker:
+        if self._reranker is None:
+            with self._reranker_lock:
+                if self._reranker is None:
+                    self._reranker = CrossEncoderReranker(RERANKER_MODEL_NAME)
+        return self._reranker
+
+    def router_messages(self, user_query: str):
+        """
+        Router 단계 입력 메시지 구성
+        시스템 프롬프트에 오늘 날짜가 들어가므로 날짜(또는 Planner 설정)가 바뀔 때만 다시 만듭니다.
+        """
+        key = (datetime.now(KST).date(), USE_PLANNER)
+        cached_key, system_message = self._router_system_message
+        if cached_key != key:
+            system_message = SystemMessage(content=_build_router_system_prompt())
+            self._router_system_message = (key, system_message)
+
+        return [system_message, HumanMessage(content=user_query)]
+
+    def swap_vectordb(self, vectordb):
+        """
+        검색 대상 벡터 DB 교체 (인덱스 hot swap, 요청 사이에 호출)
+        도구 바인딩 / 체인 / Re-ranker 모델은 그대로 재사용하며,
+        Semantic Cache는 지식 베이스 지문이 바뀌므로 이전 인덱스 기준 답변을 사용하지 않습니다.
+        """
+        fingerprint = self._compute_knowledge_fingerprint(vectordb)
+        self.vectordb = vectordb
+        self.knowledge_fingerprint = fingerprint
+
+    def _compute_knowledge_fingerprint(self, vectordb):
+        if self.semantic_cache is None:
+            return None
+        return compute_knowledge_fingerprint(vectordb)
+
+    def run(self, user_query: str, retriever_top_k: int = RETRIEVER_TOP_K):
+        """
+        질문 1건 처리 (반환 형식은 run_rag_chain과 동일)
+        """
+        for event in self.stream(user_query, retriever_top_k, stream=False):
+            if event["type"] == "final":
+                return event["result"]
+
+    def stream(self, user_query: str, retriever_top_k: int = RETRIEVER_TOP_K, stream: bool = True):
+        """
+        이벤트 제너레이터 (형식은 stream_rag_chain과 동일)
+        """
+        trace = RequestTrace()
+        events = _rag_chain_events(self, user_query, retriever_top_k, stream=stream, trace=trace)
+        yield from _with_trace(trace, events)
+
+    async def arun(self, user_query: str, retriever_top_k: int = RETRIEVER_TOP_K):
+        async for event in self.astream(user_query, retriever_top_k, stream=False):
+            if event["type"] == "final":
+                return event["result"]
+
+    async def astream(self, user_query: str, retriever_top_k: int = RETRIEVER_TOP_K, stream: bool = True):
+        trace = RequestTrace()
+        events = _arag_chain_events(self, user_query, retriever_top_k, stream=stream, trace=trace)
+        async for event in _awith_trace(trace, events):
+            yield event
+
+    def run_batch(self, queries, retriever_top_k: int = RETRIEVER_TOP_K):
+        """
+        여러 질문 일괄 처리 (run_rag_chain_batch 참고)
+        """
+        return _run_batch(self, queries, retriever_top_k)
+
+
+_pipeline_instance = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline(llm, vectordb) -> RagPipeline:
+    """
+    llm에 해당하는 프로세스 전역 파이프라인
+    - 다른 llm 객체가 들어오면 새로 만들어 교체합니다.
+    - 다른 vectordb 객체가 들어오면(예: DB 재로딩) 파이프라인은 그대로 두고 swap_vectordb로 교체합니다.
+      (hot reload와 같은 경로: 도구 바인딩 / 체인 / Re-ranker 재사용, Semantic Cache 지문 갱신)
+    """
+    global _pipeline_instance
+    pipeline = _pipeline_instance
+    if pipeline is None or pipeline.llm is not llm:
+        with _pipeline_lock:
+            pipeline = _pipeline_instance
+            if pipeline is None or pipeline.llm is not llm:
+                pipeline = RagPipeline(llm, vectordb)
+                _pipeline_instance = pipeline
+
+    if pipeline.vectordb is not vectordb:
+        with _pipeline_lock:
+            if pipeline.vectordb is not vectordb:
+                pipeline.swap_vectordb(vectordb)
+    return pipeline
+
+
+# ==============================================================================
+# 동기 체인
+# - 파이프라인 본체는 이벤트 제너레이터(_rag_chain_events)로 구현하고,
+#   run_rag_chain / stream_rag_chain이 이를 각각 소비합니다.
+# ==============================================================================
+
+def _rag_chain_events(
+    pipeline,
     user_query: str,
-    retriever_top_k: int = RETRIEVER_TOP_K
+    retriever_top_k: int,
+    stream: bool,
+    trace: RequestTrace
 ):
-    
+    llm = pipeline.llm
+
+    # Planner 모드 결과 (None이면 기존 다단계 경로 사용)
+    plan = None
+
+    # Speculative 모드: Router 응답을 기다리는 동안 RAG 경로를 미리 진행
+    speculation = None
+    if _use_speculation():
+        speculation = _start_speculation(pipeline, user_query, retriever_top_k, trace)
+
+    # 도구 결과 요약 단계에서 내보낸 토큰 (오류로 RAG 전환 시 폐기 알림용)
+    parts = []
+
     # 1. Function Calling (도구 사용) 시도
     try:
-        # [최적화] 매번 리스트 생성 없이 미리 만들어둔 전역 상수 TOOLS 사용
-        llm_with_tools = llm.bind_tools(TOOLS)
-        
-        # 시스템 프롬프트 구성
-        system_instruction = build_tool_aware_system_prompt()
-        
-        messages = [
-            SystemMessage(content=system_instruction),
-            HumanMessage(content=user_query)
-        ]
-        
+        # [최적화] 도구 바인딩 / 시스템 프롬프트는 파이프라인에서 미리 만들어 재사용
+        llm_with_tools = pipeline.llm_with_tools
+        messages = pipeline.router_messages(user_query)
+
         # Router 단계: 도구 사용 여부 판단
-        tool_check_response = llm_with_tools.invoke(messages)
-        
+        with trace.stage("router"):
+            tool_check_response = llm_with_tools.invoke(messages, config=trace.llm_config("router"))
+
         # ----------------------------------------------------------------------
         # 도구 호출(Tool Calls)이 감지된 경우
         # ----------------------------------------------------------------------
         if tool_check_response.tool_calls:
             logger.info(f"[Tool Check] 도구 사용 감지: {len(tool_check_response.tool_calls)}건")
-            
-            tool_messages = []  # 결과 누적용 리스트
-
-            pending_navigation = None  # 페이지 이동 명령 대기용 변수
-
-            # 감지된 모든 도구 순차 실행
-            for tool_call in tool_check_response.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                
-                # [안전장치 1] 정의되지 않은 도구 무시
-                if tool_name not in TOOL_MAP:
-                    logger.warning(f"[Tool Execution] 정의되지 않은 도구 요청 무시: {tool_name}")
-                    continue
-                 
-                # [안전장치 2] 로깅 보안 (Sanitization + Redaction)
-                if isinstance(tool_args, dict):
-                    safe_args = {}
-                    for k, v in tool_args.items():
-                        # [보안] 1. 민감한 키(Key)인지 확인 -> 마스킹 처리
-                        if str(k).lower() in SENSITIVE_KEYS:
-                            safe_args[k] = "[REDACTED]" # 혹은 "*****"
-                        
-                        # [기존] 2. 일반 데이터는 길이 제한 (Truncation)
-                        else:
-                            val_str = str(v).replace("\n", "\\n")
-                            safe_args[k] = val_str[:100] + "..." if len(val_str) > 100 else val_str
-                
-                else:
-                    # 딕셔너리가 아닌 경우 (단일 문자열 등) -> 기존 방식 유지
-                    safe_args = str(tool_args)[:100].replace("\n", "\\n")
-                
-                logger.info(f"[Tool Execution] '{tool_name}' 실행 중... | 인자: {safe_args}")
-                
-                try:
-                    # 도구 객체 가져오기 및 실행
-                    selected_tool = TOOL_MAP[tool_name]
-                    tool_output_str = selected_tool.invoke(tool_args)
-                    
-                    # 결과 분석: JSON 파싱 시도
-                    parsed_output = None
-                    try:
-                        parsed_output = json.loads(tool_output_str)
-                    except (json.JSONDecodeError, TypeError):
-                        # JSON 파싱에 실패한 경우, 도구 출력은 일반 텍스트로 처리하기 위해 parsed_output을 None으로 유지합니다.
-                        parsed_output = None
-
-                    # -------------------------------------------------------
-                    # [Case A] 페이지 이동 (Navigate) -> 임시 저장 (즉시 종료 X)
-                    # -------------------------------------------------------
-                    if (
-                        isinstance(parsed_output, dict)
-                        and parsed_output.get("action") == "navigate"
-                        and parsed_output.get("target_url")
-                    ):
-                        logger.info("[Tool Output] 페이지 이동 요청 감지 -> 다른 작업 완료 후 이동 예정")
-                        
-                        # 즉시 return 하지 않고 변수에 저장해둡니다.
-                        pending_navigation = {
-                            "answer": parsed_output.get("guide_msg", "페이지로 이동합니다."),
-                            "target_url": parsed_output.get("target_url"),
-                            "query": user_query,
-                            "action": "navigate"
-                        }
-                        continue  # 다음 도구 처리나 로직으로 넘어감
-
-                    # -------------------------------------------------------
-                    # [Case B] 정보 조회 (Search) -> 결과 누적(Append)
-                    # -------------------------------------------------------
-                    
-                    # 타입 체크 및 안전한 문자열 변환 로직
-                    final_content = ""
-                    
-                    if isinstance(tool_output_str, str):
-                        # 정상적인 문자열인 경우 그대로 사용
-                        final_content = tool_output_str
-                    else:
-                        # 문자열이 아닌 경우 (예: Dict, List, Int 등)
-                        # 1. 코파일럿 지적 반영: 버그를 숨기지 않도록 경고 로그 출력
-                        logger.warning(f"[Tool Warning] {tool_name} 도구가 문자열이 아닌 타입({type(tool_output_str)})을 반환했습니다. 자동 변환합니다.")
-                        
-                        # 2. LLM이 이해하기 쉬운 JSON 형태의 문자열로 변환 (실패 시 일반 str 변환)
-                        try:
-                            final_content = json.dumps(tool_output_str, ensure_ascii=False)
-                        except:
-                            final_content = str(tool_output_str)
-
-                    logger.info(f"[Tool Output] 데이터 조회 완료. (메시지 이력에 추가)")
-                    
-                    tool_messages.append(
-                        ToolMessage(
-                            content=final_content,  # 검증된 문자열 사용
-                            tool_call_id=tool_call["id"],
-                            name=tool_name
-                        )
-                    )
 
-                except Exception as e:
-                    # 개별 도구 에러 처리 (멈추지 않고 에러 메시지를 LLM에게 전달)
-                    logger.error(f"[Tool Execution Error] {tool_name} 실행 실패: {e}", exc_info=True)
-                    tool_messages.append(
-                        ToolMessage(
-                            content=f"Error: {str(e)}",
-                            tool_call_id=tool_call["id"],
-                            name=tool_name,
-                        )
-                    )
+            # 감지된 모든 도구 실행 (설정에 따라 병렬, 결과 순서는 호출 순서 유지)
+            trace.set_count("tools", "calls", len(tool_check_response.tool_calls))
+            with trace.stage("tools"):
+                tool_messages, pending_navigation = _collect_tool_results(
+                    _execute_tool_calls(tool_check_response.tool_calls, user_query)
+                )
 
             # ------------------------------------------------------------------
             # 도구 실행 후 최종 답변 생성 (Generator)
             # ------------------------------------------------------------------
             # 도구 메시지가 있거나(OR) 화면 이동 명령이 있다면 RAG를 스킵하고 여기서 처리
             if tool_messages or pending_navigation:
-                
+
                 final_answer_text = ""
 
                 # Case A: 도구 실행 결과(데이터)가 있는 경우 -> LLM이 내용을 정리해서 답변
@@ -191,41 +1130,21 @@ def run_rag_chain(
                     logger.info(f"[Tool Finalizing] 총 {len(tool_messages)}건의 정보를 바탕으로 답변 생성 중...")
 
                     # 대화 이력 재구성: [시스템, 유저질문, (AI의 도구호출), 도구결과1, 도구결과2...]
-                    history = [
-                        SystemMessage(content=system_instruction),
-                        HumanMessage(content=user_query),
-                        tool_check_response, 
-                    ] + tool_messages
-                    
+                    history = messages + [tool_check_response] + tool_messages
+
                     # 순수 LLM으로 최종 답변 생성
-                    final_response = llm.invoke(history)
-                    final_answer_text = final_response.content
+                    yield from _generate(llm, history, stream, parts, trace, stage="tool_summary")
+                    final_answer_text = "".join(parts)
 
                 # Case B: 데이터는 없지만 화면 이동 명령만 있는 경우 ("설정 화면으로 가줘")
                 else:
                     logger.info("[Tool Finalizing] 데이터 조회 없이 화면 이동만 수행합니다.")
                     final_answer_text = "요청하신 화면으로 이동합니다."
 
-                # --------------------------------------------------------------
-                # 결과 반환 처리
-                # --------------------------------------------------------------
-                
-                # 1. 화면 이동 명령이 있는 경우
-                if pending_navigation:
-                    logger.info(f"[Final Step] 페이지 이동 명령 실행: {pending_navigation.get('target_url')}")
-                    
-                    # LLM이 만든 답변(혹은 기본 문구)을 이동 명령 패키지에 담음
-                    pending_navigation["answer"] = final_answer_text
-                    
-                    # 이동 명령 반환 (RAG 스킵)
-                    return pending_navigation
-
-                # 2. 이동 없이 답변만 있는 경우
-                return {
-                    "answer": final_answer_text,
-                    "attribution": []
-                }
-            
+                _cancel_speculation(speculation)
+                yield _final_event(_finalize_tool_response(final_answer_text, pending_navigation), route="tool")
+                return
+
             # ------------------------------------------------------------------
             # 도구 결과도 없고, 이동 명령도 없는 경우 -> RAG 검색 수행
             # ------------------------------------------------------------------
@@ -235,165 +1154,582 @@ def run_rag_chain(
         else:
             # 애초에 도구 호출이 필요 없는 질문인 경우 -> RAG로 넘어감
             logger.info("[Tool Fallback] 도구 호출 요청 없음 -> RAG로 전환")
+            plan = _plan_from_router_response(tool_check_response)
 
     except Exception as e:
         logger.error(f"[Tool System Error] 도구 처리 중 오류 -> RAG로 전환: {e}", exc_info=True)
+        # 요약 답변 일부가 이미 출력되었으면 RAG 답변으로 대체되도록 폐기 알림
+        if stream and parts:
+            yield _reset_event()
 
-    # 0. 질문 분류 (LLM-first 판단)
-    classifier_prompt = PromptTemplate.from_template(
-    build_question_classifier_prompt()
-)
-    classifier_chain = classifier_prompt | llm | StrOutputParser()
+    # 2. 시맨틱 캐시 조회 후 답변 (도구 경로가 아닌 질문만)
+    yield from _with_semantic_cache(
+        pipeline, user_query, trace, speculation,
+        lambda query_vectors: _rag_answer_events(
+            pipeline, user_query, retriever_top_k, stream, trace, plan, speculation, query_vectors
+        )
+    )
 
-    classification = classifier_chain.invoke({"question": user_query}) # 사용자 질문 전달
 
-    use_rag = classification.strip() == "NEED_RAG" # RAG 필요 여부 판단
-    
-    logger.info(f"[Question Classification] {classification}")
+def _rag_answer_events(
+    pipeline,
+    user_query: str,
+    retriever_top_k: int,
+    stream: bool,
+    trace: RequestTrace,
+    plan,
+    speculation,
+    query_vectors: dict
+):
+    """
+    Router가 도구를 사용하지 않은 질문의 답변 경로 (분류 → 검색 → Re-ranking → 생성)
+    query_vectors: 이미 계산된 질의 임베딩 {검색어: 벡터} (검색 단계에서 재사용)
+    """
+    llm = pipeline.llm
+
+    # 0. 질문 분류 (LLM-first 판단) - Planner 결과가 있으면 생략
+    if plan is not None:
+        use_rag = plan["need_rag"]
+    else:
+        if speculation is not None:
+            classification = speculation["classification"].result()
+        else:
+            classification = _invoke_stage(pipeline, "classifier", user_query, trace) # 사용자 질문 전달
+
+        use_rag = classification.strip() == "NEED_RAG" # RAG 필요 여부 판단
+
+        logger.info(f"[Question Classification] {classification}")
 
     # A. RAG 필요 없는 질문 → LLM 바로 응답
     if not use_rag:
-        prompt = assemble_prompt(
-            context="",              # context 없이
-            question=user_query
-        )
+        _cancel_speculation(speculation, "retrieval")
 
-        response = llm.invoke(
-            [HumanMessage(content=prompt)]
-        )
+        parts = []
+        yield from _generate(llm, _build_no_rag_messages(user_query), stream, parts, trace)
 
-        return {
-            "answer": response.content,
+        yield _final_event({
+            "answer": "".join(parts),
             "attribution": []        # RAG 미사용
-        }
+        }, route="no_rag")
+        return
+
     # B. RAG 필요한 경우만 아래 로직 수행
+    parts = []
     try:
-        # 질문 정제
-        refine_prompt = PromptTemplate.from_template(
-        build_query_refine_prompt()
-        )
-
-        refine_chain = refine_prompt | llm | StrOutputParser()
-        
-        # LLM에게 검색어 변환 요청
-        refined_query = refine_chain.invoke({"question": user_query})
-        
-        # 로그 확인용 - logging 모듈 사용
-        logger.info(f"[Query Refinement] 원본: '{user_query}' -> 변환: '{refined_query}'")
-
-        # 1. Retrieval (검색)
-        retrieved_docs = retrieve_docs(
-            vectordb=vectordb,
-            query=refined_query,   # [CHANGED] user_query -> refined_query
-            top_k=retriever_top_k
-        )
-
-        # 검색 실패 시 fallback
-        if not retrieved_docs:
-            context = ""
-            attribution = []
+        if speculation is not None:
+            # Router와 병렬로 미리 수행한 검색어 정제 + 검색 결과 사용
+            refined_query, retrieved_docs = speculation["retrieval"].result()
+            logger.info(f"[Query Refinement] 원본: '{user_query}' -> 변환: '{refined_query}' (speculative)")
         else:
-            # 기존 filtering / reranking 로직
-            context = ...
-            attribution = ...
+            # 질문 정제 - Planner가 검색어를 만들었으면 그대로 사용
+            if plan is not None and plan["search_query"]:
+                refine_output = plan["search_query"]
+            else:
+                # LLM에게 검색어 변환 요청
+                refine_output = _invoke_stage(pipeline, "refine", user_query, trace)
+            refined_query, search_queries = _split_refined_queries(refine_output, user_query)
+
+            # 로그 확인용 - logging 모듈 사용
+            logger.info(f"[Query Refinement] 원본: '{user_query}' -> 변환: '{refined_query}'")
 
+            # 1. Retrieval (검색) - user_query가 아닌 refined_query 사용
+            metadata_filter = _resolve_metadata_filter(refined_query, plan)
+            retrieved_docs = _retrieve(
+                pipeline.vectordb, refined_query, retriever_top_k, trace, metadata_filter, search_queries,
+                query_vectors
+            )
 
         # 2️. 유사도 점수 score 기반 필터링
-        # threshold 이하 문서만 유지
-        filtered_docs = [
-            (doc, retrieved_score)
-            for doc, retrieved_score in retrieved_docs
-            if retrieved_score <= SIMILARITY_SCORE_THRESHOLD
-        ]
+        filtered_docs = _filter_retrieved_docs(retrieved_docs)
+        trace.set_count("retrieval", "kept", len(filtered_docs))
 
         # threshold 통과 문서가 없는 경우 fallback
         if not filtered_docs:
-            return {
+            yield _final_event({
                 "answer": NO_CONTEXT_RESPONSE,
                 "attribution": []
-            }
+            }, route="no_context")
+            return
 
-        # reranking 직전 디버깅
-        if USE_RERANKING and RERANK_DEBUG:
-            logger.debug("[DEBUG] Retrieval 결과 (정렬 전):")
-            for i, (doc, score) in enumerate(filtered_docs[:5]):
-                logger.debug(f"  [{i}] doc_id={doc.metadata.get('doc_id')} | score={score:.4f}")
-        
-        # 기본값 None으로 명시
-        rerank_candidates = None
+        # 3. Re-ranking / 상위 문서 선택
+        top_docs = _select_top_docs(pipeline, refined_query, filtered_docs, trace)
 
-        # 정렬 (Chroma는 score가 낮을수록 유사함 -> 오름차순 정렬)
-        filtered_docs.sort(key=lambda x: x[1])  
+        # 4~6. Context / Attribution / 프롬프트 구성
+        rag_messages, attribution = _build_rag_messages(top_docs, user_query)
 
-        # Re-ranking 대상 후보 수 제한
-        rerank_candidates = filtered_docs
-
-        if USE_RERANKING:
-            rerank_candidates = filtered_docs[:RERANK_CANDIDATE_K]
-
-        # 3. Re-ranking
-        if USE_RERANKING:
-            if RERANK_DEBUG:
-                logger.debug("[DEBUG] Re-ranking 적용")
-
-            reranker = CrossEncoderReranker(RERANKER_MODEL_NAME)
-            
-            # 중요: Re-ranking도 '변환된 질문(refined_query)'과 문서를 비교해야 정확
-            top_docs = reranker.rerank(
-                query=refined_query,  # [CHANGED] user_query -> refined_query
-                docs_with_scores=rerank_candidates,
-                top_n=RERANK_TOP_N
-            )
+        # 7. LLM 답변 생성
+        yield from _generate(llm, rag_messages, stream, parts, trace)
 
-            # Re-ranking 후 결과 확인 로직 (logger 사용)
-            if RERANK_DEBUG:
-                logger.debug("[DEBUG] Re-ranking 후 최종 선택된 문서:")
-                for i, doc in enumerate(top_docs):
-                    logger.debug(f"  [{i}] {doc.metadata.get('title', 'No Title')} (ID: {doc.metadata.get('doc_id')})")
+        yield _final_event({
+            "answer": "".join(parts),
+            "attribution": attribution
+        }, route="rag")
+
+    except Exception as e:
+        _log_chain_failure(e, user_query)
+
+        # 답변 일부가 이미 출력되었으면 오류 안내로 대체되도록 폐기 알림
+        if stream and parts:
+            yield _reset_event()
+        yield _final_event({
+            "answer": TECHNICAL_ERROR_RESPONSE,
+            "attribution": []
+        }, route="error")
+
+
+def run_rag_chain(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int = RETRIEVER_TOP_K
+):
+    return get_pipeline(llm, vectordb).run(user_query, retriever_top_k)
+
+
+def stream_rag_chain(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int = RETRIEVER_TOP_K
+):
+    """
+    run_rag_chain의 스트리밍 버전 (제너레이터)
+
+    Yields
+    ------
+    dict
+        - {"type": "token", "content": str}: 최종 생성 / 도구 결과 요약 단계의 답변 토큰
+        - {"type": "reset"}: 지금까지 받은 토큰을 폐기 (토큰 일부 이후 오류로 다른 답변으로 대체될 때)
+        - {"type": "final", "result": dict, "route": str}: 마지막 이벤트. result는 run_rag_chain 반환값과 동일
+          (answer 전체, attribution, 이동 시 target_url/action 포함)
+    """
+    yield from get_pipeline(llm, vectordb).stream(user_query, retriever_top_k)
+
+
+# ==============================================================================
+# 비동기 체인
+# - LLM 호출은 ainvoke/astream으로, Chroma 검색 / CrossEncoder / 도구(HTTP) 실행은
+#   기본 executor에서 수행하여 이벤트 루프를 막지 않습니다.
+# - 반환 형식은 run_rag_chain과 동일합니다.
+# ==============================================================================
+
+async def _arag_chain_events(
+    pipeline,
+    user_query: str,
+    retriever_top_k: int,
+    stream: bool,
+    trace: RequestTrace
+):
+    llm = pipeline.llm
+
+    # Planner 모드 결과 (None이면 기존 다단계 경로 사용)
+    plan = None
+
+    # Speculative 모드: Router 응답을 기다리는 동안 RAG 경로를 Task로 미리 진행
+    speculation = None
+    if _use_speculation():
+        speculation = _astart_speculation(pipeline, user_query, retriever_top_k, trace)
+
+    # 도구 결과 요약 단계에서 내보낸 토큰 (오류로 RAG 전환 시 폐기 알림용)
+    parts = []
+
+    # 1. Function Calling (도구 사용) 시도
+    try:
+        llm_with_tools = pipeline.llm_with_tools
+        messages = pipeline.router_messages(user_query)
+
+        # Router 단계: 도구 사용 여부 판단
+        with trace.stage("router"):
+            tool_check_response = await llm_with_tools.ainvoke(messages, config=trace.llm_config("router"))
+
+        if tool_check_response.tool_calls:
+            logger.info(f"[Tool Check] 도구 사용 감지: {len(tool_check_response.tool_calls)}건")
+
+            # 도구는 동기 HTTP 호출이므로 executor에서 실행 (설정에 따라 병렬)
+            trace.set_count("tools", "calls", len(tool_check_response.tool_calls))
+            with trace.stage("tools"):
+                tool_messages, pending_navigation = _collect_tool_results(
+                    await _aexecute_tool_calls(tool_check_response.tool_calls, user_query)
+                )
+
+            if tool_messages or pending_navigation:
+                if tool_messages:
+                    logger.info(f"[Tool Finalizing] 총 {len(tool_messages)}건의 정보를 바탕으로 답변 생성 중...")
+                    history = messages + [tool_check_response] + tool_messages
+                    async for event in _agenerate(llm, history, stream, parts, trace, stage="tool_summary"):
+                        yield event
+                    final_answer_text = "".join(parts)
+                else:
+                    logger.info("[Tool Finalizing] 데이터 조회 없이 화면 이동만 수행합니다.")
+                    final_answer_text = "요청하신 화면으로 이동합니다."
+
+                _cancel_speculation(speculation)
+                yield _final_event(_finalize_tool_response(final_answer_text, pending_navigation), route="tool")
+                return
+
+            logger.info("[Tool Fallback] 유효한 도구 결과 및 이동 명령 없음 -> RAG로 전환")
 
         else:
-            # Reranking 안 쓰면 상위 N개만 선택
-            top_docs = [doc for doc, _ in filtered_docs[:TOP_N_CONTEXT]]
-
-        # 4. Context 구성
-        # re-ranking 이후에는 Document 리스트만 사용
-        context = "\n\n".join([
-            doc.page_content for doc in top_docs 
-        ])
-
-        # 5. Chunk Attribution 구성
-        attribution = [
-            {"doc_id": doc.metadata.get("doc_id")}
-            for doc in top_docs
-        ]
+            logger.info("[Tool Fallback] 도구 호출 요청 없음 -> RAG로 전환")
+            plan = _plan_from_router_response(tool_check_response)
+
+    except Exception as e:
+        logger.error(f"[Tool System Error] 도구 처리 중 오류 -> RAG로 전환: {e}", exc_info=True)
+        # 요약 답변 일부가 이미 출력되었으면 RAG 답변으로 대체되도록 폐기 알림
+        if stream and parts:
+            yield _reset_event()
 
-        # 6. 프롬프트 생성
-        prompt = assemble_prompt(
-            context=context,
-            question=user_query
+    # 2. 시맨틱 캐시 조회 후 답변 (도구 경로가 아닌 질문만)
+    async for event in _awith_semantic_cache(
+        pipeline, user_query, trace, speculation,
+        lambda query_vectors: _arag_answer_events(
+            pipeline, user_query, retriever_top_k, stream, trace, plan, speculation, query_vectors
         )
-        
+    ):
+        yield event
+
+
+async def _arag_answer_events(
+    pipeline,
+    user_query: str,
+    retriever_top_k: int,
+    stream: bool,
+    trace: RequestTrace,
+    plan,
+    speculation,
+    query_vectors: dict
+):
+    """
+    _rag_answer_events의 비동기 버전
+    """
+    llm = pipeline.llm
+
+    # 0. 질문 분류 (LLM-first 판단) - Planner 결과가 있으면 생략
+    if plan is not None:
+        use_rag = plan["need_rag"]
+    else:
+        if speculation is not None:
+            classification = await speculation["classification"]
+        else:
+            classification = await _ainvoke_stage(pipeline, "classifier", user_query, trace)
+        use_rag = classification.strip() == "NEED_RAG"
+
+        logger.info(f"[Question Classification] {classification}")
+
+    # A. RAG 필요 없는 질문 → LLM 바로 응답
+    if not use_rag:
+        _cancel_speculation(speculation, "retrieval")
+
+        parts = []
+        async for event in _agenerate(llm, _build_no_rag_messages(user_query), stream, parts, trace):
+            yield event
+        yield _final_event({
+            "answer": "".join(parts),
+            "attribution": []
+        }, route="no_rag")
+        return
+
+    # B. RAG 필요한 경우만 아래 로직 수행
+    parts = []
+    try:
+        if speculation is not None:
+            # Router와 병렬로 미리 수행한 검색어 정제 + 검색 결과 사용
+            refined_query, retrieved_docs = await speculation["retrieval"]
+            logger.info(f"[Query Refinement] 원본: '{user_query}' -> 변환: '{refined_query}' (speculative)")
+        else:
+            if plan is not None and plan["search_query"]:
+                refine_output = plan["search_query"]
+            else:
+                refine_output = await _ainvoke_stage(pipeline, "refine", user_query, trace)
+            refined_query, search_queries = _split_refined_queries(refine_output, user_query)
+
+            logger.info(f"[Query Refinement] 원본: '{user_query}' -> 변환: '{refined_query}'")
+
+            # 1. Retrieval (검색) - 임베딩 API + Chroma 조회는 블로킹 I/O
+            metadata_filter = _resolve_metadata_filter(refined_query, plan)
+            retrieved_docs = await asyncio.to_thread(
+                _retrieve, pipeline.vectordb, refined_query, retriever_top_k, trace, metadata_filter, search_queries,
+                query_vectors
+            )
+
+        # 2. 유사도 점수 score 기반 필터링
+        filtered_docs = _filter_retrieved_docs(retrieved_docs)
+        trace.set_count("retrieval", "kept", len(filtered_docs))
+
+        if not filtered_docs:
+            yield _final_event({
+                "answer": NO_CONTEXT_RESPONSE,
+                "attribution": []
+            }, route="no_context")
+            return
+
+        # 3. Re-ranking - CrossEncoder는 CPU 연산이므로 executor에서 실행
+        top_docs = await asyncio.to_thread(_select_top_docs, pipeline, refined_query, filtered_docs, trace)
+
+        # 4~6. Context / Attribution / 프롬프트 구성
+        rag_messages, attribution = _build_rag_messages(top_docs, user_query)
+
         # 7. LLM 답변 생성
-        response = llm.invoke(
-            [
-                HumanMessage(content=prompt)
-            ]
-        )
+        async for event in _agenerate(llm, rag_messages, stream, parts, trace):
+            yield event
 
-        return {
-            "answer": response.content,
+        yield _final_event({
+            "answer": "".join(parts),
             "attribution": attribution
-        }
+        }, route="rag")
 
     except Exception as e:
-        logger.error(f"[ERROR] LLM Chain failed: {e}")
-        logger.error(f"[ERROR] Failed query: {user_query}")
-        logger.error(traceback.format_exc())
+        _log_chain_failure(e, user_query)
 
-        return {
+        # 답변 일부가 이미 출력되었으면 오류 안내로 대체되도록 폐기 알림
+        if stream and parts:
+            yield _reset_event()
+        yield _final_event({
             "answer": TECHNICAL_ERROR_RESPONSE,
             "attribution": []
-        }
+        }, route="error")
+
+
+async def arun_rag_chain(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int = RETRIEVER_TOP_K
+):
+    """
+    run_rag_chain의 asyncio 버전
+    하나의 이벤트 루프에서 여러 요청을 동시에 처리할 수 있습니다.
+    """
+    return await get_pipeline(llm, vectordb).arun(user_query, retriever_top_k)
+
+
+async def astream_rag_chain(
+    llm,
+    vectordb,
+    user_query: str,
+    retriever_top_k: int = RETRIEVER_TOP_K
+):
+    """
+    stream_rag_chain의 asyncio 버전 (async iterator)
+    이벤트 형식은 stream_rag_chain과 동일합니다.
+    """
+    async for event in get_pipeline(llm, vectordb).astream(user_query, retriever_top_k):
+        yield event
+
+# ==============================================================================
+# 배치 체인 (오프라인 평가 / 대량 QA 검수용)
+# - 질문 단위가 아니라 단계 단위로 묶어서 실행합니다.
+#   Router / 분류 / 정제 / 생성: llm.batch, 검색어 임베딩: embed_documents 1회,
+#   Re-ranking: CrossEncoder predict 1회
+# - 질문별 오류는 해당 질문의 결과에만 반영됩니다.
+# ==============================================================================
+
+def _technical_error_result():
+    return {
+        "answer": TECHNICAL_ERROR_RESPONSE,
+        "attribution": []
+    }
+
+
+def run_rag_chain_batch(
+    llm,
+    vectordb,
+    queries,
+    retriever_top_k: int = RETRIEVER_TOP_K
+):
+    """
+    여러 질문을 한 번에 처리합니다.
+    결과는 입력 순서와 같으며, 각 항목의 형식은 run_rag_chain 반환값과 동일합니다.
+    (시맨틱 캐시와 Speculative 모드는 적용되지 않습니다.)
+    """
+    return get_pipeline(llm, vectordb).run_batch(queries, retriever_top_k)
+
+
+def _run_batch(pipeline, queries, retriever_top_k: int):
+    llm = pipeline.llm
+    vectordb = pipeline.vectordb
+    queries = list(queries)
+    if not queries:
+        return []
+
+    results = [None] * len(queries)
+    plans = [None] * len(queries)
+
+    # --------------------------------------------------------------------------
+    # 1. Router (도구 판단) 일괄 호출
+    # --------------------------------------------------------------------------
+    router_messages = [pipeline.router_messages(query) for query in queries]
+    try:
+        router_responses = pipeline.llm_with_tools.batch(router_messages, return_exceptions=True)
+    except Exception as e:
+        router_responses = [e] * len(queries)
+
+    summary_jobs = []  # (질문 index, 대화 이력, 이동 명령)
+    for i, response in enumerate(router_responses):
+        if isinstance(response, Exception):
+            logger.error(f"[Tool System Error] 도구 처리 중 오류 -> RAG로 전환: {response}")
+            continue
+
+        if not response.tool_calls:
+            plans[i] = _plan_from_router_response(response)
+            continue
+
+        tool_messages, pending_navigation = _collect_tool_results(
+            _execute_tool_calls(response.tool_calls, queries[i])
+        )
+        if tool_messages:
+            summary_jobs.append((i, router_messages[i] + [response] + tool_messages, pending_navigation))
+        elif pending_navigation:
+            results[i] = _finalize_tool_response("요청하신 화면으로 이동합니다.", pending_navigation)
+        else:
+            logger.info("[Tool Fallback] 유효한 도구 결과 및 이동 명령 없음 -> RAG로 전환")
+
+    # 도구 결과 요약 일괄 생성 (실패 시 해당 질문은 RAG로 전환)
+    if summary_jobs:
+        summaries = llm.batch([history for _, history, _ in summary_jobs], return_exceptions=True)
+        for (i, _, pending_navigation), summary in zip(summary_jobs, summaries):
+            if isinstance(summary, Exception):
+                logger.error(f"[Tool System Error] 도구 처리 중 오류 -> RAG로 전환: {summary}")
+                continue
+            results[i] = _finalize_tool_response(summary.content, pending_navigation)
+
+    # --------------------------------------------------------------------------
+    # 2. 질문 분류 일괄 호출 (Planner 결과가 있는 질문은 제외)
+    # --------------------------------------------------------------------------
+    pending_idx = [i for i in range(len(queries)) if results[i] is None]
+    use_rag = {i: plans[i]["need_rag"] for i in pending_idx if plans[i] is not None}
+
+    classify_idx = [i for i in pending_idx if plans[i] is None]
+    if classify_idx:
+        classifications = _batch_stage(pipeline, "classifier", [queries[i] for i in classify_idx])
+        for i, classification in zip(classify_idx, classifications):
+            if isinstance(classification, Exception):
+                _log_chain_failure(classification, queries[i])
+                results[i] = _technical_error_result()
+                continue
+            logger.info(f"[Question Classification] {classification}")
+            use_rag[i] = classification.strip() == "NEED_RAG"
+
+    generation_jobs = []  # (질문 index, 입력 messages, attribution)
+    rag_idx = []
+    for i in pending_idx:
+        if results[i] is not None:
+            continue
+        if use_rag[i]:
+            rag_idx.append(i)
+        else:
+            generation_jobs.append((i, _build_no_rag_messages(queries[i]), []))
+
+    # --------------------------------------------------------------------------
+    # 3. 검색어 정제 일괄 호출
+    # --------------------------------------------------------------------------
+    refined_queries = {
+        i: plans[i]["search_query"]
+        for i in rag_idx
+        if plans[i] is not None and plans[i]["search_query"]
+    }
+    refine_idx = [i for i in rag_idx if i not in refined_queries]
+    if refine_idx:
+        outputs = _batch_stage(pipeline, "refine", [queries[i] for i in refine_idx])
+        for i, refined_query in zip(refine_idx, outputs):
+            if isinstance(refined_query, Exception):
+                _log_chain_failure(refined_query, queries[i])
+                results[i] = _technical_error_result()
+                continue
+            refined_queries[i] = refined_query
+
+    search_idx = [i for i in rag_idx if i in refined_queries]
+    search_queries = {}
+    for i in search_idx:
+        refined_queries[i], search_queries[i] = _split_refined_queries(refined_queries[i], queries[i])
+        logger.info(f"[Query Refinement] 원본: '{queries[i]}' -> 변환: '{refined_queries[i]}'")
+
+    # --------------------------------------------------------------------------
+    # 4. Retrieval: 임베딩 1회 호출 + 벡터 검색
+    # - Multi-query 모드에서는 모든 질문의 검색어 변형을 한 번에 임베딩
+    # --------------------------------------------------------------------------
+    filtered_docs_map = {}
+    if search_idx:
+        try:
+            flat_vectors = vectordb.embeddings.embed_documents(
+                [search_query for i in search_idx for search_query in search_queries[i]]
+            )
+        except Exception as e:
+            for i in search_idx:
+                _log_chain_failure(e, queries[i])
+                results[i] = _technical_error_result()
+            flat_vectors = []
+
+        # 질문별 검색어 변형 임베딩으로 다시 나눔
+        query_vectors = []
+        if flat_vectors:
+            offset = 0
+            for i in search_idx:
+                query_vectors.append(flat_vectors[offset:offset + len(search_queries[i])])
+                offset += len(search_queries[i])
+
+        for i, variant_vectors in zip(search_idx, query_vectors):
+            try:
+                metadata_filter = _resolve_metadata_filter(refined_queries[i], plans[i])
+                variant_results = [
+                    retrieve_docs_by_vector(
+                        vectordb=vectordb,
+                        embedding=query_vector,
+                        top_k=retriever_top_k,
+                        query=search_query,
+                        metadata_filter=metadata_filter
+                    )
+                    for search_query, query_vector in zip(search_queries[i], variant_vectors)
+                ]
+                if len(variant_results) > 1:
+                    retrieved_docs = fuse_ranked_results(variant_results, retriever_top_k)
+                else:
+                    retrieved_docs = variant_results[0]
+            except Exception as e:
+                _log_chain_failure(e, queries[i])
+                results[i] = _technical_error_result()
+                continue
+
+            filtered_docs = _filter_retrieved_docs(retrieved_docs)
+            if not filtered_docs:
+                results[i] = {
+                    "answer": NO_CONTEXT_RESPONSE,
+                    "attribution": []
+                }
+                continue
+            filtered_docs_map[i] = filtered_docs
+
+    # --------------------------------------------------------------------------
+    # 5. Re-ranking: 전체 (query, doc) 쌍 1회 채점
+    # --------------------------------------------------------------------------
+    if filtered_docs_map:
+        rerank_idx = list(filtered_docs_map.keys())
+        top_docs_list = _select_top_docs_batch(
+            pipeline,
+            [refined_queries[i] for i in rerank_idx],
+            [filtered_docs_map[i] for i in rerank_idx]
+        )
+        for i, top_docs in zip(rerank_idx, top_docs_list):
+            rag_messages, attribution = _build_rag_messages(top_docs, queries[i])
+            generation_jobs.append((i, rag_messages, attribution))
+
+    # --------------------------------------------------------------------------
+    # 6. 최종 답변 일괄 생성
+    # --------------------------------------------------------------------------
+    if generation_jobs:
+        responses = llm.batch([messages for _, messages, _ in generation_jobs], return_exceptions=True)
+        for (i, _, attribution), response in zip(generation_jobs, responses):
+            if isinstance(response, Exception):
+                _log_chain_failure(response, queries[i])
+                results[i] = _technical_error_result()
+                continue
+            results[i] = {
+                "answer": response.content,
+                "attribution": attribution
+            }
+
+    return results
+
 
 """
 RAG Chain 구성
@@ -403,4 +1739,13 @@ RAG Chain 구성
 - Context Selection: 상위 chunk 선별
 - Generation: context 기반 LLM 응답 생성
 - Chunk Attribution: 사용 chunk metadata 추적
-"""
\ No newline at end of file
+- Async: arun_rag_chain으로 동일 파이프라인을 asyncio 환경에서 실행
+- Planner: USE_PLANNER 활성화 시 Router 1회 호출로 도구/분류/검색어 정제를 함께 판단
+- Speculative: USE_SPECULATIVE_EXECUTION 활성화 시 Router와 분류/정제/검색을 병렬 실행
+- Semantic Cache: USE_SEMANTIC_CACHE 활성화 시 유사 질문의 이전 답변을 재사용
+- Stage Memo: USE_STAGE_MEMO 활성화 시 분류/정제 결과를 질문 단위로 재사용 (SQLite 영속화 선택)
+- Pipeline: RagPipeline이 도구 바인딩 / 체인 / Router 프롬프트 / Re-ranker / 캐시를 미리 준비해 재사용
+- Metrics: 단계별 latency / 토큰 / 후보 수 계측 (rag.metrics, INCLUDE_TIMINGS_IN_RESULT 시 결과에 timings 포함)
+- Batch: run_rag_chain_batch로 여러 질문을 단계별 일괄 처리 (llm.batch / embed_documents / predict 1회)
+- Streaming: stream_rag_chain / astream_rag_chain으로 답변 토큰을 순차 전달 (attribution은 마지막 이벤트)
+"""
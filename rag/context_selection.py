@@ -0,0 +1,143 @@
+# MMR(Maximal Marginal Relevance) 기반 Context 선택
+# - Re-ranking 이후 상위 문서들은 같은 절차를 반복 설명하는 경우가 많아 생성 단계 입력 토큰만 늘림
+# - 색인에 저장된 문서 임베딩으로 문서 간 유사도 행렬을 한 번에 계산하고,
+#   relevance(Re-ranking 순위)와 이미 고른 문서와의 최대 유사도를 함께 보며 토큰 예산 안에서 순서대로 선택
+# - 문서 임베딩을 구할 수 없으면 순위 순서 그대로 토큰 예산만 적용
+
+import logging
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app.config import (
+    LLM_MODEL_NAME,
+    MMR_LAMBDA,
+    CONTEXT_TOKEN_BUDGET,
+    MMR_REDUNDANCY_THRESHOLD,
+    METRICS_COUNT_BUCKETS,
+    METRICS_TOKEN_BUCKETS
+)
+from rag.metrics import get_metrics_registry
+from vectorstore.retriever import get_document_vectors
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """
+    LLM_MODEL_NAME의 tiktoken 인코딩 (인코딩 파일을 받을 수 없는 환경이면 None)
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(LLM_MODEL_NAME)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"[Context Selection] tiktoken 인코딩 로딩 실패 -> 글자 수로 토큰 수 추정: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        # 한국어는 대체로 글자당 1토큰 이하이므로 글자 수를 보수적인 상한으로 사용
+        return len(text)
+    return len(encoding.encode(text))
+
+
+def mmr_select(vectors: Optional[np.ndarray], token_counts: List[int], token_budget: int,
+               lambda_mult: float = MMR_LAMBDA, max_docs: Optional[int] = None,
+               redundancy_threshold: Optional[float] = MMR_REDUNDANCY_THRESHOLD) -> List[int]:
+    """
+    토큰 예산 안에서 MMR 순서로 문서 index를 고릅니다.
+
+    Parameters
+    ----------
+    vectors : np.ndarray, optional
+        relevance 순으로 정렬된 문서 임베딩 (None이면 순위 순서로 예산만 적용)
+    token_counts : list
+        문서별 토큰 수
+    token_budget : int
+        선택 문서 토큰 수 합계 상한 (첫 문서는 예산을 넘어도 포함)
+    lambda_mult : float
+        relevance 가중치 (1 - lambda_mult가 다양성 가중치)
+    max_docs : int, optional
+        최대 선택 문서 수
+    redundancy_threshold : float, optional
+        선택된 문서와 코사인 유사도가 이 값 이상인 문서는 제외
+
+    Returns
+    -------
+    list
+        선택 순서대로의 문서 index
+    """
+    n = len(token_counts)
+    max_docs = n if max_docs is None else min(n, max_docs)
+    if n == 0 or max_docs <= 0:
+        return []
+
+    # relevance: Re-ranking 순위를 1.0(최상위) ~ 0.0(최하위)로 선형 변환
+    relevance = 1.0 - np.arange(n, dtype=np.float32) / max(n - 1, 1)
+    costs = np.asarray(token_counts, dtype=np.int64)
+
+    if vectors is not None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+        similarity = vectors @ vectors.T
+    else:
+        similarity = np.zeros((n, n), dtype=np.float32)
+
+    selected = [0]
+    remaining = token_budget - int(costs[0])
+    available = np.ones(n, dtype=bool)
+    available[0] = False
+    max_similarity = similarity[0].copy()
+
+    while len(selected) < max_docs:
+        candidates = available & (costs <= remaining)
+        if redundancy_threshold is not None and vectors is not None:
+            candidates &= max_similarity < redundancy_threshold
+        if not candidates.any():
+            break
+
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        picked = int(np.argmax(np.where(candidates, scores, -np.inf)))
+
+        selected.append(picked)
+        available[picked] = False
+        remaining -= int(costs[picked])
+        np.maximum(max_similarity, similarity[picked], out=max_similarity)
+
+    return selected
+
+
+def select_context(vectordb, docs: list, token_budget: int = CONTEXT_TOKEN_BUDGET,
+                   count: Callable[[str], int] = count_tokens) -> list:
+    """
+    Re-ranking 결과 문서 중 생성 단계에 넣을 문서를 고릅니다. (선택 순서 = Context 순서)
+    """
+    if len(docs) <= 1:
+        return docs
+
+    token_counts = [count(doc.page_content) for doc in docs]
+    vectors = get_document_vectors(vectordb, docs)
+    if vectors is None:
+        logger.info("[Context Selection] 문서 임베딩 없음 -> 순위 순서로 토큰 예산만 적용")
+
+    selected = mmr_select(vectors, token_counts, token_budget)
+    selected_docs = [docs[i] for i in selected]
+
+    tokens_before = sum(token_counts)
+    tokens_after = sum(token_counts[i] for i in selected)
+    registry = get_metrics_registry()
+    registry.observe("rag.context.selected_docs", len(selected_docs), buckets=METRICS_COUNT_BUCKETS)
+    registry.observe("rag.context.tokens_saved", tokens_before - tokens_after, buckets=METRICS_TOKEN_BUCKETS)
+
+    logger.info(
+        f"[Context Selection] 문서 {len(docs)} -> {len(selected_docs)} | 토큰 {tokens_before} -> {tokens_after}"
+    )
+    return selected_docs
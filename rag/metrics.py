@@ -0,0 +1,247 @@
+# RAG 체인 단계별 계측 (latency / LLM 토큰 / 후보 문서 수)
+# - RequestTrace: 요청 1건의 단계별 측정값 (결과 dict의 "timings" 블록)
+# - MetricsRegistry: 프로세스 전역 히스토그램 / 카운터 (운영 부하에서 병목 단계 파악용)
+
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from app.config import METRICS_LATENCY_BUCKETS_MS, METRICS_TOKEN_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """
+    고정 구간(bucket) 히스토그램
+
+    Parameters
+    ----------
+    buckets : list
+        오름차순 구간 상한값 목록 (마지막 구간 이후는 +Inf)
+    """
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        구간 상한값 기준 근사 분위수 (관측값이 없으면 None)
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 지표 저장소 (thread-safe)
+    - 히스토그램: rag.stage.<단계>.latency_ms, rag.stage.<단계>.tokens 등
+    - 카운터: rag.route.<경로> 등
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, buckets=METRICS_LATENCY_BUCKETS_MS):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def histogram(self, name: str) -> Optional[Histogram]:
+        return self._histograms.get(name)
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "histograms": {name: h.to_dict() for name, h in self._histograms.items()},
+                "counters": dict(self._counters),
+            }
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+_registry_instance = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    프로세스 전역 지표 저장소
+    """
+    return _registry_instance
+
+
+class _StageUsageCallback(BaseCallbackHandler):
+    """
+    LLM 호출 종료 시 토큰 사용량(usage_metadata)을 RequestTrace의 단계에 누적합니다.
+    (StrOutputParser 체인처럼 응답 메시지가 사라지는 경우에도 집계 가능)
+    """
+
+    def __init__(self, trace, stage: str):
+        self.trace = trace
+        self.stage = stage
+
+    def on_llm_end(self, response, **kwargs):
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+
+        # usage_metadata가 없는 모델은 llm_output의 token_usage 사용 (OpenAI 호환)
+        if not (input_tokens or output_tokens):
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            input_tokens = token_usage.get("prompt_tokens", 0)
+            output_tokens = token_usage.get("completion_tokens", 0)
+
+        self.trace.add_tokens(self.stage, input_tokens, output_tokens)
+
+
+class RequestTrace:
+    """
+    요청 1건의 단계별 측정값
+
+    단계별 항목
+    - ms: 단계 수행 시간(wall time, 밀리초, 같은 단계가 여러 번 실행되면 합산)
+    - input_tokens / output_tokens: LLM 토큰 사용량
+    - 그 외: 후보 문서 수 등 단계별 카운트 (set_count)
+
+    Speculative 실행 시 여러 스레드에서 동시에 기록하므로 lock을 사용합니다.
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._stages = {}
+        self._lock = threading.Lock()
+        self.route = None
+        self.total_ms = None
+
+    def _stage_entry(self, stage: str) -> dict:
+        entry = self._stages.get(stage)
+        if entry is None:
+            entry = self._stages[stage] = {}
+        return entry
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        with trace.stage("retrieval"): ... 형태로 단계 수행 시간 측정
+        """
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                entry = self._stage_entry(name)
+                entry["ms"] = entry.get("ms", 0.0) + elapsed_ms
+
+    def add_tokens(self, stage: str, input_tokens: int, output_tokens: int):
+        with self._lock:
+            entry = self._stage_entry(stage)
+            entry["input_tokens"] = entry.get("input_tokens", 0) + input_tokens
+            entry["output_tokens"] = entry.get("output_tokens", 0) + output_tokens
+
+    def set_count(self, stage: str, key: str, value: int):
+        with self._lock:
+            self._stage_entry(stage)[key] = value
+
+    def llm_config(self, stage: str) -> dict:
+        """
+        LLM / 체인 호출 시 넘길 config (토큰 사용량 수집 callback 포함)
+        """
+        return {"callbacks": [_StageUsageCallback(self, stage)]}
+
+    def finish(self, route: str):
+        """
+        요청 종료: 전체 시간을 확정하고 전역 지표 저장소에 반영합니다.
+        """
+        self.total_ms = (time.perf_counter() - self._started) * 1000
+        self.route = route
+
+        registry = get_metrics_registry()
+        registry.increment(f"rag.route.{route}")
+        registry.observe("rag.request.latency_ms", self.total_ms)
+
+        with self._lock:
+            stages = {name: dict(entry) for name, entry in self._stages.items()}
+
+        for name, entry in stages.items():
+            if "ms" in entry:
+                registry.observe(f"rag.stage.{name}.latency_ms", entry["ms"])
+            if "input_tokens" in entry:
+                registry.observe(
+                    f"rag.stage.{name}.tokens",
+                    entry["input_tokens"] + entry["output_tokens"],
+                    buckets=METRICS_TOKEN_BUCKETS
+                )
+
+        logger.info(
+            f"[Metrics] route={route} total={self.total_ms:.1f}ms | "
+            + ", ".join(f"{name}={entry.get('ms', 0.0):.1f}ms" for name, entry in stages.items())
+        )
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            stages = {
+                name: {key: round(value, 2) if key == "ms" else value for key, value in entry.items()}
+                for name, entry in self._stages.items()
+            }
+        return {
+            "route": self.route,
+            "total_ms": round(self.total_ms, 2) if self.total_ms is not None else None,
+            "stages": stages,
+        }
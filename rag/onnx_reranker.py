@@ -0,0 +1,206 @@
+# ONNX Runtime Cross-Encoder 백엔드 (RERANKER_BACKEND = "onnx" | "onnx-int8")
+# - 최초 로딩 시 Hugging Face 모델을 ONNX로 변환해 RERANKER_ONNX_DIR/<모델 이름>에 저장 (이후 재사용)
+# - "onnx-int8": 변환 모델에 동적 int8 양자화(가중치 int8, 활성값은 실행 시 양자화) 적용
+# - OnnxCrossEncoder.predict는 sentence-transformers CrossEncoder.predict와 같은 입력 / 출력 형식
+#   → CrossEncoderReranker(길이 기반 배치, 점수 캐시 등)는 백엔드와 무관하게 그대로 동작
+# - 가중치는 항상 external data(<모델 파일>.data)로 저장 (bge-reranker-v2-m3는 약 2.2GB로 protobuf 2GB 제한 초과)
+
+import logging
+import os
+import re
+import shutil
+from typing import List, Optional, Tuple
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+from transformers import AutoTokenizer
+
+from app.config import RERANKER_ONNX_DIR, RERANKER_ONNX_THREADS, RERANK_MAX_LENGTH
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+
+# tokenizer 출력 중 모델 forward 인자 순서 (XLM-RoBERTa 계열은 token_type_ids 없음)
+_INPUT_NAMES = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def onnx_model_dir(model_name: str, root: str = RERANKER_ONNX_DIR) -> str:
+    """
+    모델별 저장 폴더 ("BAAI/bge-reranker-v2-m3" -> <root>/BAAI__bge-reranker-v2-m3)
+    """
+    return os.path.join(root, re.sub(r"[^\w.-]+", "__", model_name))
+
+
+def _make_tmp_dir(output_dir: str) -> str:
+    """
+    변환 / 양자화 결과를 쓸 임시 폴더 (이전 실행이 남긴 임시 파일은 삭제)
+    """
+    tmp_dir = os.path.join(output_dir, ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    return tmp_dir
+
+
+def _publish_tmp_dir(tmp_dir: str, output_dir: str, model_file: str):
+    """
+    임시 폴더의 external data(.data) 파일을 먼저 옮기고 모델 파일을 마지막에 옮김
+    (모델 파일이 보이면 가중치도 모두 준비된 상태 - 존재 여부로 재사용을 판단하므로)
+    """
+    for name in os.listdir(tmp_dir):
+        if name != model_file:
+            os.replace(os.path.join(tmp_dir, name), os.path.join(output_dir, name))
+    os.replace(os.path.join(tmp_dir, model_file), os.path.join(output_dir, model_file))
+    os.rmdir(tmp_dir)
+
+
+def export_onnx_model(model_name: str, output_dir: str) -> str:
+    """
+    Hugging Face Cross-Encoder 모델을 ONNX로 변환 (이미 있으면 재사용) 후 파일 경로 반환
+    """
+    model_path = os.path.join(output_dir, MODEL_FILE)
+    if os.path.exists(model_path):
+        return model_path
+
+    # 변환 시에만 필요한 PyTorch 모델은 지연 import
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    os.makedirs(output_dir, exist_ok=True)
+    logger.info(f"[ONNX Reranker] ONNX 변환 시작: {model_name} -> {output_dir}")
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+
+    dummy = tokenizer(["질의"], ["문서 본문"], padding=True, truncation=True, return_tensors="pt")
+    input_names = [name for name in _INPUT_NAMES if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    # 변환 도중 실패해도 불완전한 model.onnx가 남지 않도록 임시 폴더에서 만든 뒤 옮김
+    tmp_dir = _make_tmp_dir(output_dir)
+    tmp_path = os.path.join(tmp_dir, MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(dummy[name] for name in input_names),
+            tmp_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False
+        )
+    # 2GB 초과 모델은 텐서별 파일로 흩어져 저장되므로 가중치를 <모델 파일>.data 1개로 모아 다시 저장
+    exported = onnx.load(tmp_path)
+    for name in os.listdir(tmp_dir):
+        os.remove(os.path.join(tmp_dir, name))
+    onnx.save_model(
+        exported,
+        tmp_path,
+        save_as_external_data=True,
+        all_tensors_to_one_file=True,
+        location=MODEL_FILE + ".data"
+    )
+    del exported
+
+    tokenizer.save_pretrained(output_dir)
+    _publish_tmp_dir(tmp_dir, output_dir, MODEL_FILE)
+
+    logger.info(f"[ONNX Reranker] ONNX 변환 완료: {model_path}")
+    return model_path
+
+
+def quantize_onnx_model(model_path: str) -> str:
+    """
+    동적 int8 양자화 모델 생성 (이미 있으면 재사용) 후 파일 경로 반환
+    """
+    quantized_path = os.path.join(os.path.dirname(model_path), QUANTIZED_MODEL_FILE)
+    if os.path.exists(quantized_path):
+        return quantized_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_dir = os.path.dirname(model_path)
+    tmp_dir = _make_tmp_dir(output_dir)
+    quantize_dynamic(
+        model_path,
+        os.path.join(tmp_dir, QUANTIZED_MODEL_FILE),
+        weight_type=QuantType.QInt8,
+        use_external_data_format=True
+    )
+    _publish_tmp_dir(tmp_dir, output_dir, QUANTIZED_MODEL_FILE)
+
+    logger.info(f"[ONNX Reranker] int8 양자화 완료: {quantized_path}")
+    return quantized_path
+
+
+class OnnxCrossEncoder:
+    """
+    onnxruntime으로 실행하는 Cross-Encoder (CrossEncoder.predict 호환)
+
+    Parameters
+    ----------
+    model_path : str
+        ONNX 모델 파일 경로
+    tokenizer :
+        Hugging Face tokenizer
+    max_length : int, optional
+        (질의, 문서) 쌍 최대 토큰 길이 (None이면 tokenizer 기본값)
+    num_threads : int, optional
+        onnxruntime 연산 스레드 수
+    """
+
+    def __init__(self, model_path: str, tokenizer, max_length: Optional[int] = None, num_threads: Optional[int] = None):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = tokenizer
+        self.max_length = max_length or tokenizer.model_max_length
+        self._input_names = [node.name for node in self.session.get_inputs()]
+
+    def predict(self, pairs: List[Tuple[str, str]], batch_size: int = 32, show_progress_bar: bool = False, **kwargs):
+        """
+        (질의, 문서) 쌍 점수 - 출력이 1개(bge-reranker 등)면 CrossEncoder 기본값과 같이 sigmoid 적용
+        """
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+
+        logits = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            encoded = self.tokenizer(
+                [query for query, _ in batch],
+                [text for _, text in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self._input_names}
+            logits.append(self.session.run(None, feeds)[0])
+
+        logits = np.concatenate(logits).astype(np.float32)
+        if logits.shape[1] == 1:
+            return 1.0 / (1.0 + np.exp(-logits[:, 0]))
+        return logits
+
+
+def load_onnx_cross_encoder(model_name: str, quantize: bool = False, root: str = RERANKER_ONNX_DIR,
+                            max_length: Optional[int] = RERANK_MAX_LENGTH,
+                            num_threads: Optional[int] = RERANKER_ONNX_THREADS) -> OnnxCrossEncoder:
+    """
+    변환된 ONNX 모델 로딩 (없으면 변환 / 양자화 후 저장)
+    """
+    output_dir = onnx_model_dir(model_name, root)
+    model_path = export_onnx_model(model_name, output_dir)
+    if quantize:
+        model_path = quantize_onnx_model(model_path)
+
+    tokenizer = AutoTokenizer.from_pretrained(output_dir)
+    return OnnxCrossEncoder(model_path, tokenizer, max_length=max_length, num_threads=num_threads)
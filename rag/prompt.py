@@ -32,6 +32,25 @@ def build_query_refine_prompt():
     변환된 질문:
     """)
 
+def build_multi_query_refine_prompt(count: int = 3):
+    """
+    Multi-query 검색용: 사용자 질문을 서로 다른 표현의 검색어 여러 개로 변환
+    (첫 줄은 Re-ranking 기준이 되는 대표 검색어)
+    """
+    return textwrap.dedent(f"""
+    당신은 대학 행정 시스템 검색 전문가입니다.
+    사용자 질문을 매뉴얼 검색에 적합한 행정 용어 중심의 검색어 {count}개로 변환하세요.
+
+    [규칙]
+    - 한 줄에 검색어 하나씩, 번호나 설명 없이 검색어만 출력
+    - 첫 줄은 질문의 의도를 가장 정확하게 표현한 대표 검색어
+    - 나머지는 동의어, 관련 메뉴명, 업무 단계 등 다른 표현을 사용한 검색어
+
+    사용자 질문: {{question}}
+    변환된 검색어:
+    """)
+
+
 def build_system_prompt():
     """
     시스템 정체성, 권한, 한계를 정의하는 프롬프트 반환
@@ -246,4 +265,33 @@ def build_tool_aware_system_prompt():
     - "불용 처리 방법 알려줘", "반납 규정이 뭐야?", "물품 등록 절차는?" 등 **업무 절차, 방법, 규정**을 묻는 질문.
     - 위와 같은 질문에서는 제공된 참고 자료(Context)와 일반적인 업무 지식을 활용해 직접 답변하세요.
     - 다만, 위와 같은 질문에 자산의 실시간 정보 조회나 수명 예측이 **함께** 필요한 경우에는, [판단 기준 1]에 따라 해당 목적에 맞는 도구는 병행해서 사용할 수 있습니다.
-    """)
\ No newline at end of file
+    """)
+
+
+def build_planner_prompt(include_chapter: bool = False):
+    """
+    Planner 모드용 출력 형식 지침
+    도구 호출이 필요 없는 경우, 분류(NEED_RAG)와 검색어 정제를 한 번에 JSON으로 출력하도록 합니다.
+    include_chapter=True이면 검색 범위를 좁히기 위한 매뉴얼 장(chapter) 번호도 함께 출력하도록 합니다.
+    build_tool_aware_system_prompt 뒤에 결합되어 사용됩니다.
+    """
+    prompt = textwrap.dedent("""
+    [플래너 모드: 도구를 사용하지 않는 경우의 출력 형식]
+    도구를 호출하지 않는 경우, 답변을 작성하지 말고 아래 JSON 객체 하나만 출력하세요.
+    {"need_rag": true, "search_query": "변환된 검색어"}
+
+    - need_rag: 매뉴얼, 업무 절차, 규정 등 참고 자료 검색이 필요한 질문이면 true,
+      인사나 단순 대화처럼 참고 자료 없이 답할 수 있는 질문이면 false
+    - search_query: need_rag가 true인 경우, 질문을 대학 행정 용어 중심의 검색용 문장으로 변환한 값
+      (need_rag가 false이면 빈 문자열)
+    """)
+
+    if include_chapter:
+        prompt += textwrap.dedent("""\
+        - chapter: 질문이 아래 매뉴얼 장 중 하나에만 해당하면 그 장 번호(문자열), 여러 장에 걸치거나 불분명하면 생략
+          1: 물품 취득 / 2: 물품 운용 / 3: 물품 반납 / 4: 물품 불용 / 5: 물품 처분
+          6: 보유현황 조회 / 7: 사용주기 AI 예측 / 8: AI 챗봇
+          예: {"need_rag": true, "search_query": "물품 반납 승인요청 절차", "chapter": "3"}
+        """)
+
+    return prompt
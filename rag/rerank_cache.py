@@ -0,0 +1,110 @@
+# Re-ranking(Cross-Encoder) 점수 캐시
+# - key: (질의 해시[연속 공백만 축약, 대소문자 / 문장부호는 그대로], doc_id + 문서 본문 해시, 모델 버전 해시[모델 이름 + max_length + 백엔드])
+#   본문 해시를 함께 넣어 인덱스 재생성으로 같은 doc_id의 내용이 바뀌면 새 key 사용
+# - 메모리 LRU (점수 1개 = float 1개로 작으므로 영속화하지 않음)
+# - 적중 / 미적중 수는 전역 지표 rag.rerank_cache.hits / misses로 기록
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.config import RERANK_CACHE_MAX_SIZE
+from rag.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def model_version_hash(model_name: str, max_length: Optional[int], backend: str = "torch") -> str:
+    """
+    모델 버전 해시 (모델 이름 / 최대 토큰 길이 / 실행 백엔드(int8 양자화 등)가 바뀌면 점수도 바뀌므로 함께 포함)
+    """
+    return _hash(f"{model_name}\0{max_length}\0{backend}")[:16]
+
+
+class RerankScoreCache:
+    """
+    (질의, 문서, 모델) 단위 Cross-Encoder 점수 캐시
+
+    Parameters
+    ----------
+    max_size : int
+        메모리에 보관할 최대 점수 수 (초과 시 LRU 제거)
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(query: str, doc, model_hash: str) -> Optional[str]:
+        """
+        doc_id가 없는 문서는 캐시하지 않음 (None)
+        질의는 연속 공백만 축약 (Cross-Encoder는 대소문자 / 문장부호에 따라 점수가 달라질 수 있음)
+        """
+        doc_id = doc.metadata.get("doc_id")
+        if doc_id is None:
+            return None
+        query = " ".join(query.split())
+        return f"{model_hash}\0{_hash(query)}\0{doc_id}\0{_hash(doc.page_content)}"
+
+    def get_many(self, keys: List[Optional[str]]) -> List[Optional[float]]:
+        scores = []
+        with self._lock:
+            for key in keys:
+                if key is not None and key in self._entries:
+                    self._entries.move_to_end(key)
+                    scores.append(self._entries[key])
+                else:
+                    scores.append(None)
+
+            hits = sum(score is not None for score in scores)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        registry = get_metrics_registry()
+        registry.increment("rag.rerank_cache.hits", hits)
+        registry.increment("rag.rerank_cache.misses", len(keys) - hits)
+        return scores
+
+    def set_many(self, keys: List[Optional[str]], scores):
+        with self._lock:
+            for key, score in zip(keys, scores):
+                if key is None:
+                    continue
+                self._entries[key] = float(score)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def hit_rate(self) -> Optional[float]:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_rerank_cache_instance: Optional[RerankScoreCache] = None
+_instance_lock = threading.Lock()
+
+
+def get_rerank_cache() -> RerankScoreCache:
+    """
+    프로세스 전역 Re-ranking 점수 캐시 (최초 호출 시 생성)
+    """
+    global _rerank_cache_instance
+    if _rerank_cache_instance is None:
+        with _instance_lock:
+            if _rerank_cache_instance is None:
+                _rerank_cache_instance = RerankScoreCache(RERANK_CACHE_MAX_SIZE)
+    return _rerank_cache_instance
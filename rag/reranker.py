@@ -1,21 +1,50 @@
+import numpy as np
 from sentence_transformers import CrossEncoder
-from app.config import RERANK_DEBUG
+from app.config import (
+    RERANK_DEBUG,
+    RERANK_BATCH_SIZE,
+    RERANK_MAX_LENGTH,
+    RERANK_LENGTH_BUCKETING,
+    USE_RERANK_CACHE,
+    RERANKER_BACKEND
+)
+from rag.rerank_cache import get_rerank_cache, model_version_hash
 
 _reranker_instances = {}
 
-def get_reranker(model_name: str):
-    if model_name not in _reranker_instances:
+RERANKER_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def get_reranker(model_name: str, backend: str = RERANKER_BACKEND):
+    if backend not in RERANKER_BACKENDS:
+        raise ValueError(f"지원하지 않는 RERANKER_BACKEND: {backend}")
+
+    key = (model_name, backend)
+    if key not in _reranker_instances:
         try:
             if RERANK_DEBUG:
-                print(f"[RERANKER] 모델 로딩: {model_name}")
-            _reranker_instances[model_name] = CrossEncoder(model_name)
+                print(f"[RERANKER] 모델 로딩: {model_name} ({backend})")
+            if backend == "torch":
+                # max_length 초과 쌍은 tokenizer에서 잘라서 채점
+                _reranker_instances[key] = CrossEncoder(model_name, max_length=RERANK_MAX_LENGTH)
+            else:
+                # onnxruntime은 ONNX 백엔드를 쓸 때만 필요하므로 지연 import
+                from rag.onnx_reranker import load_onnx_cross_encoder
+                _reranker_instances[key] = load_onnx_cross_encoder(model_name, quantize=backend == "onnx-int8")
         except Exception as e:
             raise RuntimeError(f"CrossEncoder 모델 로딩 실패: {e}")
-    return _reranker_instances[model_name]
+    return _reranker_instances[key]
 
 class CrossEncoderReranker:
-    def __init__(self, model_name: str):
-        self.model = get_reranker(model_name)
+    def __init__(self, model_name: str, batch_size: int = RERANK_BATCH_SIZE,
+                 length_bucketing: bool = RERANK_LENGTH_BUCKETING, backend: str = RERANKER_BACKEND):
+        self.model = get_reranker(model_name, backend)
+        self.batch_size = batch_size
+        self.length_bucketing = length_bucketing
+
+        # 점수 캐시 (USE_RERANK_CACHE): 모델 / 최대 길이 / 백엔드가 같을 때만 점수 재사용
+        self.cache = get_rerank_cache() if USE_RERANK_CACHE else None
+        self.model_hash = model_version_hash(model_name, RERANK_MAX_LENGTH, backend)
 
         if RERANK_DEBUG:
             print("[RERANKER] 모델 로딩 완료")
@@ -40,13 +69,104 @@ class CrossEncoderReranker:
         """
         try:
             pairs = [(query, doc.page_content) for doc, _ in docs_with_scores]
-            scores = self.model.predict(pairs)
+            scores = self._score(pairs, [doc for doc, _ in docs_with_scores])
         except Exception as e:
             if RERANK_DEBUG:
                 print(f"[RERANKER] 예외 발생, re-ranking 생략: {e}")
             # fallback: retrieval 순서 유지
             return [doc for doc, _ in docs_with_scores[:top_n]]
 
+        return self._sort_by_scores(docs_with_scores, scores, top_n)
+
+    def rerank_batch(self, queries: list, docs_with_scores_list: list, top_n: int):
+        """
+        여러 질의의 후보 문서를 한 번의 Cross-Encoder predict 호출로 재정렬합니다.
+
+        Parameters
+        ----------
+        queries : list
+            질의 문자열 리스트
+        docs_with_scores_list : list
+            질의별 (Document, retrieval_score) 리스트의 리스트
+        top_n : int
+            질의별 반환할 상위 문서 개수
+
+        Returns
+        -------
+        list
+            질의 순서와 같은 순서의 재정렬된 Document 리스트들
+        """
+        pairs = []
+        docs = []
+        offsets = []
+        for query, docs_with_scores in zip(queries, docs_with_scores_list):
+            offsets.append(len(pairs))
+            pairs.extend((query, doc.page_content) for doc, _ in docs_with_scores)
+            docs.extend(doc for doc, _ in docs_with_scores)
+
+        try:
+            scores = self._score(pairs, docs)
+        except Exception as e:
+            if RERANK_DEBUG:
+                print(f"[RERANKER] 예외 발생, re-ranking 생략: {e}")
+            # fallback: retrieval 순서 유지
+            return [
+                [doc for doc, _ in docs_with_scores[:top_n]]
+                for docs_with_scores in docs_with_scores_list
+            ]
+
+        return [
+            self._sort_by_scores(
+                docs_with_scores,
+                scores[offset:offset + len(docs_with_scores)],
+                top_n
+            )
+            for offset, docs_with_scores in zip(offsets, docs_with_scores_list)
+        ]
+
+    def _score(self, pairs: list, docs: list):
+        """
+        캐시된 점수는 재사용하고, 캐시에 없는 쌍만 predict로 채점 (반환 점수는 pairs와 같은 순서)
+        """
+        if self.cache is None:
+            return self._predict(pairs)
+
+        keys = [self.cache.make_key(query, doc, self.model_hash) for (query, _), doc in zip(pairs, docs)]
+        cached = self.cache.get_many(keys)
+
+        scores = np.array([np.nan if score is None else score for score in cached], dtype=np.float32)
+        missing = [i for i, score in enumerate(cached) if score is None]
+        if missing:
+            predicted = self._predict([pairs[i] for i in missing])
+            scores[missing] = predicted
+            self.cache.set_many([keys[i] for i in missing], predicted)
+
+        if RERANK_DEBUG:
+            print(f"[RERANKER] 점수 캐시 적중 {len(pairs) - len(missing)}/{len(pairs)}")
+        return scores
+
+    def _predict(self, pairs: list):
+        """
+        (query, 문서) 쌍 점수 계산 - 반환 점수는 pairs와 같은 순서
+        length_bucketing 사용 시 길이순으로 정렬해 batch_size씩 채점한 뒤 원래 순서로 복원
+        """
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+
+        if not self.length_bucketing:
+            return np.asarray(self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False))
+
+        # 길이가 같으면 원래 순서 유지 (stable sort)
+        order = np.argsort([len(query) + len(text) for query, text in pairs], kind="stable")
+        sorted_scores = np.asarray(
+            self.model.predict([pairs[i] for i in order], batch_size=self.batch_size, show_progress_bar=False)
+        )
+        scores = np.empty_like(sorted_scores)
+        scores[order] = sorted_scores
+        return scores
+
+    @staticmethod
+    def _sort_by_scores(docs_with_scores: list, scores, top_n: int):
         # 디버깅: 상위 5개 score 출력
         if RERANK_DEBUG: 
             for i, score in enumerate(scores[:5]):
@@ -0,0 +1,200 @@
+# 질의 임베딩 기반 시맨틱 답변 캐시
+# - 코사인 유사도 threshold 이상인 이전 질문이 있으면 저장된 답변/attribution 재사용
+# - TTL 만료 + LRU(최대 개수) 기반 제거
+# - 벡터 DB 또는 FAQ 데이터가 바뀌면 전체 캐시 자동 무효화
+
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from rag.faq_service import FAQ_FILE_PATH
+from app.config import (
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SECONDS,
+    SEMANTIC_CACHE_MAX_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+
+def compute_knowledge_fingerprint(vectordb) -> tuple:
+    """
+    캐시 유효성 판단용 벡터 DB 지문(fingerprint)을 계산합니다.
+    저장 폴더를 훑으므로 요청마다가 아니라 벡터 DB를 불러오거나 교체할 때 1회 계산합니다.
+    (RagPipeline.knowledge_fingerprint)
+    - Chroma 컬렉션 ID (DB 재생성 시 변경)
+    - 저장 폴더의 최종 수정 시각
+    """
+    collection = getattr(vectordb, "_collection", None)
+    collection_id = str(getattr(collection, "id", "")) if collection is not None else ""
+
+    persist_dir = getattr(vectordb, "_persist_directory", None)
+    db_mtime = 0.0
+    if isinstance(persist_dir, str) and os.path.isdir(persist_dir):
+        try:
+            with os.scandir(persist_dir) as entries:
+                db_mtime = max(
+                    [os.path.getmtime(persist_dir)] + [entry.stat().st_mtime for entry in entries]
+                )
+        except OSError:
+            db_mtime = 0.0
+
+    return (collection_id, db_mtime)
+
+
+def faq_fingerprint() -> float:
+    """
+    faq_data.json 수정 시각 (FAQ는 faq_service가 요청마다 수정 시각을 확인해 다시 읽으므로 조회 시점에 확인)
+    """
+    try:
+        return FAQ_FILE_PATH.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+class SemanticAnswerCache:
+    """
+    질의 임베딩을 key로 사용하는 답변 캐시
+
+    Parameters
+    ----------
+    threshold : float
+        캐시 적중으로 판단할 최소 코사인 유사도
+    ttl_seconds : float
+        항목 유효 시간(초)
+    max_size : int
+        최대 저장 개수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+    """
+
+    def __init__(self, threshold: float, ttl_seconds: float, max_size: int):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+
+        # slot 번호 -> (result, 저장 시각), 순서가 곧 LRU 순서
+        self._entries = OrderedDict()
+        # slot 번호별 정규화된 질의 벡터 (첫 저장 시 차원에 맞춰 할당)
+        self._vectors: Optional[np.ndarray] = None
+        self._free_slots = list(range(max_size - 1, -1, -1))
+
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _check_fingerprint(self, fingerprint):
+        # 지식 베이스가 바뀌었으면 기존 답변은 모두 폐기
+        if fingerprint != self._fingerprint:
+            if self._entries:
+                logger.info(f"[Semantic Cache] 지식 베이스 변경 감지 -> 캐시 {len(self._entries)}건 무효화")
+            self._clear()
+            self._fingerprint = fingerprint
+
+    def _clear(self):
+        self._entries.clear()
+        self._free_slots = list(range(self.max_size - 1, -1, -1))
+
+    def _remove(self, slot: int):
+        del self._entries[slot]
+        self._free_slots.append(slot)
+
+    def _purge_expired(self, now: float):
+        expired = [
+            slot for slot, (_, stored_at) in self._entries.items()
+            if now - stored_at > self.ttl_seconds
+        ]
+        for slot in expired:
+            self._remove(slot)
+
+    def lookup(self, query_vector, fingerprint) -> Optional[dict]:
+        """
+        유사한 질문의 저장 답변을 반환합니다. 없으면 None.
+        """
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+            self._purge_expired(time.monotonic())
+
+            if not self._entries or self._vectors is None:
+                self.misses += 1
+                return None
+
+            query = self._normalize(query_vector)
+            if query.shape[0] != self._vectors.shape[1]:
+                self.misses += 1
+                return None
+
+            slots = np.fromiter(self._entries.keys(), dtype=np.int64, count=len(self._entries))
+            similarities = self._vectors[slots] @ query
+            best = int(np.argmax(similarities))
+
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            slot = int(slots[best])
+            self._entries.move_to_end(slot)
+            self.hits += 1
+            logger.info(f"[Semantic Cache] 적중 (similarity={similarities[best]:.4f})")
+
+            # 호출자가 결과를 수정해도 캐시 원본이 바뀌지 않도록 복사본 반환
+            return copy.deepcopy(self._entries[slot][0])
+
+    def store(self, query_vector, result: dict, fingerprint):
+        """
+        답변을 저장합니다. 최대 개수를 넘으면 LRU 항목을 제거합니다.
+        """
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+
+            vector = self._normalize(query_vector)
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                self._vectors = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+                self._clear()
+
+            if not self._free_slots:
+                oldest_slot = next(iter(self._entries))
+                self._remove(oldest_slot)
+
+            slot = self._free_slots.pop()
+            self._vectors[slot] = vector
+            self._entries[slot] = (copy.deepcopy(result), time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+
+_semantic_cache_instance: Optional[SemanticAnswerCache] = None
+_instance_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticAnswerCache:
+    """
+    프로세스 전역 시맨틱 캐시 (최초 호출 시 생성)
+    """
+    global _semantic_cache_instance
+    if _semantic_cache_instance is None:
+        with _instance_lock:
+            if _semantic_cache_instance is None:
+                _semantic_cache_instance = SemanticAnswerCache(
+                    threshold=SEMANTIC_CACHE_THRESHOLD,
+                    ttl_seconds=SEMANTIC_CACHE_TTL_SECONDS,
+                    max_size=SEMANTIC_CACHE_MAX_SIZE
+                )
+    return _semantic_cache_instance
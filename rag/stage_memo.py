@@ -0,0 +1,147 @@
+# 결정적(deterministic) LLM 단계 결과 메모이제이션
+# - 대상: 질문 분류(Classifier), 검색어 정제(Refiner)
+# - key: (단계 이름, LLM 설정(모델 이름, temperature), 프롬프트 템플릿 해시, 정규화된 질문)
+# - 메모리 LRU + 선택적 SQLite 영속화 (재시작 후에도 재사용)
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from app.config import LLM_MODEL_NAME, LLM_TEMPERATURE, STAGE_MEMO_MAX_SIZE, STAGE_MEMO_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(text: str) -> str:
+    """
+    질문 정규화: 유니코드 정규화(NFKC), 소문자 변환, 연속 공백 축약,
+    끝부분의 물음표/마침표 등 제거
+    예: "  불용 처리 방법?? " -> "불용 처리 방법"
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"\s+", " ", text).strip()
+    return re.sub(r"[\s?!.~…]+$", "", text)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def llm_config_key(llm=None) -> str:
+    """
+    메모 key에 넣을 LLM 설정 문자열 (모델 이름, temperature)
+    LLM 객체에서 값을 읽지 못하면 설정값(LLM_MODEL_NAME, LLM_TEMPERATURE)을 사용합니다.
+    """
+    model_name = getattr(llm, "model_name", None)
+    temperature = getattr(llm, "temperature", None)
+    if not isinstance(model_name, str):
+        model_name = LLM_MODEL_NAME
+    if not isinstance(temperature, (int, float)):
+        temperature = LLM_TEMPERATURE
+    return f"{model_name}\0{temperature}"
+
+
+class StageMemo:
+    """
+    단계별 LLM 출력 캐시
+
+    Parameters
+    ----------
+    max_size : int
+        메모리에 보관할 최대 항목 수 (초과 시 LRU 제거)
+    db_path : str, optional
+        SQLite 파일 경로. None이면 메모리에만 보관합니다.
+    """
+
+    def __init__(self, max_size: int, db_path: Optional[str] = None):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS stage_memo ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[Stage Memo] SQLite 초기화 실패 -> 메모리 캐시만 사용: {e}")
+                self._conn = None
+
+    @staticmethod
+    def make_key(stage: str, llm_config: str, template: str, question: str) -> str:
+        return _hash(f"{stage}\0{llm_config}\0{_hash(template)}\0{normalize_question(question)}")
+
+    def _remember(self, key: str, value: str):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, stage: str, llm_config: str, template: str, question: str) -> Optional[str]:
+        key = self.make_key(stage, llm_config, template, question)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            if self._conn is None:
+                return None
+
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM stage_memo WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"[Stage Memo] SQLite 조회 실패: {e}")
+                return None
+
+            if row is None:
+                return None
+
+            self._remember(key, row[0])
+            return row[0]
+
+    def set(self, stage: str, llm_config: str, template: str, question: str, value: str):
+        key = self.make_key(stage, llm_config, template, question)
+        with self._lock:
+            self._remember(key, value)
+
+            if self._conn is None:
+                return
+
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO stage_memo (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, time.time())
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[Stage Memo] SQLite 저장 실패: {e}")
+
+
+_stage_memo_instance: Optional[StageMemo] = None
+_instance_lock = threading.Lock()
+
+
+def get_stage_memo() -> StageMemo:
+    """
+    프로세스 전역 단계 메모 (최초 호출 시 생성)
+    """
+    global _stage_memo_instance
+    if _stage_memo_instance is None:
+        with _instance_lock:
+            if _stage_memo_instance is None:
+                _stage_memo_instance = StageMemo(STAGE_MEMO_MAX_SIZE, STAGE_MEMO_DB_PATH)
+    return _stage_memo_instance
@@ -0,0 +1,133 @@
+# scripts_/benchmark_reranker.py
+# Cross-Encoder Re-ranking CPU 처리량 측정 (후보 문서 수별)
+# - 비교 설정: 기본 predict(배치 32, 길이 정렬 없음) / 설정값(RERANK_BATCH_SIZE, RERANK_MAX_LENGTH, 길이 기반 배치)
+# - 후보 문서는 QA 데이터셋(manual_qa_final.json)을 create_vector_db와 같은 형식으로 구성
+#
+# 사용법: python scripts_/benchmark_reranker.py [--counts 5 10 15 30 60] [--repeat 3] [--model 모델 이름 또는 로컬 경로]
+#         [--batch-sizes 8 16 32]  (설정값 조합의 batch_size를 바꿔 가며 비교, 기본: RERANK_BATCH_SIZE)
+#
+# 측정 결과 (1코어 CPU / 5GB RAM, torch 2.14, sentence-transformers 6.1, --repeat 1)
+# - 이 환경에서는 Hugging Face 접속이 안 되어 BAAI/bge-reranker-v2-m3 가중치 대신 같은 구조
+#   (XLM-RoBERTa large, 24층, hidden 1024, num_labels=1)의 무작위 가중치 모델 + 문자 단위 토크나이저로 측정
+#   → 연산량 / 패딩 효과는 같고, 토큰 수는 원 모델(sentencepiece)보다 많아 절대 시간은 보수적(느리게) 나옴
+# - baseline의 max_length는 모델 고유 최대 길이(tokenizer.model_max_length, 8192) - 잘림 없음
+# - ms/질의 (후보 수별)
+#     설정                           5        10        15        30        60
+#     baseline   (32, -, False)   10840     25616     43638     68368    125684
+#     configured (16, 512, True)   8929     16372     31210     46629     88654
+#   → 모든 후보 수에서 약 18~36% 단축 (512 토큰을 넘는 쌍의 잘림 + 길이 기반 배치의 padding 절감)
+# - batch_size 비교 (후보 30개, 길이 기반 배치 + max_length 512): 8 → 40570, 16 → 48794, 32 → 64670 ms/질의
+#   (같은 조건 baseline 57071) - batch 32는 후보 30개가 한 배치라 길이 정렬 효과가 없음
+#   이전 측정(8 → 47115, 16 → 51774)에 이어 두 번 모두 8이 가장 빨라 기본값을 8로 변경 (RERANK_BATCH_SIZE = 8)
+#   반복 측정 간 편차는 약 15~20% (baseline 후보 30개: 68368 / 57071)
+# - RERANK_MAX_LENGTH = 512: QA 문서는 105~525자(중앙값 257자)라 대부분 잘리지 않음
+#   모델 최대 길이(8192)까지 패딩되는 긴 문서가 들어와도 쌍당 비용이 커지지 않도록 하는 상한
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+# 프로젝트 루트 경로 추가 (app / rag 모듈 사용)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+sys.path.append(root_dir)
+
+from langchain_core.documents import Document
+
+from app.config import RERANKER_MODEL_NAME, RERANK_BATCH_SIZE, RERANK_MAX_LENGTH
+from rag.reranker import CrossEncoderReranker
+
+# ==========================================
+# [화면 출력 인코딩 설정]
+sys.stdout = io.TextIOWrapper(sys.stdout.detach(), encoding='utf-8')
+sys.stderr = io.TextIOWrapper(sys.stderr.detach(), encoding='utf-8')
+# ==========================================
+
+TARGET_FILE = os.path.join(root_dir, 'dataset/qa_output/manual_qa_final.json')
+
+# 측정 질의 (refined query 형태)
+QUERIES = ["물품 불용 처리 절차", "반납 신청 승인 방법", "운용대장 물품 조회", "물품 취득 등록 방법"]
+
+
+def load_candidates():
+    with open(TARGET_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    documents = []
+    for idx, item in enumerate(data):
+        q, a = item.get('question', ''), item.get('answer', '')
+        if q and a:
+            content = (
+                f"문서 주제: {item.get('category', '일반')}\n"
+                f"관련 메뉴: {item.get('title', '')}\n"
+                f"사용자 질문: {q}\n"
+                f"상세 답변: {a}"
+            )
+            documents.append(Document(page_content=content, metadata={"doc_id": f"qa_{idx}"}))
+    return documents
+
+
+def measure(reranker, documents, count: int, repeat: int) -> float:
+    """
+    질의별 후보 count개를 채점하는 데 걸린 평균 시간(초) - 질의 1건 기준
+    """
+    candidates = [(documents[i % len(documents)], 0.0) for i in range(count)]
+
+    # 예열 (첫 호출의 지연 초기화 비용 제외)
+    reranker.rerank(QUERIES[0], candidates, top_n=count)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            reranker.rerank(query, candidates, top_n=count)
+    return (time.perf_counter() - started) / (repeat * len(QUERIES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-Encoder Re-ranking CPU 처리량 측정")
+    parser.add_argument("--counts", type=int, nargs="+", default=[5, 10, 15, 30, 60], help="질의당 후보 문서 수")
+    parser.add_argument("--repeat", type=int, default=3, help="질의 묶음 반복 횟수")
+    parser.add_argument("--model", default=RERANKER_MODEL_NAME, help="Cross-Encoder 모델 이름 또는 로컬 경로")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[RERANK_BATCH_SIZE], help="설정값 조합에서 비교할 batch_size")
+    args = parser.parse_args()
+
+    if not os.path.exists(TARGET_FILE):
+        print(f"오류: 파일이 없습니다 -> {TARGET_FILE}")
+        sys.exit(1)
+
+    documents = load_candidates()
+    print(f"모델: {args.model} | 후보 문서 풀: {len(documents)}개 | 질의 {len(QUERIES)}개 x {args.repeat}회")
+
+    reranker = CrossEncoderReranker(args.model)
+    # sentence-transformers 버전에 따라 최대 길이 속성 이름이 다름 (max_seq_length / max_length)
+    length_attr = "max_seq_length" if hasattr(reranker.model, "max_seq_length") else "max_length"
+    # baseline은 모델 고유 최대 길이로 측정 (reranker는 RERANK_MAX_LENGTH로 만들어져 속성값이 이미 잘려 있음)
+    model_max_length = reranker.model.tokenizer.model_max_length
+
+    # (설정 이름, batch_size, max_length, 길이 기반 배치)
+    settings = [("baseline", 32, None, False)] + [
+        ("configured", batch_size, RERANK_MAX_LENGTH, True) for batch_size in args.batch_sizes
+    ]
+
+    print("-" * 72)
+    print(f"{'설정':<12}{'batch':>7}{'max_len':>9}{'bucket':>8}{'후보 수':>8}{'ms/질의':>12}{'쌍/초':>12}")
+    print("-" * 72)
+    for name, batch_size, max_length, bucketing in settings:
+        reranker.batch_size = batch_size
+        reranker.length_bucketing = bucketing
+        setattr(reranker.model, length_attr, max_length or model_max_length)
+
+        for count in args.counts:
+            seconds = measure(reranker, documents, count, args.repeat)
+            print(
+                f"{name:<12}{batch_size:>7}{str(max_length or '-'):>9}{str(bucketing):>8}"
+                f"{count:>8}{seconds * 1000:>12.1f}{count / seconds:>12.1f}"
+            )
+    print("-" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,19 @@ from dotenv import load_dotenv
 # 1. 환경 변수 로드
 load_dotenv()
 
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 
+# 프로젝트 루트 경로 추가 (app / vectorstore 모듈 사용)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import VECTOR_BACKEND, LEXICAL_INDEX_PATH, NUMPY_QUANTIZATION, VECTOR_SNAPSHOT_KEEP, USE_DEDUP
+from vectorstore.store_factory import create_vector_store, get_vector_store_path
+from vectorstore.lexical_index import BM25Index
+from vectorstore.metadata_filter import chapter_major
+from vectorstore.snapshots import current_snapshot_version, new_snapshot_dir, publish_snapshot, prune_snapshots
+from ingestion.embedder import get_embedding_model
+from ingestion.dedup import collapse_near_duplicates
+
 # ==========================================
 # [화면 출력 인코딩 설정]
 sys.stdout = io.TextIOWrapper(sys.stdout.detach(), encoding='utf-8')
@@ -33,18 +42,13 @@ def main():
     # [중요] 타겟 파일 경로 (generate_qa.py의 결과물)
     TARGET_FILE = os.path.join(root_dir, 'dataset/qa_output/manual_qa_final.json')
     
-    # DB 저장 경로
-    DB_PATH = os.path.join(root_dir, 'chroma_db')
+    # 인덱스 경로 (백엔드별) - 실제 인덱스는 <경로>/versions/<버전>에 생성
+    INDEX_ROOT = os.path.join(root_dir, get_vector_store_path())
 
     print("벡터 DB 생성 작업을 시작합니다...")
 
-    # 1. 기존 DB 삭제 (초기화)
-    if os.path.exists(DB_PATH):
-        print(f"기존 DB 폴더('{DB_PATH}')를 초기화합니다...")
-        try:
-            shutil.rmtree(DB_PATH)
-        except Exception as e:
-            print(f"경고: 기존 DB 삭제 중 오류 발생 (무시하고 진행합니다): {e}")
+    # 1. 기존 DB는 삭제하지 않음
+    # 새 버전 폴더에 생성한 뒤 CURRENT만 교체하므로, 실행 중인 챗봇은 생성 도중에도 이전 버전을 계속 사용
 
     # 2. 데이터 로드
     if not os.path.exists(TARGET_FILE):
@@ -93,6 +97,8 @@ def main():
                     "source": item.get("source", "Unknown"),
                     "title": item.get("title", ""),
                     "chapter": item.get("chapter", ""),
+                    # 장 대분류 번호 ("4.3.1" -> "4") - 메타데이터 필터 검색(USE_METADATA_FILTER)용
+                    "chapter_major": chapter_major(item.get("chapter", "")),
                     "category": item.get("category", "General"),
                     # [핵심] 이제 idx가 존재하므로 여기서 에러가 나지 않습니다.
                     # doc_id가 없으면 '파일명_번호' 형식으로 생성
@@ -111,27 +117,56 @@ def main():
 
     print(f"총 {len(documents)}개의 지식(QA)을 준비했습니다.")
 
+    # 근중복 QA 병합 (같은 매뉴얼 문단을 반복 서술한 QA는 대표 문서 1개만 색인)
+    if USE_DEDUP:
+        documents, removed = collapse_near_duplicates(documents)
+        print(f"근중복 병합: {removed}개 문서를 대표 문서로 병합했습니다. (색인 대상 {len(documents)}개)")
+        # 색인에서 빠진 문서 확인용 (대표 doc_id <- 병합된 doc_id)
+        for doc in documents:
+            if doc.metadata.get("merged_doc_ids"):
+                print(f"  {doc.metadata['doc_id']} <- {doc.metadata['merged_doc_ids']}")
+
     # 4. 임베딩 및 DB 저장
     print("Embedding 모델을 준비 중입니다...")
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+    # USE_EMBEDDING_CACHE 활성화 시 변경되지 않은 문서는 임베딩 API를 다시 호출하지 않음
+    embeddings = get_embedding_model()
+
+    # 새 스냅샷 폴더 (생성 완료 전까지는 서비스에서 읽지 않음)
+    snapshot_dir = new_snapshot_dir(INDEX_ROOT)
 
     # 임베딩 진행 상황 구체적 명시
-    print(f"Chroma DB 저장 시작... (총 {len(documents)}개 벡터 변환, 저장 위치: {DB_PATH})")
+    print(f"{VECTOR_BACKEND} 인덱스 저장 시작... (총 {len(documents)}개 벡터 변환, 저장 위치: {snapshot_dir})")
     print("(데이터 양에 따라 시간이 조금 걸릴 수 있습니다...)")
-    
+    if VECTOR_BACKEND == "numpy" and NUMPY_QUANTIZATION:
+        print(f"양자화 형식: {NUMPY_QUANTIZATION} (근사 검색 후 float32로 상위 후보 재계산)")
+
     try:
-        Chroma.from_documents(
-            documents=documents,
-            embedding=embeddings,
-            persist_directory=DB_PATH
-        )
-    except Exception as e:
+        # BM25 lexical 색인 생성 (Hybrid 검색용, 임베딩 API 호출 없음)
+        # 벡터 인덱스와 같은 스냅샷 폴더에 저장 → CURRENT 교체 시 함께 공개, 실패한 재생성은 서비스에 노출되지 않음
+        lexical_path = os.path.join(snapshot_dir, LEXICAL_INDEX_PATH)
+        lexical_index = BM25Index.build(documents)
+        lexical_index.save(lexical_path)
+        print(f"BM25 색인 저장 완료: term {len(lexical_index.postings)}개 (저장 위치: {lexical_path})")
+
+        # 백엔드별 인덱스 저장 (Chroma: 컬렉션, NumPy / FAISS: 인덱스 파일 + 메타데이터(.json))
+        create_vector_store(documents, embeddings, snapshot_dir, VECTOR_BACKEND)
+
+        # 2. 현재 버전 교체 (원자적)
+        publish_snapshot(INDEX_ROOT, snapshot_dir)
+    except (Exception, KeyboardInterrupt) as e:
         print(f"[Fatal Error] 임베딩 및 DB 저장 중 실패: {e}")
+        # 공개되지 않은 폴더는 삭제 (CURRENT가 이미 가리키면 서비스 중인 버전이므로 유지)
+        if current_snapshot_version(INDEX_ROOT) != os.path.basename(snapshot_dir):
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+            print(f"   기존 인덱스는 그대로 사용됩니다. (실패한 폴더 삭제: {snapshot_dir})")
         sys.exit(1)
 
+    # 오래된 스냅샷 정리
+    prune_snapshots(INDEX_ROOT, VECTOR_SNAPSHOT_KEEP)
+
     print("-" * 30)
     print("DB 생성 완료!")
-    print(f"이제 '{DB_PATH}' 폴더에 AI의 지식이 저장되었습니다.")
+    print(f"이제 '{snapshot_dir}' 폴더에 AI의 지식이 저장되었습니다. (현재 버전: {os.path.basename(snapshot_dir)})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
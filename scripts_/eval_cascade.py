@@ -0,0 +1,173 @@
+# scripts_/eval_cascade.py
+# Cascade Re-ranking 품질 / 비용 평가 (QA 정답셋 기준)
+# - 정답셋: manual_qa_final.json의 각 질문 → 정답 문서는 그 질문으로 만든 QA 문서(doc_id, 근중복 병합 시 merged_doc_ids 포함)
+# - 질문별로 현재 인덱스에서 검색 후 전체 Re-ranking / Cascade Re-ranking 결과를 비교
+#   (LLM 호출 비용을 피하기 위해 검색어 정제 없이 원본 질문으로 검색)
+# - 지표: Hit@1, Hit@3, MRR(@RERANK_TOP_N), 질의당 Cross-Encoder 채점 쌍 수 / CPU 시간, Cross-Encoder 생략 비율
+#
+# 사용법: python scripts_/eval_cascade.py [--scorer retrieval|lexical] [--prefilter-k 5] [--margin 0.15] [--limit N]
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# 1. 환경 변수 로드
+load_dotenv()
+
+# 프로젝트 루트 경로 추가 (app / rag / vectorstore 모듈 사용)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+sys.path.append(root_dir)
+
+from app.config import (
+    RERANKER_MODEL_NAME,
+    RERANK_CANDIDATE_K,
+    RERANK_TOP_N,
+    RETRIEVER_TOP_K,
+    SIMILARITY_SCORE_THRESHOLD,
+    CASCADE_SCORER,
+    CASCADE_PREFILTER_K,
+    CASCADE_SKIP_MARGIN
+)
+from rag import cascade
+from rag.reranker import CrossEncoderReranker
+from vectorstore.retriever import retrieve_docs
+from vectorstore.store_factory import load_vector_store
+from ingestion.embedder import get_embedding_model
+
+# ==========================================
+# [화면 출력 인코딩 설정]
+sys.stdout = io.TextIOWrapper(sys.stdout.detach(), encoding='utf-8')
+sys.stderr = io.TextIOWrapper(sys.stderr.detach(), encoding='utf-8')
+# ==========================================
+
+TARGET_FILE = os.path.join(root_dir, 'dataset/qa_output/manual_qa_final.json')
+
+
+def load_gold_set(limit: int = None):
+    """
+    (질문, 정답 doc_id) 목록 - doc_id 규칙은 create_vector_db와 동일
+    """
+    with open(TARGET_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    gold = []
+    for idx, item in enumerate(data):
+        if item.get('question') and item.get('answer'):
+            gold.append((item['question'], item.get('doc_id', f"{item.get('source', 'doc')}_{idx}")))
+    return gold[:limit] if limit else gold
+
+
+def _doc_ids(doc):
+    # 근중복 병합된 대표 문서는 병합된 doc_id도 정답으로 인정
+    merged = doc.metadata.get("merged_doc_ids")
+    return {doc.metadata.get("doc_id"), *(merged.split(",") if merged else [])}
+
+
+def rank_of(docs, gold_id):
+    for rank, doc in enumerate(docs, start=1):
+        if gold_id in _doc_ids(doc):
+            return rank
+    return None
+
+
+class _Counter:
+    """Cross-Encoder 채점 쌍 수 / CPU 시간 누적"""
+
+    def __init__(self):
+        self.pairs = 0
+        self.cpu_seconds = 0.0
+        self.skipped = 0
+        self.ranks = []
+
+    def summary(self, name: str, total: int) -> str:
+        hit1 = sum(1 for rank in self.ranks if rank == 1) / total
+        hit3 = sum(1 for rank in self.ranks if rank and rank <= 3) / total
+        mrr = sum(1.0 / rank for rank in self.ranks if rank) / total
+        return (
+            f"{name:<10}{hit1:>8.3f}{hit3:>8.3f}{mrr:>8.3f}"
+            f"{self.pairs / total:>10.1f}{self.cpu_seconds * 1000 / total:>12.1f}{self.skipped / total:>10.1%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade Re-ranking 품질 / 비용 평가")
+    parser.add_argument("--scorer", default=CASCADE_SCORER, choices=["retrieval", "lexical"])
+    parser.add_argument("--prefilter-k", type=int, default=CASCADE_PREFILTER_K)
+    parser.add_argument("--margin", type=float, default=CASCADE_SKIP_MARGIN, help="음수면 생략 없이 항상 채점")
+    parser.add_argument("--limit", type=int, default=None, help="평가할 질문 수 (기본: 전체)")
+    args = parser.parse_args()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("오류: .env 파일이 없거나 OPENAI_API_KEY가 설정되지 않았습니다.")
+        sys.exit(1)
+    if not os.path.exists(TARGET_FILE):
+        print(f"오류: 파일이 없습니다 -> {TARGET_FILE}")
+        sys.exit(1)
+
+    # 평가 설정을 cascade 모듈에 반영
+    cascade.CASCADE_SCORER = args.scorer
+    cascade.CASCADE_PREFILTER_K = args.prefilter_k
+    cascade.CASCADE_SKIP_MARGIN = None if args.margin is None or args.margin < 0 else args.margin
+
+    gold = load_gold_set(args.limit)
+    vectordb = load_vector_store(get_embedding_model())
+    reranker = CrossEncoderReranker(RERANKER_MODEL_NAME)
+    # 같은 질문을 두 번 채점하므로 점수 캐시는 끔 (비용 비교 왜곡 방지)
+    reranker.cache = None
+
+    # Cross-Encoder 채점 쌍 수 측정용 래핑
+    predict = reranker._predict
+    scored = {"pairs": 0}
+
+    def _counting_predict(pairs):
+        scored["pairs"] += len(pairs)
+        return predict(pairs)
+
+    reranker._predict = _counting_predict
+
+    print(f"정답셋 {len(gold)}문항 | 후보 {RERANK_CANDIDATE_K} | scorer={args.scorer} "
+          f"prefilter_k={args.prefilter_k} margin={cascade.CASCADE_SKIP_MARGIN} (적용 margin: {cascade._skip_margin()})")
+
+    full, cascaded, retrieval_only = _Counter(), _Counter(), _Counter()
+    for i, (question, gold_id) in enumerate(gold, start=1):
+        retrieved = retrieve_docs(vectordb, question, RETRIEVER_TOP_K)
+        candidates = sorted(
+            [(doc, score) for doc, score in retrieved if score <= SIMILARITY_SCORE_THRESHOLD],
+            key=lambda x: x[1]
+        )[:RERANK_CANDIDATE_K]
+
+        retrieval_only.ranks.append(rank_of([doc for doc, _ in candidates][:RERANK_TOP_N], gold_id))
+        retrieval_only.skipped += 1
+
+        for counter, rerank in (
+            (full, lambda: reranker.rerank(question, candidates, RERANK_TOP_N)),
+            (cascaded, lambda: cascade.cascade_rerank(reranker, question, candidates, RERANK_TOP_N)),
+        ):
+            scored["pairs"] = 0
+            started = time.process_time()
+            top_docs = rerank()
+            counter.cpu_seconds += time.process_time() - started
+            counter.pairs += scored["pairs"]
+            counter.skipped += scored["pairs"] == 0
+            counter.ranks.append(rank_of(top_docs, gold_id))
+
+        if i % 10 == 0:
+            print(f"  {i}/{len(gold)} 완료")
+
+    print("-" * 66)
+    print(f"{'방식':<10}{'Hit@1':>8}{'Hit@3':>8}{'MRR':>8}{'쌍/질의':>10}{'CPU ms/질의':>12}{'CE 생략':>10}")
+    print("-" * 66)
+    print(retrieval_only.summary("retrieval", len(gold)))
+    print(full.summary("full", len(gold)))
+    print(cascaded.summary("cascade", len(gold)))
+    print("-" * 66)
+
+
+if __name__ == "__main__":
+    main()
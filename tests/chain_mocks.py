@@ -0,0 +1,14 @@
+# RAG 체인 테스트용 Mock 헬퍼 (여러 테스트 파일에서 공용)
+
+from unittest.mock import AsyncMock, MagicMock
+
+
+def mock_template_chain(invoke_value):
+    """PromptTemplate.from_template(...) | llm | parser 결과 체인 Mock 생성"""
+    chain = MagicMock(name="chain")
+    chain.invoke.return_value = invoke_value
+    chain.ainvoke = AsyncMock(return_value=invoke_value)
+    # (template | llm) | parser -> chain
+    template = MagicMock(name="template")
+    template.__or__.return_value = MagicMock(__or__=MagicMock(return_value=chain))
+    return template, chain
@@ -0,0 +1,58 @@
+from typing import NamedTuple
+from unittest.mock import MagicMock
+
+import pytest
+
+# --------------------------------------------------------------------------
+# 공용 Fixtures (환경 설정, RAG 체인 의존성 Mock)
+# --------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _set_test_env(monkeypatch):
+    """테스트 환경변수 강제 주입"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("BACKEND_API_URL", "http://test-backend")
+    monkeypatch.setenv("FRONTEND_BASE_URL", "http://test-frontend")
+
+class MockContext(NamedTuple):
+    base_llm: MagicMock      # Generator
+    bound_llm: MagicMock     # Router
+    vectordb: MagicMock
+    retriever: MagicMock
+
+@pytest.fixture(scope="function")
+def mock_dependencies():
+    """RAG 체인 의존성 Mocking 및 정리(Teardown)"""
+    # 1. Mock 객체 생성
+    mock_base_llm = MagicMock(name="BaseLLM")
+    mock_bound_llm = MagicMock(name="BoundLLM")
+    mock_vectordb = MagicMock(name="VectorDB")
+    mock_retriever = MagicMock(name="Retriever")
+
+    # 2. LLM 바인딩 설정
+    mock_base_llm.bind_tools.return_value = mock_bound_llm
+    
+    # 체이닝 메서드 방어
+    mock_base_llm.with_config.return_value = mock_base_llm
+    mock_base_llm.with_fallbacks.return_value = mock_base_llm
+    mock_bound_llm.with_config.return_value = mock_bound_llm
+    mock_bound_llm.with_retry.return_value = mock_bound_llm
+
+    # 3. VectorDB -> Retriever 연결
+    mock_vectordb.as_retriever.return_value = mock_retriever
+    mock_retriever.invoke.return_value = [] # 기본: 검색 결과 없음
+
+    context = MockContext(
+        base_llm=mock_base_llm,
+        bound_llm=mock_bound_llm,
+        vectordb=mock_vectordb,
+        retriever=mock_retriever
+    )
+
+    yield context
+
+    # Clean-up
+    mock_base_llm.reset_mock()
+    mock_bound_llm.reset_mock()
+    mock_vectordb.reset_mock()
+    mock_retriever.reset_mock()
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+import pytest
+
+from rag.adaptive_depth import decide_depth
+from rag.metrics import get_metrics_registry
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    get_metrics_registry().reset()
+    yield
+    get_metrics_registry().reset()
+
+
+def test_disabled_keeps_configured_depth():
+    scores = [0.1 * i for i in range(20)]
+
+    assert decide_depth(scores, max_candidates=15, max_context=10) == (15, 10)
+    assert decide_depth(scores[:4], max_candidates=15, max_context=10) == (4, 10)
+
+
+@patch("rag.adaptive_depth.USE_ADAPTIVE_DEPTH", True)
+@patch("rag.adaptive_depth.ADAPTIVE_SCORE_MARGIN", None)
+def test_cuts_at_largest_gap():
+    """최상위 4개가 뚜렷이 가까우면 그 뒤 후보는 Re-ranking하지 않음"""
+    scores = [0.50, 0.52, 0.55, 0.57, 0.90, 0.92, 0.95, 0.97, 1.00]
+
+    assert decide_depth(scores, max_candidates=15, max_context=10) == (4, 4)
+    registry = get_metrics_registry()
+    assert registry.counter("rag.adaptive_depth.reason.gap") == 1
+    assert registry.histogram("rag.adaptive_depth.candidates").count == 1
+
+
+@patch("rag.adaptive_depth.USE_ADAPTIVE_DEPTH", True)
+@patch("rag.adaptive_depth.ADAPTIVE_SCORE_MARGIN", 0.3)
+def test_margin_limits_candidates_but_keeps_minimum():
+    scores = [0.20, 0.60, 0.61, 0.62, 0.63]
+
+    # margin(0.2 + 0.3) 안에는 1개뿐이지만 최소 후보 수(3)는 유지
+    assert decide_depth(scores, max_candidates=15, max_context=10) == (3, 3)
+
+
+@patch("rag.adaptive_depth.USE_ADAPTIVE_DEPTH", True)
+@patch("rag.adaptive_depth.ADAPTIVE_SCORE_MARGIN", None)
+def test_flat_distribution_uses_upper_bound():
+    scores = [0.50 + 0.01 * i for i in range(20)]
+
+    assert decide_depth(scores, max_candidates=15, max_context=10) == (15, 10)
+    assert get_metrics_registry().counter("rag.adaptive_depth.reason.flat") == 1
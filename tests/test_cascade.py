@@ -0,0 +1,124 @@
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from rag.cascade import cascade_prefilter, cascade_rerank, cascade_rerank_batch, cheap_scores
+from rag.metrics import get_metrics_registry
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    get_metrics_registry().reset()
+    yield
+    get_metrics_registry().reset()
+
+
+def _candidates(scores, contents=None):
+    contents = contents or [f"문서 {i}" for i in range(len(scores))]
+    return [
+        (Document(page_content=content, metadata={"doc_id": f"d{i}"}), score)
+        for i, (content, score) in enumerate(zip(contents, scores))
+    ]
+
+
+def _ids(docs):
+    return [doc.metadata["doc_id"] for doc in docs]
+
+
+def test_lexical_scores_query_token_coverage():
+    candidates = _candidates([0.5, 0.5], ["불용 처리 절차 안내", "반납 신청 방법"])
+
+    scores = cheap_scores("불용 처리", candidates, scorer="lexical")
+
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[1] == pytest.approx(0.0)
+    with pytest.raises(ValueError):
+        cheap_scores("불용", candidates, scorer="unknown")
+
+
+def test_prefilter_keeps_top_k_and_detects_clear_winner():
+    candidates = _candidates([0.30, 0.10, 0.32, 0.50])
+
+    head, tail, decided = cascade_prefilter("q", candidates, scorer="retrieval", prefilter_k=2, margin=0.15)
+    assert _ids(doc for doc, _ in head) == ["d1", "d0"]
+    assert _ids(doc for doc, _ in tail) == ["d2", "d3"]
+    assert decided
+
+    _, _, decided = cascade_prefilter("q", candidates, scorer="retrieval", prefilter_k=2, margin=0.5)
+    assert not decided
+
+
+def test_cascade_rerank_scores_only_head(monkeypatch):
+    monkeypatch.setattr("rag.cascade.CASCADE_SKIP_MARGIN", 0.15)
+    monkeypatch.setattr("rag.cascade.CASCADE_PREFILTER_K", 3)
+    candidates = _candidates([0.10, 0.12, 0.14, 0.40, 0.41])
+    reranker = MagicMock()
+    reranker.rerank.side_effect = lambda query, docs_with_scores, top_n: [doc for doc, _ in reversed(docs_with_scores)][:top_n]
+
+    result = cascade_rerank(reranker, "q", candidates, top_n=4)
+
+    assert _ids(doc for doc, _ in reranker.rerank.call_args.kwargs["docs_with_scores"]) == ["d0", "d1", "d2"]
+    # Cross-Encoder 결과 뒤에 나머지 후보를 1단계 순서로 채움
+    assert _ids(result) == ["d2", "d1", "d0", "d3"]
+    assert get_metrics_registry().counter("rag.cascade.cross_encoded") == 1
+
+
+def test_cascade_rerank_skips_cross_encoder_for_clear_winner(monkeypatch):
+    monkeypatch.setattr("rag.cascade.CASCADE_SKIP_MARGIN", 0.15)
+    candidates = _candidates([0.40, 0.05, 0.42])
+    reranker = MagicMock()
+
+    result = cascade_rerank(reranker, "q", candidates, top_n=2)
+
+    reranker.rerank.assert_not_called()
+    assert _ids(result) == ["d1", "d0"]
+    assert get_metrics_registry().counter("rag.cascade.skipped") == 1
+
+
+def test_cascade_rerank_batch_scores_only_undecided_queries(monkeypatch):
+    monkeypatch.setattr("rag.cascade.CASCADE_SKIP_MARGIN", 0.15)
+    monkeypatch.setattr("rag.cascade.CASCADE_PREFILTER_K", 2)
+    clear = _candidates([0.05, 0.40, 0.45])
+    close = _candidates([0.10, 0.11, 0.12])
+    reranker = MagicMock()
+    reranker.rerank_batch.side_effect = lambda queries, docs_with_scores_list, top_n: [
+        [doc for doc, _ in reversed(docs)][:top_n] for docs in docs_with_scores_list
+    ]
+
+    results = cascade_rerank_batch(reranker, ["q1", "q2"], [clear, close], top_n=3)
+
+    kwargs = reranker.rerank_batch.call_args.kwargs
+    assert kwargs["queries"] == ["q2"]
+    assert [len(docs) for docs in kwargs["docs_with_scores_list"]] == [2]
+    assert _ids(results[0]) == ["d0", "d1", "d2"]
+    assert _ids(results[1]) == ["d1", "d0", "d2"]
+
+
+@pytest.mark.parametrize("fused_flag", ["rag.cascade.USE_HYBRID_SEARCH", "rag.cascade.USE_MULTI_QUERY"])
+def test_retrieval_margin_not_applied_to_fused_scores(monkeypatch, fused_flag):
+    """RRF 의사 거리는 dense 거리 기준 margin과 척도가 달라 생략 판단을 하지 않음 (상위 K개 채점은 유지)"""
+    monkeypatch.setattr("rag.cascade.CASCADE_SKIP_MARGIN", 0.15)
+    monkeypatch.setattr("rag.cascade.CASCADE_PREFILTER_K", 2)
+    monkeypatch.setattr(fused_flag, True)
+    candidates = _candidates([0.05, 0.40, 0.42])
+    reranker = MagicMock()
+    reranker.rerank.side_effect = lambda query, docs_with_scores, top_n: [doc for doc, _ in docs_with_scores][:top_n]
+
+    cascade_rerank(reranker, "q", candidates, top_n=2)
+
+    assert _ids(doc for doc, _ in reranker.rerank.call_args.kwargs["docs_with_scores"]) == ["d0", "d1"]
+    assert get_metrics_registry().counter("rag.cascade.skipped") == 0
+
+
+def test_lexical_margin_still_applies_to_fused_results(monkeypatch):
+    monkeypatch.setattr("rag.cascade.CASCADE_SKIP_MARGIN", 0.15)
+    monkeypatch.setattr("rag.cascade.CASCADE_SCORER", "lexical")
+    monkeypatch.setattr("rag.cascade.USE_HYBRID_SEARCH", True)
+    candidates = _candidates([0.50, 0.51], ["반납 신청 방법", "불용 처리 절차 안내"])
+    reranker = MagicMock()
+
+    result = cascade_rerank(reranker, "불용 처리", candidates, top_n=2)
+
+    reranker.rerank.assert_not_called()
+    assert _ids(result) == ["d1", "d0"]
@@ -1,71 +1,12 @@
-import pytest
 import json
 import logging
-from unittest.mock import patch, MagicMock
-from langchain_core.messages import AIMessage
-from typing import NamedTuple
-
-# 테스트할 대상 함수
-from rag.chain import run_rag_chain
-
-# --------------------------------------------------------------------------
-# 1. Fixtures (환경 설정)
-# --------------------------------------------------------------------------
-
-@pytest.fixture(autouse=True)
-def _set_test_env(monkeypatch):
-    """테스트 환경변수 강제 주입"""
-    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
-    monkeypatch.setenv("BACKEND_API_URL", "http://test-backend")
-    monkeypatch.setenv("FRONTEND_BASE_URL", "http://test-frontend")
-
-class MockContext(NamedTuple):
-    base_llm: MagicMock      # Generator
-    bound_llm: MagicMock     # Router
-    vectordb: MagicMock
-    retriever: MagicMock
-
-@pytest.fixture(scope="function")
-def mock_dependencies():
-    """RAG 체인 의존성 Mocking 및 정리(Teardown)"""
-    # 1. Mock 객체 생성
-    mock_base_llm = MagicMock(name="BaseLLM")
-    mock_bound_llm = MagicMock(name="BoundLLM")
-    mock_vectordb = MagicMock(name="VectorDB")
-    mock_retriever = MagicMock(name="Retriever")
-
-    # 2. LLM 바인딩 설정
-    mock_base_llm.bind_tools.return_value = mock_bound_llm
-    
-    # 체이닝 메서드 방어
-    mock_base_llm.with_config.return_value = mock_base_llm
-    mock_base_llm.with_fallbacks.return_value = mock_base_llm
-    mock_bound_llm.with_config.return_value = mock_bound_llm
-    mock_bound_llm.with_retry.return_value = mock_bound_llm
-
-    # 3. VectorDB -> Retriever 연결
-    mock_vectordb.as_retriever.return_value = mock_retriever
-    mock_retriever.invoke.return_value = [] # 기본: 검색 결과 없음
-
-    context = MockContext(
-        base_llm=mock_base_llm,
-        bound_llm=mock_bound_llm,
-        vectordb=mock_vectordb,
-        retriever=mock_retriever
-    )
-
-    yield context
+from unittest.mock import MagicMock, patch
 
-    # Clean-up
-    mock_base_llm.reset_mock()
-    mock_bound_llm.reset_mock()
-    mock_vectordb.reset_mock()
-    mock_retriever.reset_mock()
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
 
+from rag.chain import run_rag_chain, _build_rag_messages
 
-# --------------------------------------------------------------------------
-# 2. Test Cases (완벽 격리 버전)
-# --------------------------------------------------------------------------
 
 # [수정 포인트] 모든 테스트에서 앞단 체인(Classifier, Refiner)을 Mocking 하여
 # 실제 로직이나 외부 API 호출 없이 오직 'Router'와 'Tool' 로직만 검증하도록 격리함.
@@ -358,4 +299,24 @@ def test_fallback_on_unknown_tool(mock_classifier, mock_refiner, caplog):
     
     # 혹은 결과값이 에러 없이 텍스트로 잘 나왔는지 확인
     assert isinstance(result, dict)
-    assert "answer" in result
\ No newline at end of file
+    assert "answer" in result
+
+
+# ==========================================
+# 근중복 병합 문서 출처 표시 Test
+# ==========================================
+
+
+def test_attribution_includes_merged_doc_ids():
+    """[Dedup] 색인 시 병합된 doc_id가 있으면 attribution에 함께 표시"""
+    docs = [
+        Document(page_content="반납 절차", metadata={"doc_id": "doc_1", "merged_doc_ids": "doc_7,doc_9"}),
+        Document(page_content="불용 절차", metadata={"doc_id": "doc_2"}),
+    ]
+
+    _, attribution = _build_rag_messages(docs, "반납 어떻게 해?")
+
+    assert attribution == [
+        {"doc_id": "doc_1", "merged_doc_ids": ["doc_7", "doc_9"]},
+        {"doc_id": "doc_2"},
+    ]
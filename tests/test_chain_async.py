@@ -0,0 +1,65 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from chain_mocks import mock_template_chain
+from rag.chain import arun_rag_chain
+
+
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_async_rag_flow(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Async] 도구 없음 -> 분류 -> 정제 -> 검색 -> 재정렬 -> 생성 (반환 형식 동일)"""
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("불용 처리 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.ainvoke = AsyncMock(return_value=AIMessage(content="", tool_calls=[]))
+    ctx.base_llm.ainvoke = AsyncMock(return_value=AIMessage(content="불용은 이렇게 처리합니다."))
+
+    doc = Document(page_content="불용 절차 설명", metadata={"doc_id": "doc_1"})
+    mock_retrieve.return_value = [(doc, 0.3)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    result = asyncio.run(arun_rag_chain(ctx.base_llm, ctx.vectordb, "불용 어떻게 해?"))
+
+    assert result == {
+        "answer": "불용은 이렇게 처리합니다.",
+        "attribution": [{"doc_id": "doc_1"}],
+    }
+    mock_retrieve.assert_called_once()
+    assert mock_retrieve.call_args.kwargs["query"] == "불용 처리 절차"
+    ctx.bound_llm.invoke.assert_not_called()
+
+
+@patch("rag.chain.TOOL_MAP")
+def test_async_tool_navigate(mock_tool_map, mock_dependencies):
+    """[Async] 이동 도구만 호출된 경우 -> 생성 단계 없이 navigate 반환"""
+    ctx = mock_dependencies
+
+    nav_tool = MagicMock(name="nav_tool")
+    nav_tool.invoke.return_value = json.dumps({
+        "action": "navigate",
+        "target_url": "http://test-frontend/prediction",
+        "guide_msg": "이동합니다"
+    }, ensure_ascii=False)
+    mock_tool_map.__contains__.side_effect = lambda name: name == "open_usage_prediction_page"
+    mock_tool_map.__getitem__.side_effect = lambda name: nav_tool
+
+    ctx.bound_llm.ainvoke = AsyncMock(return_value=AIMessage(
+        content="",
+        tool_calls=[{"name": "open_usage_prediction_page", "args": {"user_question_context": "수명"}, "id": "nav_1"}]
+    ))
+    ctx.base_llm.ainvoke = AsyncMock()
+
+    result = asyncio.run(arun_rag_chain(ctx.base_llm, ctx.vectordb, "수명 예측해줘"))
+
+    assert result["action"] == "navigate"
+    assert result["target_url"] == "http://test-frontend/prediction"
+    ctx.base_llm.ainvoke.assert_not_called()
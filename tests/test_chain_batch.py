@@ -0,0 +1,87 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from chain_mocks import mock_template_chain
+from rag.chain import run_rag_chain_batch
+
+
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.PromptTemplate")
+def test_batch_groups_stages_and_keeps_order(mock_prompt_template, mock_reranker_cls, mock_dependencies):
+    """[Batch] 단계별 일괄 호출 (Router / 분류 / 정제 / 임베딩 / Re-rank / 생성), 입력 순서 유지"""
+    ctx = mock_dependencies
+
+    classifier_template, classifier_chain = mock_template_chain(None)
+    refiner_template, refiner_chain = mock_template_chain(None)
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+    classifier_chain.batch.return_value = ["NEED_RAG", "NO_RAG", "NEED_RAG"]
+    refiner_chain.batch.return_value = ["불용 절차", "반납 절차"]
+
+    ctx.bound_llm.batch.return_value = [AIMessage(content="", tool_calls=[])] * 3
+    ctx.vectordb.embeddings.embed_documents.return_value = [[1.0, 0.0], [0.0, 1.0]]
+
+    doc_a = Document(page_content="불용 설명", metadata={"doc_id": "doc_a"})
+    doc_b = Document(page_content="반납 설명", metadata={"doc_id": "doc_b"})
+    ctx.vectordb.similarity_search_by_vector_with_relevance_scores.side_effect = [
+        [(doc_a, 0.2)], [(doc_b, 0.3)]
+    ]
+    mock_reranker_cls.return_value.rerank_batch.return_value = [[doc_a], [doc_b]]
+
+    def _generate(batch_messages, **kwargs):
+        return [AIMessage(content=f"답변:{messages[-1].content[-6:]}") for messages in batch_messages]
+    ctx.base_llm.batch.side_effect = _generate
+
+    results = run_rag_chain_batch(ctx.base_llm, ctx.vectordb, ["불용 방법", "안녕하세요", "반납 방법"])
+
+    assert [r["attribution"] for r in results] == [[{"doc_id": "doc_a"}], [], [{"doc_id": "doc_b"}]]
+    assert all(r["answer"].startswith("답변:") for r in results)
+
+    ctx.bound_llm.batch.assert_called_once()
+    classifier_chain.batch.assert_called_once()
+    assert [x["question"] for x in refiner_chain.batch.call_args.args[0]] == ["불용 방법", "반납 방법"]
+    ctx.vectordb.embeddings.embed_documents.assert_called_once_with(["불용 절차", "반납 절차"])
+    mock_reranker_cls.return_value.rerank_batch.assert_called_once()
+    ctx.base_llm.batch.assert_called_once()
+    ctx.base_llm.invoke.assert_not_called()
+
+
+@patch("rag.chain.TOOL_MAP")
+@patch("rag.chain.PromptTemplate")
+def test_batch_isolates_per_query_errors(mock_prompt_template, mock_tool_map, mock_dependencies):
+    """[Batch] 도구 이동 질문은 즉시 종료, 생성 실패 질문만 기술 오류 응답"""
+    ctx = mock_dependencies
+    from app.config import TECHNICAL_ERROR_RESPONSE
+
+    classifier_template, classifier_chain = mock_template_chain(None)
+    refiner_template, _ = mock_template_chain(None)
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+    classifier_chain.batch.return_value = ["NO_RAG", "NO_RAG"]
+
+    nav_tool = MagicMock(name="nav_tool")
+    nav_tool.invoke.return_value = json.dumps({
+        "action": "navigate",
+        "target_url": "http://test-frontend/prediction",
+        "guide_msg": "이동합니다"
+    }, ensure_ascii=False)
+    mock_tool_map.__contains__.side_effect = lambda name: True
+    mock_tool_map.__getitem__.side_effect = lambda name: nav_tool
+
+    ctx.bound_llm.batch.return_value = [
+        AIMessage(content="", tool_calls=[]),
+        AIMessage(content="", tool_calls=[
+            {"name": "open_usage_prediction_page", "args": {"user_question_context": "수명"}, "id": "nav_1"}
+        ]),
+        AIMessage(content="", tool_calls=[]),
+    ]
+    ctx.base_llm.batch.return_value = [AIMessage(content="안녕하세요!"), RuntimeError("rate limit")]
+
+    results = run_rag_chain_batch(ctx.base_llm, ctx.vectordb, ["안녕", "수명 예측해줘", "고마워"])
+
+    assert results[0]["answer"] == "안녕하세요!"
+    assert results[1]["action"] == "navigate"
+    assert results[1]["answer"] == "요청하신 화면으로 이동합니다."
+    assert results[2]["answer"] == TECHNICAL_ERROR_RESPONSE
+    assert [x["question"] for x in classifier_chain.batch.call_args.args[0]] == ["안녕", "고마워"]
@@ -0,0 +1,178 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from chain_mocks import mock_template_chain
+from rag.chain import RagPipeline, run_rag_chain
+from rag.semantic_cache import SemanticAnswerCache
+
+
+@patch("rag.chain.USE_SEMANTIC_CACHE", True)
+@patch("rag.chain.get_semantic_cache")
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_semantic_cache_hit_skips_pipeline(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_get_cache, mock_dependencies):
+    """[Cache] 같은 의미의 두 번째 질문은 Router 판단 후 분류 / 검색 / 생성 단계를 모두 생략"""
+    ctx = mock_dependencies
+    mock_get_cache.return_value = SemanticAnswerCache(threshold=0.95, ttl_seconds=60, max_size=8)
+    ctx.vectordb.embeddings.embed_query.return_value = [0.6, 0.8]
+
+    classifier_template, classifier_chain = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("반납 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="반납 답변")
+
+    doc = Document(page_content="반납 절차", metadata={"doc_id": "doc_5"})
+    mock_retrieve.return_value = [(doc, 0.1)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    first = run_rag_chain(ctx.base_llm, ctx.vectordb, "반납 절차 알려줘")
+    second = run_rag_chain(ctx.base_llm, ctx.vectordb, "반납 절차 알려 줘")
+
+    assert first == second == {"answer": "반납 답변", "attribution": [{"doc_id": "doc_5"}]}
+    # 캐시는 Router 이후에 조회되므로 Router는 매번 호출
+    assert ctx.bound_llm.invoke.call_count == 2
+    assert ctx.base_llm.invoke.call_count == 1
+    classifier_chain.invoke.assert_called_once()
+    mock_retrieve.assert_called_once()
+
+
+@patch("rag.chain.USE_SEMANTIC_CACHE", True)
+@patch("rag.chain.get_semantic_cache")
+@patch("rag.chain.TOOL_MAP")
+def test_semantic_cache_skips_tool_responses(mock_tool_map, mock_get_cache, mock_dependencies):
+    """[Cache] 실시간 자산 데이터 기반 도구 응답은 저장하지 않음"""
+    ctx = mock_dependencies
+    cache = SemanticAnswerCache(threshold=0.95, ttl_seconds=60, max_size=8)
+    mock_get_cache.return_value = cache
+    ctx.vectordb.embeddings.embed_query.return_value = [1.0, 0.0]
+
+    search_tool = MagicMock(name="search_tool")
+    search_tool.invoke.return_value = json.dumps({"results": ["노트북"]}, ensure_ascii=False)
+    mock_tool_map.__contains__.side_effect = lambda name: True
+    mock_tool_map.__getitem__.side_effect = lambda name: search_tool
+
+    ctx.bound_llm.invoke.return_value = AIMessage(
+        content="",
+        tool_calls=[{"name": "get_item_detail_info", "args": {"asset_name": "노트북"}, "id": "call_1"}]
+    )
+    ctx.base_llm.invoke.return_value = AIMessage(content="노트북은 운용 중입니다.")
+
+    run_rag_chain(ctx.base_llm, ctx.vectordb, "노트북 상태")
+
+    assert len(cache) == 0
+
+
+@patch("rag.chain.USE_SEMANTIC_CACHE", True)
+@patch("rag.chain.get_semantic_cache")
+@patch("rag.chain.TOOL_MAP")
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_semantic_cache_not_used_for_tool_questions(mock_prompt_template, mock_retrieve, mock_reranker_cls,
+                                                    mock_tool_map, mock_get_cache, mock_dependencies):
+    """[Cache] 캐시된 RAG 답변과 비슷한 질문이라도 Router가 도구를 선택하면 도구 경로로 처리"""
+    ctx = mock_dependencies
+    mock_get_cache.return_value = SemanticAnswerCache(threshold=0.95, ttl_seconds=60, max_size=8)
+    ctx.vectordb.embeddings.embed_query.return_value = [1.0, 0.0]
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("노트북 운용 상태 조회")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    doc = Document(page_content="노트북 상태 안내", metadata={"doc_id": "doc_6"})
+    mock_retrieve.return_value = [(doc, 0.1)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    search_tool = MagicMock(name="search_tool")
+    search_tool.invoke.return_value = json.dumps({"results": ["노트북"]}, ensure_ascii=False)
+    mock_tool_map.__contains__.side_effect = lambda name: True
+    mock_tool_map.__getitem__.side_effect = lambda name: search_tool
+
+    ctx.bound_llm.invoke.side_effect = [
+        AIMessage(content="", tool_calls=[]),
+        AIMessage(content="", tool_calls=[{"name": "get_item_detail_info", "args": {"asset_name": "노트북"}, "id": "call_1"}]),
+    ]
+    ctx.base_llm.invoke.side_effect = [AIMessage(content="매뉴얼 답변"), AIMessage(content="노트북은 운용 중입니다.")]
+
+    run_rag_chain(ctx.base_llm, ctx.vectordb, "노트북 상태")
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "노트북 상태")
+
+    assert result["answer"] == "노트북은 운용 중입니다."
+    search_tool.invoke.assert_called_once()
+    # 도구 경로에서는 캐시 조회용 임베딩도 계산하지 않음
+    ctx.vectordb.embeddings.embed_query.assert_called_once()
+
+
+@patch("rag.chain.USE_SEMANTIC_CACHE", True)
+@patch("rag.chain.get_semantic_cache")
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs_by_vector")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_semantic_cache_query_vector_reused_for_retrieval(mock_prompt_template, mock_retrieve, mock_retrieve_by_vector,
+                                                          mock_reranker_cls, mock_get_cache, mock_dependencies):
+    """[Cache] 캐시 미적중 시 조회에 쓴 질의 벡터로 검색 (검색어가 원본 질문과 같으면 임베딩 1회)"""
+    ctx = mock_dependencies
+    mock_get_cache.return_value = SemanticAnswerCache(threshold=0.95, ttl_seconds=60, max_size=8)
+    ctx.vectordb.embeddings.embed_query.return_value = [0.6, 0.8]
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("반납 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="반납 답변")
+
+    doc = Document(page_content="반납 절차", metadata={"doc_id": "doc_5"})
+    mock_retrieve_by_vector.return_value = [(doc, 0.1)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "반납 절차")
+
+    assert result["answer"] == "반납 답변"
+    ctx.vectordb.embeddings.embed_query.assert_called_once()
+    mock_retrieve.assert_not_called()
+    assert mock_retrieve_by_vector.call_args.kwargs["embedding"] == [0.6, 0.8]
+
+
+@patch("rag.chain.USE_SEMANTIC_CACHE", True)
+@patch("rag.chain.get_semantic_cache")
+@patch("rag.chain.compute_knowledge_fingerprint")
+@patch("rag.chain.PromptTemplate")
+def test_knowledge_fingerprint_computed_once_per_vectordb(mock_prompt_template, mock_fingerprint, mock_get_cache,
+                                                          mock_dependencies):
+    """[Cache] 벡터 DB 지문은 요청마다가 아니라 벡터 DB 로드 / 교체 시에만 계산, 교체 후에는 이전 답변 무효화"""
+    ctx = mock_dependencies
+    mock_get_cache.return_value = SemanticAnswerCache(threshold=0.95, ttl_seconds=60, max_size=8)
+    mock_fingerprint.side_effect = lambda vectordb: (vectordb._mock_name, 0.0)
+
+    classifier_template, classifier_chain = mock_template_chain("NO_RAG")
+    refiner_template, _ = mock_template_chain("")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="일반 답변")
+
+    new_vectordb = MagicMock(name="NewVectorDB")
+    for vectordb in (ctx.vectordb, new_vectordb):
+        vectordb.embeddings.embed_query.return_value = [0.6, 0.8]
+
+    pipeline = RagPipeline(ctx.base_llm, ctx.vectordb)
+    pipeline.run("안녕하세요")
+    pipeline.run("안녕하세요")
+    assert mock_fingerprint.call_count == 1
+    assert ctx.base_llm.invoke.call_count == 1
+
+    pipeline.swap_vectordb(new_vectordb)
+    pipeline.run("안녕하세요")
+
+    assert mock_fingerprint.call_count == 2
+    assert pipeline.knowledge_fingerprint == ("NewVectorDB", 0.0)
+    # 지문이 바뀌었으므로 캐시 적중 없이 다시 생성
+    assert ctx.base_llm.invoke.call_count == 2
@@ -0,0 +1,142 @@
+from unittest.mock import patch
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from chain_mocks import mock_template_chain
+from rag.chain import run_rag_chain
+from rag.metrics import get_metrics_registry
+
+
+@patch("rag.chain.INCLUDE_TIMINGS_IN_RESULT", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_timings_block_and_registry(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Metrics] RAG 경로의 단계별 시간 / 후보 수가 결과와 전역 지표에 기록"""
+    ctx = mock_dependencies
+    get_metrics_registry().reset()
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("불용 처리 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="불용은 이렇게 처리합니다.")
+
+    docs = [Document(page_content=f"문서 {i}", metadata={"doc_id": f"doc_{i}"}) for i in range(3)]
+    mock_retrieve.return_value = [(docs[0], 0.3), (docs[1], 0.5), (docs[2], 99.0)]
+    mock_reranker_cls.return_value.rerank.return_value = docs[:1]
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "불용 어떻게 해?")
+
+    timings = result["timings"]
+    assert timings["route"] == "rag"
+    assert set(timings["stages"]) == {"router", "classifier", "refine", "retrieval", "rerank", "generate"}
+    assert timings["stages"]["retrieval"]["candidates"] == 3
+    assert timings["stages"]["retrieval"]["kept"] == 2
+    assert timings["stages"]["rerank"]["selected"] == 1
+
+    registry = get_metrics_registry()
+    assert registry.counter("rag.route.rag") == 1
+    assert registry.histogram("rag.stage.retrieval.latency_ms").count == 1
+
+
+@patch("rag.adaptive_depth.USE_ADAPTIVE_DEPTH", True)
+@patch("rag.adaptive_depth.ADAPTIVE_SCORE_MARGIN", None)
+@patch("rag.chain.INCLUDE_TIMINGS_IN_RESULT", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_adaptive_depth_shrinks_rerank_candidates(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Adaptive Depth] 점수 간격이 뚜렷하면 Re-ranking 후보 / Context 수를 줄임"""
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("불용 처리 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="답변")
+
+    docs = [Document(page_content=f"문서 {i}", metadata={"doc_id": f"doc_{i}"}) for i in range(10)]
+    scores = [0.40, 0.41, 0.43, 0.90, 0.91, 0.92, 0.93, 0.94, 0.95, 0.96]
+    mock_retrieve.return_value = list(zip(docs, scores))
+    mock_reranker_cls.return_value.rerank.return_value = docs[:3]
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "불용 어떻게 해?")
+
+    rerank_kwargs = mock_reranker_cls.return_value.rerank.call_args.kwargs
+    assert len(rerank_kwargs["docs_with_scores"]) == 3
+    assert rerank_kwargs["top_n"] == 3
+    assert result["timings"]["stages"]["rerank"]["candidates"] == 3
+
+
+@patch("rag.context_selection._get_encoding", return_value=None)
+@patch("rag.chain.USE_MMR_CONTEXT", True)
+@patch("rag.chain.INCLUDE_TIMINGS_IN_RESULT", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_mmr_context_drops_redundant_documents(mock_prompt_template, mock_retrieve, mock_reranker_cls, _mock_encoding, mock_dependencies):
+    """[MMR] Re-ranking 결과 중 임베딩이 거의 같은 문서는 Context에서 제외"""
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("불용 처리 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="답변")
+
+    docs = [Document(page_content=f"문서 본문 {i}", metadata={"doc_id": f"doc_{i}"}) for i in range(3)]
+    mock_retrieve.return_value = [(doc, 0.1 * i) for i, doc in enumerate(docs)]
+    mock_reranker_cls.return_value.rerank.return_value = docs
+    ctx.vectordb.document_vectors.return_value = [[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]]
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "불용 어떻게 해?")
+
+    assert result["attribution"] == [{"doc_id": "doc_0"}, {"doc_id": "doc_2"}]
+    prompt = ctx.base_llm.invoke.call_args.args[0][0].content
+    assert "문서 본문 0" in prompt and "문서 본문 1" not in prompt
+    assert result["timings"]["stages"]["context_select"]["selected"] == 2
+
+
+@patch("rag.chain.USE_CASCADE_RERANK", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_cascade_skips_cross_encoder_for_clear_winner(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Cascade] 검색 점수 1위가 margin 이상 앞서면 Cross-Encoder 없이 검색 순서 사용"""
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("불용 처리 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="답변")
+
+    docs = [Document(page_content=f"문서 {i}", metadata={"doc_id": f"doc_{i}"}) for i in range(3)]
+    mock_retrieve.return_value = list(zip(docs, [0.10, 0.60, 0.65]))
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "불용 어떻게 해?")
+
+    mock_reranker_cls.return_value.rerank.assert_not_called()
+    assert result["attribution"][0] == {"doc_id": "doc_0"}
+
+
+@patch("rag.chain.PromptTemplate")
+def test_timings_omitted_by_default(mock_prompt_template, mock_dependencies):
+    """[Metrics] 기본 설정에서는 반환 형식 변화 없음"""
+    ctx = mock_dependencies
+    classifier_template, _ = mock_template_chain("NO_RAG")
+    refiner_template, _ = mock_template_chain("")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="안녕하세요")
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "안녕")
+
+    assert result == {"answer": "안녕하세요", "attribution": []}
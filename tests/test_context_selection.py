@@ -0,0 +1,83 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from rag.context_selection import mmr_select, select_context
+from rag.metrics import get_metrics_registry
+from vectorstore.retriever import get_document_vectors
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    get_metrics_registry().reset()
+    yield
+    get_metrics_registry().reset()
+
+
+def _docs(n):
+    return [Document(page_content=f"문서 {i}", metadata={"doc_id": f"doc_{i}"}) for i in range(n)]
+
+
+def test_mmr_prefers_diverse_document_over_near_duplicate():
+    # 0, 1은 거의 같은 방향, 2는 다른 방향
+    vectors = np.array([[1.0, 0.0], [0.99, 0.14], [0.0, 1.0]], dtype=np.float32)
+
+    selected = mmr_select(vectors, [10, 10, 10], token_budget=20, lambda_mult=0.5, redundancy_threshold=None)
+
+    assert selected == [0, 2]
+
+
+def test_mmr_without_diversity_weight_keeps_rank_order():
+    vectors = np.array([[1.0, 0.0], [0.99, 0.14], [0.0, 1.0]], dtype=np.float32)
+
+    assert mmr_select(vectors, [1, 1, 1], token_budget=100, lambda_mult=1.0, redundancy_threshold=None) == [0, 1, 2]
+
+
+def test_mmr_drops_redundant_documents():
+    vectors = np.array([[1.0, 0.0], [1.0, 0.001], [0.0, 1.0]], dtype=np.float32)
+
+    assert mmr_select(vectors, [1, 1, 1], token_budget=100, lambda_mult=1.0, redundancy_threshold=0.95) == [0, 2]
+
+
+def test_mmr_respects_token_budget_and_skips_oversized_documents():
+    # 첫 문서는 예산을 넘어도 포함, 이후에는 남은 예산에 맞는 문서만
+    assert mmr_select(None, [50, 10, 80], token_budget=40) == [0]
+    assert mmr_select(None, [10, 40, 15, 5], token_budget=30) == [0, 2, 3]
+    assert mmr_select(None, [1, 1, 1, 1], token_budget=100, max_docs=2) == [0, 1]
+    assert mmr_select(None, [], token_budget=100) == []
+
+
+def test_select_context_uses_index_vectors():
+    docs = _docs(3)
+    vectordb = MagicMock()
+    vectordb.document_vectors.return_value = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+
+    selected = select_context(vectordb, docs, token_budget=100, count=len)
+
+    assert selected == [docs[0], docs[2]]
+    vectordb.document_vectors.assert_called_once_with(["doc_0", "doc_1", "doc_2"])
+    assert get_metrics_registry().histogram("rag.context.selected_docs").count == 1
+
+
+def test_get_document_vectors_from_chroma_collection():
+    docs = _docs(2)
+    vectordb = MagicMock(spec=["_collection"])
+    vectordb._collection.get.return_value = {
+        "metadatas": [{"doc_id": "doc_1"}, {"doc_id": "doc_0"}],
+        "embeddings": [[0.0, 1.0], [1.0, 0.0]],
+    }
+
+    vectors = get_document_vectors(vectordb, docs)
+
+    np.testing.assert_array_equal(vectors, [[1.0, 0.0], [0.0, 1.0]])
+    assert vectordb._collection.get.call_args.kwargs["where"] == {"doc_id": {"$in": ["doc_0", "doc_1"]}}
+
+
+def test_get_document_vectors_missing_doc_returns_none():
+    vectordb = MagicMock(spec=["_collection"])
+    vectordb._collection.get.return_value = {"metadatas": [{"doc_id": "doc_0"}], "embeddings": [[1.0, 0.0]]}
+
+    assert get_document_vectors(vectordb, _docs(2)) is None
+    assert get_document_vectors(vectordb, [Document(page_content="doc_id 없음")]) is None
@@ -0,0 +1,73 @@
+import pytest
+from langchain_core.documents import Document
+
+from ingestion.dedup import collapse_near_duplicates, find_duplicate_clusters, jaccard, shingles
+
+BASE = (
+    "사용자 질문: 물품 반납 신청은 어떻게 하나요?\n"
+    "상세 답변: 반납 메뉴에서 반납할 물품을 선택한 뒤 반납 사유를 입력하고 신청 버튼을 누르면 "
+    "물품관리관에게 승인 요청이 전달됩니다. 승인이 완료되면 반납 상태로 변경됩니다."
+)
+
+
+def _doc(content, doc_id, source="3장.json"):
+    return Document(page_content=content, metadata={"doc_id": doc_id, "source": source})
+
+
+def test_shingles_normalize_whitespace_and_case():
+    assert shingles("AB  CD\nEF", size=3) == shingles("ab cd ef", size=3)
+    assert shingles("ab", size=5) == {"ab"}
+    assert shingles("   ", size=5) == set()
+
+
+def test_jaccard():
+    assert jaccard({1, 2}, {2, 3}) == pytest.approx(1 / 3)
+    assert jaccard(set(), set()) == 1.0
+
+
+def test_find_duplicate_clusters_groups_restatements():
+    texts = [
+        BASE,
+        "완전히 다른 내용: 보유현황 조회 화면에서 부서별 물품 수량을 확인할 수 있습니다.",
+        BASE.replace("누르면", "클릭하면"),
+        BASE + " ",
+    ]
+
+    assert find_duplicate_clusters(texts, threshold=0.8) == [[0, 2, 3]]
+
+
+def test_find_duplicate_clusters_rejects_invalid_bands():
+    with pytest.raises(ValueError):
+        find_duplicate_clusters([BASE], num_perm=10, bands=3)
+
+
+def test_collapse_keeps_longest_and_records_merged_ids():
+    documents = [
+        _doc(BASE, "doc_0"),
+        _doc("보유현황 조회 화면에서 부서별 물품 수량을 확인할 수 있습니다.", "doc_1"),
+        _doc(BASE + " 자세한 내용은 매뉴얼을 참고하세요.", "doc_2"),
+    ]
+
+    collapsed, removed = collapse_near_duplicates(documents, threshold=0.8)
+
+    assert removed == 1
+    # 원래 순서 유지, 대표 문서는 본문이 가장 긴 문서
+    assert [doc.metadata["doc_id"] for doc in collapsed] == ["doc_1", "doc_2"]
+    assert collapsed[1].metadata["merged_doc_ids"] == "doc_0"
+    assert "merged_doc_ids" not in collapsed[0].metadata
+    # 입력 문서의 metadata는 변경하지 않음
+    assert "merged_doc_ids" not in documents[2].metadata
+
+
+def test_collapse_does_not_merge_across_scope():
+    """장(source)이 다르면 문장 틀이 같아도 병합하지 않음 (반납 / 불용)"""
+    documents = [
+        _doc(BASE, "doc_0", source="3장.json"),
+        _doc(BASE.replace("반납", "불용"), "doc_1", source="4장.json"),
+        _doc(BASE, "doc_2", source="5장.json"),
+    ]
+
+    collapsed, removed = collapse_near_duplicates(documents, threshold=0.5)
+
+    assert removed == 0
+    assert collapsed == documents
@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from ingestion.embedding_cache import CachedEmbeddings, normalize_text
+
+
+def _fake_embeddings():
+    """텍스트 길이로 벡터를 만드는 임베딩 Mock (호출 횟수 확인용)"""
+    embeddings = MagicMock(name="OpenAIEmbeddings")
+    embeddings.embed_query.side_effect = lambda text: [float(len(text)), 1.0]
+    embeddings.embed_documents.side_effect = lambda texts: [[float(len(t)), 0.5] for t in texts]
+    return embeddings
+
+
+def test_normalize_text_keeps_case_and_punctuation():
+    assert normalize_text("  불용  처리\n방법? ") == "불용 처리 방법?"
+    assert normalize_text("G2B") != normalize_text("g2b")
+
+
+def test_embed_query_hits_memory_cache_for_normalized_text():
+    inner = _fake_embeddings()
+    cache = CachedEmbeddings(inner, model_name="m", max_size=10)
+
+    first = cache.embed_query("불용 처리 절차")
+    second = cache.embed_query("  불용   처리 절차 ")
+
+    assert first == second
+    inner.embed_query.assert_called_once()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_embed_documents_only_requests_misses_in_order():
+    inner = _fake_embeddings()
+    cache = CachedEmbeddings(inner, model_name="m", max_size=10)
+    cache.embed_documents(["a", "bb"])
+
+    vectors = cache.embed_documents(["bb", "ccc", "a", "ccc"])
+
+    assert [v[0] for v in vectors] == [2.0, 3.0, 1.0, 3.0]
+    assert inner.embed_documents.call_args_list[-1].args[0] == ["ccc"]
+
+
+def test_sqlite_persists_across_instances_and_is_model_scoped(tmp_path):
+    db_path = str(tmp_path / "emb.sqlite3")
+    CachedEmbeddings(_fake_embeddings(), model_name="m", max_size=10, db_path=db_path).embed_query("반납 절차")
+
+    inner = _fake_embeddings()
+    restarted = CachedEmbeddings(inner, model_name="m", max_size=10, db_path=db_path)
+    assert restarted.embed_query("반납 절차") == pytest.approx([5.0, 1.0])
+    inner.embed_query.assert_not_called()
+
+    other_model = CachedEmbeddings(inner, model_name="other", max_size=10, db_path=db_path)
+    other_model.embed_query("반납 절차")
+    inner.embed_query.assert_called_once()
+
+
+def test_lru_evicts_oldest_from_memory():
+    inner = _fake_embeddings()
+    cache = CachedEmbeddings(inner, model_name="m", max_size=2)
+    for text in ["a", "b", "c"]:
+        cache.embed_query(text)
+
+    cache.embed_query("a")
+
+    assert inner.embed_query.call_count == 4
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+faiss = pytest.importorskip("faiss")
+
+from vectorstore.faiss_store import FaissVectorStore, create_faiss_db, load_faiss_db
+from vectorstore.numpy_store import create_numpy_store
+from vectorstore.retriever import retrieve_docs
+
+
+class _RandomEmbeddings:
+    """텍스트별로 고정된 난수 벡터를 돌려주는 임베딩 Mock"""
+
+    def __init__(self, dimension=64):
+        self.dimension = dimension
+
+    def _vector(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.normal(size=self.dimension).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+@pytest.fixture
+def corpus():
+    documents = [
+        Document(page_content=f"문서 {i}", metadata={"doc_id": f"doc_{i}"})
+        for i in range(300)
+    ]
+    return documents, _RandomEmbeddings()
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_exact_or_graph_index_matches_brute_force(tmp_path, corpus, index_type):
+    documents, embeddings = corpus
+    reference = create_numpy_store(documents, embeddings, str(tmp_path / "numpy"))
+    create_faiss_db(documents, embeddings, str(tmp_path / "faiss"), index_type=index_type)
+
+    store = load_faiss_db(embeddings, str(tmp_path / "faiss"))
+    results = retrieve_docs(store, "문서 42", top_k=5)
+    expected = retrieve_docs(reference, "문서 42", top_k=5)
+
+    assert results[0][0].metadata["doc_id"] == "doc_42"
+    assert [doc.metadata["doc_id"] for doc, _ in results] == [doc.metadata["doc_id"] for doc, _ in expected]
+    np.testing.assert_allclose([s for _, s in results], [s for _, s in expected], atol=1e-4)
+
+
+def test_ivfpq_small_corpus_builds_and_finds_self(tmp_path, corpus):
+    """[IVF-PQ] 문서 수가 적어도 nlist / nbits를 줄여서 생성되고 자기 자신을 상위로 찾음"""
+    documents, embeddings = corpus
+    create_faiss_db(documents, embeddings, str(tmp_path), index_type="ivfpq")
+
+    store = load_faiss_db(embeddings, str(tmp_path))
+
+    assert isinstance(store.index, faiss.IndexIVFPQ)
+    doc_ids = [doc.metadata["doc_id"] for doc, _ in store.similarity_search_with_score("문서 7", k=10)]
+    assert "doc_7" in doc_ids
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivfpq"])
+def test_document_vectors_reconstructs_stored_rows(tmp_path, corpus, index_type):
+    documents, embeddings = corpus
+    reference = create_numpy_store(documents, embeddings, str(tmp_path / "numpy"))
+    create_faiss_db(documents, embeddings, str(tmp_path / "faiss"), index_type=index_type)
+
+    store = load_faiss_db(embeddings, str(tmp_path / "faiss"))
+    vectors = store.document_vectors(["doc_3", "doc_1"])
+
+    assert vectors.shape == (2, 64)
+    if index_type != "ivfpq":
+        np.testing.assert_allclose(vectors, reference.document_vectors(["doc_3", "doc_1"]), atol=1e-5)
+    assert store.document_vectors(["doc_3", "unknown"]) is None
+
+
+def test_unknown_index_type_raises(tmp_path, corpus):
+    documents, embeddings = corpus
+    with pytest.raises(ValueError):
+        create_faiss_db(documents, embeddings, str(tmp_path), index_type="lsh")
+
+
+def test_mismatched_docstore_raises():
+    index = faiss.IndexFlatL2(4)
+    index.add(np.zeros((2, 4), dtype=np.float32))
+    with pytest.raises(ValueError):
+        FaissVectorStore(index, [Document(page_content="x")], embeddings=None)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivfpq"])
+def test_metadata_filter_restricts_search(tmp_path, index_type):
+    """[메타데이터 필터] selector로 해당 장 문서만 검색 (근사 인덱스도 검색 파라미터 유지)"""
+    documents = [
+        Document(page_content=f"문서 {i}", metadata={"doc_id": f"doc_{i}", "chapter_major": str(i % 3)})
+        for i in range(300)
+    ]
+    embeddings = _RandomEmbeddings()
+    store = create_faiss_db(documents, embeddings, str(tmp_path), index_type=index_type)
+
+    results = store.similarity_search_with_score("문서 42", k=5, filter={"chapter_major": {"$eq": "1"}})
+
+    assert results
+    assert {doc.metadata["chapter_major"] for doc, _ in results} == {"1"}
+    assert store.similarity_search_with_score("문서 42", k=5, filter={"chapter_major": {"$eq": "9"}}) == []
@@ -0,0 +1,85 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from vectorstore.lexical_index import BM25Index, tokenize
+from vectorstore.retriever import retrieve_docs, reciprocal_rank_fusion
+
+
+def _doc(doc_id, text):
+    return Document(page_content=text, metadata={"doc_id": doc_id})
+
+
+@pytest.fixture
+def documents():
+    return [
+        _doc("d0", "물품 반납 절차와 반납 승인 방법"),
+        _doc("d1", "G2B목록번호로 물품을 조회하는 방법"),
+        _doc("d2", "불용 신청 후 정리일자 확인"),
+        _doc("d3", "물품 취득 등록 절차"),
+    ]
+
+
+def test_tokenize_korean_bigrams_and_ascii_words():
+    assert tokenize("G2B목록번호 조회!") == ["g2b", "목록", "록번", "번호", "조회"]
+    assert tokenize("불 용") == ["불", "용"]
+
+
+def test_bm25_ranks_exact_terms(documents):
+    index = BM25Index.build(documents)
+
+    assert [doc.metadata["doc_id"] for doc, _ in index.search("G2B목록번호", k=3)] == ["d1"]
+    assert index.search("정리일자", k=3)[0][0].metadata["doc_id"] == "d2"
+    assert index.search("없는단어xyz", k=3) == []
+
+    ranked = index.search("반납 절차", k=2)
+    assert [doc.metadata["doc_id"] for doc, _ in ranked] == ["d0", "d3"]
+    assert ranked[0][1] > ranked[1][1]
+
+
+def test_bm25_save_load_roundtrip(tmp_path, documents):
+    index = BM25Index.build(documents)
+    path = str(tmp_path / "bm25.json")
+    index.save(path)
+
+    loaded = BM25Index.load(path)
+
+    for query in ["반납 절차", "G2B목록번호", "불용"]:
+        expected = [(doc.metadata["doc_id"], pytest.approx(score)) for doc, score in index.search(query, k=4)]
+        assert [(doc.metadata["doc_id"], score) for doc, score in loaded.search(query, k=4)] == expected
+
+
+def test_reciprocal_rank_fusion_prefers_docs_in_both_lists(documents):
+    d0, d1, d2, _ = documents
+    fused = reciprocal_rank_fusion([[d0, d1], [d2, d1]], k=60)
+
+    assert [doc.metadata["doc_id"] for doc, _ in fused] == ["d1", "d0", "d2"]
+    assert fused[0][1] == pytest.approx(2 / 62)
+
+
+@patch("vectorstore.retriever.USE_HYBRID_SEARCH", True)
+@patch("vectorstore.retriever.get_lexical_index")
+def test_retrieve_docs_hybrid_returns_pseudo_distances(mock_get_index, documents):
+    """[Hybrid] dense에 없던 정확 매칭 문서가 병합되고, score는 낮을수록 상위인 0~1 값"""
+    mock_get_index.return_value = BM25Index.build(documents)
+    vectordb = MagicMock()
+    vectordb.similarity_search_with_score.return_value = [(documents[0], 0.4), (documents[3], 0.6)]
+
+    results = retrieve_docs(vectordb, "G2B목록번호 반납", top_k=3)
+
+    doc_ids = [doc.metadata["doc_id"] for doc, _ in results]
+    assert doc_ids[0] == "d0"          # dense 1위 + lexical 매칭
+    assert "d1" in doc_ids             # lexical로만 찾은 문서
+    scores = [score for _, score in results]
+    assert scores == sorted(scores) and all(0 <= score < 1 for score in scores)
+
+
+@patch("vectorstore.retriever.USE_HYBRID_SEARCH", True)
+@patch("vectorstore.retriever.get_lexical_index", return_value=None)
+def test_retrieve_docs_without_index_falls_back_to_dense(mock_get_index, documents):
+    vectordb = MagicMock()
+    dense = [(documents[0], 0.4)]
+    vectordb.similarity_search_with_score.return_value = dense
+
+    assert retrieve_docs(vectordb, "반납", top_k=3) == dense
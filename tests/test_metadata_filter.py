@@ -0,0 +1,137 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.documents import Document
+
+from vectorstore.lexical_index import BM25Index
+from vectorstore.metadata_filter import (
+    build_where,
+    chapter_major,
+    infer_metadata_filter,
+    match_where,
+    matching_rows,
+    normalize_metadata_filter,
+)
+from vectorstore.numpy_store import create_numpy_store
+from vectorstore.retriever import retrieve_docs
+
+
+class _FakeEmbeddings:
+    """텍스트별로 고정된 벡터를 돌려주는 임베딩 Mock"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def embed_documents(self, texts):
+        return [self.table[text] for text in texts]
+
+    def embed_query(self, text):
+        return self.table[text]
+
+
+@pytest.fixture
+def corpus():
+    documents = [
+        Document(page_content="불용 승인 절차", metadata={"doc_id": "d0", "chapter_major": "4", "category": "물품 불용 관리"}),
+        Document(page_content="반납 승인 절차", metadata={"doc_id": "d1", "chapter_major": "3", "category": "물품 반납 관리"}),
+        Document(page_content="반납 목록 조회", metadata={"doc_id": "d2", "chapter_major": "3", "category": "물품 반납 관리"}),
+        Document(page_content="처분 승인 절차", metadata={"doc_id": "d3", "chapter_major": "5", "category": "물품 처분 관리"}),
+    ]
+    embeddings = _FakeEmbeddings({
+        "불용 승인 절차": [1.0, 0.0, 0.0],
+        "반납 승인 절차": [0.6, 0.8, 0.0],
+        "반납 목록 조회": [0.0, 0.6, 0.8],
+        "처분 승인 절차": [0.9, 0.1, 0.0],
+        "반납 승인": [1.0, 0.1, 0.0],
+    })
+    return documents, embeddings
+
+
+def test_chapter_major_and_normalize():
+    assert chapter_major("4.3.1") == "4"
+    assert chapter_major(None) == ""
+    assert normalize_metadata_filter({"chapter": "3.2"}) == {"chapter": "3"}
+    assert normalize_metadata_filter({"chapter": "반납"}) is None
+    assert normalize_metadata_filter("3") is None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("물품 반납 승인요청 절차", {"chapter": "3"}),
+    ("보유 현황 조회 방법", {"chapter": "6"}),          # 공백 차이 무시
+    ("반납과 불용의 차이", None),                      # 여러 장에 걸친 질문
+    ("안녕하세요", None),
+])
+def test_infer_metadata_filter(query, expected):
+    assert infer_metadata_filter(query) == expected
+
+
+def test_build_where_and_match():
+    assert build_where(None) is None
+    assert build_where({"chapter": "3"}) == {"chapter_major": {"$eq": "3"}}
+
+    where = build_where({"chapter": "3", "category": "물품 반납 관리"})
+    assert where == {"$and": [
+        {"chapter_major": {"$eq": "3"}},
+        {"category": {"$eq": "물품 반납 관리"}},
+    ]}
+    assert match_where({"chapter_major": "3", "category": "물품 반납 관리"}, where)
+    assert not match_where({"chapter_major": "4", "category": "물품 반납 관리"}, where)
+    assert match_where({"chapter_major": "5"}, {"chapter_major": {"$in": ["3", "5"]}})
+
+
+def test_matching_rows_uses_cache(corpus):
+    documents, _ = corpus
+    cache = {}
+    where = {"chapter_major": {"$eq": "3"}}
+
+    rows = matching_rows(documents, where, cache)
+
+    assert rows.tolist() == [1, 2]
+    assert matching_rows([], where, cache) is rows   # 같은 where 절은 재계산하지 않음
+
+
+def test_numpy_store_searches_only_filtered_rows(tmp_path, corpus):
+    documents, embeddings = corpus
+    store = create_numpy_store(documents, embeddings, str(tmp_path))
+
+    results = store.similarity_search_with_score("반납 승인", k=4, filter={"chapter_major": {"$eq": "3"}})
+
+    assert [doc.metadata["doc_id"] for doc, _ in results] == ["d1", "d2"]
+    assert results[0][1] < results[1][1]
+
+
+def test_bm25_search_respects_where(corpus):
+    documents, _ = corpus
+    index = BM25Index.build(documents)
+
+    results = index.search("승인 절차", k=4, where={"chapter_major": {"$eq": "3"}})
+
+    assert [doc.metadata["doc_id"] for doc, _ in results] == ["d1"]
+
+
+@patch("vectorstore.retriever.METADATA_FILTER_MIN_RESULTS", 2)
+def test_retrieve_docs_pushes_down_filter(tmp_path, corpus):
+    documents, embeddings = corpus
+    store = create_numpy_store(documents, embeddings, str(tmp_path))
+
+    results = retrieve_docs(store, "반납 승인", top_k=3, metadata_filter={"chapter": "3"})
+
+    assert {doc.metadata["chapter_major"] for doc, _ in results} == {"3"}
+
+
+@patch("vectorstore.retriever.METADATA_FILTER_MIN_RESULTS", 2)
+def test_retrieve_docs_falls_back_when_filter_too_narrow(corpus):
+    """필터 결과가 부족하면 같은 질의 임베딩으로 전체 검색 재시도 (임베딩 1회)"""
+    documents, _ = corpus
+    vectordb = MagicMock()
+    vectordb.embeddings.embed_query.return_value = [1.0, 0.0, 0.0]
+    everything = [(documents[0], 0.1), (documents[3], 0.2)]
+    vectordb.similarity_search_by_vector_with_relevance_scores.side_effect = [[(documents[0], 0.1)], everything]
+
+    results = retrieve_docs(vectordb, "불용", top_k=2, metadata_filter={"chapter": "4"})
+
+    assert results == everything
+    vectordb.embeddings.embed_query.assert_called_once()
+    first_call, second_call = vectordb.similarity_search_by_vector_with_relevance_scores.call_args_list
+    assert first_call.kwargs["filter"] == {"chapter_major": {"$eq": "4"}}
+    assert "filter" not in second_call.kwargs
@@ -0,0 +1,62 @@
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from rag.metrics import Histogram, MetricsRegistry, RequestTrace, get_metrics_registry
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram([10, 100, 1000])
+    for value in [5, 50, 60, 500, 5000]:
+        histogram.observe(value)
+
+    data = histogram.to_dict()
+    assert data["count"] == 5
+    assert data["buckets"] == {"10": 1, "100": 2, "1000": 1, "+Inf": 1}
+    assert data["p50"] == 100
+    assert data["p99"] == 5000   # +Inf 구간은 관측 최대값으로 표시
+    assert data["min"] == 5 and data["max"] == 5000
+
+
+def test_registry_counters_and_reset():
+    registry = MetricsRegistry()
+    registry.increment("rag.route.rag")
+    registry.increment("rag.route.rag", 2)
+    registry.observe("rag.stage.router.latency_ms", 120)
+
+    assert registry.counter("rag.route.rag") == 3
+    assert registry.snapshot()["histograms"]["rag.stage.router.latency_ms"]["count"] == 1
+
+    registry.reset()
+    assert registry.snapshot() == {"histograms": {}, "counters": {}}
+
+
+def test_request_trace_records_stages_tokens_and_registry():
+    get_metrics_registry().reset()
+    trace = RequestTrace()
+
+    with trace.stage("router"):
+        pass
+    with trace.stage("router"):   # 같은 단계 반복 시 합산
+        pass
+    trace.set_count("retrieval", "candidates", 10)
+
+    # LLM callback으로 들어오는 토큰 사용량 누적
+    callback = trace.llm_config("router")["callbacks"][0]
+    message = AIMessage(content="ok", usage_metadata={"input_tokens": 120, "output_tokens": 8, "total_tokens": 128})
+    callback.on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+    callback.on_llm_end(LLMResult(generations=[[]], llm_output={"token_usage": {"prompt_tokens": 30, "completion_tokens": 2}}))
+
+    trace.finish("rag")
+    timings = trace.to_dict()
+
+    assert timings["route"] == "rag"
+    assert timings["total_ms"] >= timings["stages"]["router"]["ms"] >= 0
+    assert timings["stages"]["router"]["input_tokens"] == 150
+    assert timings["stages"]["router"]["output_tokens"] == 10
+    assert timings["stages"]["retrieval"] == {"candidates": 10}
+
+    registry = get_metrics_registry()
+    assert registry.counter("rag.route.rag") == 1
+    assert registry.histogram("rag.stage.router.latency_ms").count == 1
+    assert registry.histogram("rag.stage.router.tokens").total == 160
+    assert registry.histogram("rag.request.latency_ms").count == 1
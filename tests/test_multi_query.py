@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock, patch
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from rag.chain import _split_refined_queries, run_rag_chain
+from vectorstore.retriever import retrieve_docs_multi
+
+
+def _docs(*doc_ids):
+    return [Document(page_content=doc_id, metadata={"doc_id": doc_id}) for doc_id in doc_ids]
+
+
+@patch("rag.chain.USE_MULTI_QUERY", True)
+@patch("rag.chain.MULTI_QUERY_COUNT", 3)
+def test_split_refined_queries_strips_numbering_and_adds_raw_query():
+    output = "1. 물품 불용 신청 절차\n2) 불용 승인요청 방법\n- 물품 불용 신청 절차\n\n4. 초과 변형"
+
+    refined_query, search_queries = _split_refined_queries(output, "못 쓰는 물건 어떻게 해?")
+
+    assert refined_query == "물품 불용 신청 절차"
+    assert search_queries == ["물품 불용 신청 절차", "불용 승인요청 방법", "못 쓰는 물건 어떻게 해?"]
+
+
+def test_split_refined_queries_disabled_keeps_single_query():
+    assert _split_refined_queries("불용 절차", "불용?") == ("불용 절차", ["불용 절차"])
+
+
+def test_retrieve_docs_multi_embeds_once_and_fuses():
+    """[Multi-query] 검색어 전체를 embed_documents 1회로 임베딩하고 RRF로 병합"""
+    d0, d1, d2 = _docs("d0", "d1", "d2")
+    vectordb = MagicMock()
+    vectordb.embeddings.embed_documents.return_value = [[1.0], [2.0], [3.0]]
+    by_vector = {1.0: [(d0, 0.1), (d1, 0.2)], 2.0: [(d1, 0.1), (d2, 0.3)], 3.0: [(d1, 0.2)]}
+    vectordb.similarity_search_by_vector_with_relevance_scores.side_effect = (
+        lambda embedding, k: by_vector[embedding[0]]
+    )
+
+    results = retrieve_docs_multi(vectordb, ["a", "b", "c"], top_k=3)
+
+    vectordb.embeddings.embed_documents.assert_called_once_with(["a", "b", "c"])
+    vectordb.embeddings.embed_query.assert_not_called()
+    assert [doc.metadata["doc_id"] for doc, _ in results] == ["d1", "d0", "d2"]
+    scores = [score for _, score in results]
+    assert scores == sorted(scores) and all(0 <= score < 1 for score in scores)
+
+
+@patch("rag.chain.USE_MULTI_QUERY", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs_multi")
+@patch("rag.chain.PromptTemplate")
+def test_chain_uses_variants_for_retrieval_and_first_for_rerank(mock_prompt_template, mock_retrieve_multi, mock_reranker_cls):
+    """[Multi-query] 검색은 변형 + 원본 질문 전체, Re-ranking은 대표 검색어(첫 줄) 기준"""
+    def _template_chain(value):
+        template, chain = MagicMock(), MagicMock()
+        template.__or__.return_value.__or__.return_value = chain
+        chain.invoke.return_value = value
+        return template
+
+    mock_prompt_template.from_template.side_effect = [
+        _template_chain("NEED_RAG"),
+        _template_chain("물품 반납 절차\n반납 승인요청"),
+    ]
+
+    base_llm, bound_llm = MagicMock(), MagicMock()
+    base_llm.bind_tools.return_value = bound_llm
+    bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    base_llm.invoke.return_value = AIMessage(content="답변")
+
+    doc = _docs("doc_3")[0]
+    mock_retrieve_multi.return_value = [(doc, 0.1)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    result = run_rag_chain(base_llm, MagicMock(), "반납 어떻게 해?")
+
+    assert result["answer"] == "답변"
+    assert mock_retrieve_multi.call_args.kwargs["queries"] == ["물품 반납 절차", "반납 승인요청", "반납 어떻게 해?"]
+    assert mock_reranker_cls.return_value.rerank.call_args.kwargs["query"] == "물품 반납 절차"
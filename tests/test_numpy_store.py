@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from vectorstore.numpy_store import NumpyVectorStore, create_numpy_store, load_numpy_store
+from vectorstore.retriever import retrieve_docs, retrieve_docs_by_vector
+
+
+class _FakeEmbeddings:
+    """텍스트별로 고정된 벡터를 돌려주는 임베딩 Mock"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def embed_documents(self, texts):
+        return [self.table[text] for text in texts]
+
+    def embed_query(self, text):
+        return self.table[text]
+
+
+@pytest.fixture
+def corpus():
+    documents = [
+        Document(page_content="불용 절차", metadata={"doc_id": "d0", "chapter": "4.1"}),
+        Document(page_content="반납 절차", metadata={"doc_id": "d1", "chapter": "3.2"}),
+        Document(page_content="취득 등록", metadata={"doc_id": "d2", "chapter": "2.1"}),
+    ]
+    embeddings = _FakeEmbeddings({
+        "불용 절차": [3.0, 0.0, 0.0],      # 정규화 전 벡터 (저장 시 정규화)
+        "반납 절차": [0.6, 0.8, 0.0],
+        "취득 등록": [0.0, 0.0, 2.0],
+        "불용 어떻게 해?": [1.0, 0.1, 0.0],
+    })
+    return documents, embeddings
+
+
+def test_create_and_load_memmap_roundtrip(tmp_path, corpus):
+    documents, embeddings = corpus
+    create_numpy_store(documents, embeddings, str(tmp_path))
+
+    store = load_numpy_store(embeddings, str(tmp_path))
+
+    assert isinstance(store.vectors, np.memmap)
+    assert store.vectors.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(store.vectors, axis=1), 1.0, rtol=1e-6)
+    assert [doc.metadata for doc in store.documents] == [doc.metadata for doc in documents]
+
+
+def test_retrieve_docs_returns_squared_l2_distances(tmp_path, corpus):
+    """retrieve_docs 인터페이스 호환: (Document, 거리) 오름차순, 거리 = 2 - 2cos"""
+    documents, embeddings = corpus
+    store = create_numpy_store(documents, embeddings, str(tmp_path))
+
+    results = retrieve_docs(store, "불용 어떻게 해?", top_k=2)
+
+    assert [doc.metadata["doc_id"] for doc, _ in results] == ["d0", "d1"]
+    query = np.array([1.0, 0.1, 0.0]) / np.linalg.norm([1.0, 0.1, 0.0])
+    assert results[0][1] == pytest.approx(2 - 2 * query[0], abs=1e-6)
+    assert results[0][1] < results[1][1]
+
+
+def test_retrieve_by_vector_and_k_larger_than_corpus(tmp_path, corpus):
+    documents, embeddings = corpus
+    store = create_numpy_store(documents, embeddings, str(tmp_path))
+
+    results = retrieve_docs_by_vector(store, [0.0, 0.0, 1.0], top_k=10)
+
+    assert [doc.metadata["doc_id"] for doc, _ in results] == ["d2", "d0", "d1"]
+    assert results[0][1] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_document_vectors_by_doc_id(tmp_path, corpus):
+    documents, embeddings = corpus
+    store = create_numpy_store(documents, embeddings, str(tmp_path))
+
+    vectors = store.document_vectors(["d2", "d0"])
+
+    np.testing.assert_allclose(vectors, [[0.0, 0.0, 1.0], [1.0, 0.0, 0.0]], atol=1e-6)
+    assert store.document_vectors(["d0", "unknown"]) is None
+
+
+def test_mismatched_sidecar_raises():
+    with pytest.raises(ValueError):
+        NumpyVectorStore(np.zeros((2, 3), dtype=np.float32), [Document(page_content="x")], embeddings=None)
+
+
+def _random_corpus(n=500, dimension=64, seed=0):
+    rng = np.random.default_rng(seed)
+    table = {f"문서 {i}": rng.normal(size=dimension).tolist() for i in range(n)}
+    table["질의"] = rng.normal(size=dimension).tolist()
+    documents = [Document(page_content=f"문서 {i}", metadata={"doc_id": f"doc_{i}"}) for i in range(n)]
+    return documents, _FakeEmbeddings(table)
+
+
+def test_int8_quantized_store_matches_float_results(tmp_path):
+    """[int8] code 행렬로 후보를 좁힌 뒤 float32로 재계산하므로 결과 / 점수가 float32 검색과 동일"""
+    documents, embeddings = _random_corpus()
+    reference = create_numpy_store(documents, embeddings, str(tmp_path / "float"))
+    create_numpy_store(documents, embeddings, str(tmp_path / "int8"), quantization="int8")
+
+    store = load_numpy_store(embeddings, str(tmp_path / "int8"))
+
+    assert store.codes.dtype == np.int8 and isinstance(store.codes, np.memmap)
+    results = retrieve_docs(store, "질의", top_k=10)
+    expected = retrieve_docs(reference, "질의", top_k=10)
+    assert [doc.metadata["doc_id"] for doc, _ in results] == [doc.metadata["doc_id"] for doc, _ in expected]
+    np.testing.assert_allclose([s for _, s in results], [s for _, s in expected], atol=1e-6)
+
+
+def test_rebuild_without_quantization_removes_stale_codes(tmp_path):
+    documents, embeddings = _random_corpus(n=20)
+    create_numpy_store(documents, embeddings, str(tmp_path), quantization="int8")
+    create_numpy_store(documents, embeddings, str(tmp_path), quantization=None)
+
+    assert load_numpy_store(embeddings, str(tmp_path)).codes is None
+
+
+def test_unknown_quantization_raises(tmp_path, corpus):
+    documents, embeddings = corpus
+    with pytest.raises(ValueError):
+        create_numpy_store(documents, embeddings, str(tmp_path), quantization="int4")
@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from sentence_transformers import CrossEncoder
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+from rag.onnx_reranker import load_onnx_cross_encoder, onnx_model_dir
+
+PAIRS = [
+    ("불용 처리 절차", "불용 신청 후 승인되면 처분 단계로 넘어갑니다."),
+    ("반납 방법", "반납 메뉴에서 물품을 선택하고 신청합니다."),
+    ("보유현황 조회", "부서별 보유 물품 수량을 확인할 수 있습니다."),
+    ("취득 등록", "가나다라마바사"),
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_model_dir(tmp_path_factory):
+    """네트워크 없이 만드는 작은 BERT Cross-Encoder (num_labels=1)"""
+    model_dir = tmp_path_factory.mktemp("tiny_cross_encoder")
+    characters = sorted({ch for query, text in PAIRS for ch in query + text if not ch.isspace()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *characters]
+    (model_dir / "vocab.txt").write_text("\n".join(vocab), encoding="utf-8")
+
+    tokenizer = BertTokenizerFast(vocab_file=str(model_dir / "vocab.txt"))
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, max_position_embeddings=128, num_labels=1
+    )
+    BertForSequenceClassification(config).eval().save_pretrained(model_dir)
+    tokenizer.save_pretrained(model_dir)
+    return str(model_dir)
+
+
+def test_onnx_scores_match_torch(tiny_model_dir, tmp_path):
+    expected = CrossEncoder(tiny_model_dir, max_length=64).predict(PAIRS, batch_size=2)
+
+    model = load_onnx_cross_encoder(tiny_model_dir, root=str(tmp_path), max_length=64)
+    scores = model.predict(PAIRS, batch_size=3)
+
+    np.testing.assert_allclose(scores, expected, atol=1e-4)
+    assert model.predict([]).shape == (0,)
+
+
+def test_int8_scores_close_to_torch_and_reuse_export(tiny_model_dir, tmp_path):
+    expected = CrossEncoder(tiny_model_dir, max_length=64).predict(PAIRS)
+
+    model = load_onnx_cross_encoder(tiny_model_dir, quantize=True, root=str(tmp_path), max_length=64)
+
+    np.testing.assert_allclose(model.predict(PAIRS), expected, atol=0.02)
+    output_dir = onnx_model_dir(tiny_model_dir, str(tmp_path))
+    # 두 번째 로딩은 저장된 변환 결과 재사용
+    load_onnx_cross_encoder(tiny_model_dir, quantize=True, root=str(tmp_path), max_length=64)
+    assert sorted(name for name in os.listdir(output_dir) if name.endswith(".onnx")) == [
+        "model.onnx", "model_int8.onnx"
+    ]
+    # 가중치는 external data 파일로 함께 옮겨지고 임시 폴더는 남지 않음
+    assert {"model.onnx.data", "model_int8.onnx.data"} <= set(os.listdir(output_dir))
+    assert ".tmp" not in os.listdir(output_dir)
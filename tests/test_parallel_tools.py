@@ -0,0 +1,65 @@
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from langchain_core.messages import AIMessage
+
+from rag.chain import run_rag_chain, arun_rag_chain
+
+
+def _barrier_tool_map(mock_tool_map, barrier, fail_on=None):
+    """모든 도구 호출이 동시에 진입해야 통과하는 Barrier 기반 도구 Mock"""
+    def _invoke(args):
+        barrier.wait()
+        if args["asset_name"] == fail_on:
+            raise RuntimeError("API Timeout")
+        return json.dumps({"asset": args["asset_name"]}, ensure_ascii=False)
+
+    tool_mock = MagicMock(name="search_tool")
+    tool_mock.invoke.side_effect = _invoke
+    mock_tool_map.__contains__.side_effect = lambda name: True
+    mock_tool_map.__getitem__.side_effect = lambda name: tool_mock
+    return tool_mock
+
+
+_MULTI_TOOL_CALLS = [
+    {"name": "get_item_detail_info", "args": {"asset_name": "A"}, "id": "call_1"},
+    {"name": "get_item_detail_info", "args": {"asset_name": "B"}, "id": "call_2"},
+    {"name": "get_item_detail_info", "args": {"asset_name": "C"}, "id": "call_3"},
+]
+
+
+@patch("rag.chain.TOOL_MAP")
+def test_parallel_tool_calls_keep_order_and_isolate_errors(mock_tool_map, mock_dependencies):
+    """[Parallel] 도구 3건이 동시에 실행되고, ToolMessage 순서/개별 오류 처리는 유지"""
+    ctx = mock_dependencies
+    # 순차 실행이면 Barrier가 timeout으로 깨져 모든 호출이 오류가 됨
+    _barrier_tool_map(mock_tool_map, threading.Barrier(3, timeout=5), fail_on="B")
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=_MULTI_TOOL_CALLS)
+    ctx.base_llm.invoke.return_value = AIMessage(content="A, C 조회 완료 / B 실패")
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "A, B, C 조회")
+
+    assert result["answer"] == "A, C 조회 완료 / B 실패"
+    tool_messages = ctx.base_llm.invoke.call_args.args[0][3:]
+    assert [m.tool_call_id for m in tool_messages] == ["call_1", "call_2", "call_3"]
+    assert json.loads(tool_messages[0].content) == {"asset": "A"}
+    assert tool_messages[1].content == "Error: API Timeout"
+    assert json.loads(tool_messages[2].content) == {"asset": "C"}
+
+
+@patch("rag.chain.TOOL_MAP")
+def test_async_parallel_tool_calls(mock_tool_map, mock_dependencies):
+    """[Parallel/Async] 비동기 체인에서도 도구가 동시에 실행되고 순서 유지"""
+    ctx = mock_dependencies
+    _barrier_tool_map(mock_tool_map, threading.Barrier(3, timeout=5))
+
+    ctx.bound_llm.ainvoke = AsyncMock(return_value=AIMessage(content="", tool_calls=_MULTI_TOOL_CALLS))
+    ctx.base_llm.ainvoke = AsyncMock(return_value=AIMessage(content="조회 완료"))
+
+    asyncio.run(arun_rag_chain(ctx.base_llm, ctx.vectordb, "A, B, C 조회"))
+
+    tool_messages = ctx.base_llm.ainvoke.call_args.args[0][3:]
+    assert [json.loads(m.content)["asset"] for m in tool_messages] == ["A", "B", "C"]
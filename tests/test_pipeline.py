@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+from langchain_core.messages import AIMessage
+
+from chain_mocks import mock_template_chain
+from rag.chain import run_rag_chain, RagPipeline, get_pipeline
+
+
+@patch("rag.chain.PromptTemplate")
+def test_pipeline_prepares_once_across_requests(mock_prompt_template, mock_dependencies):
+    """[Pipeline] 도구 바인딩 / 체인 조립 / Router 시스템 프롬프트는 요청 간 재사용"""
+    ctx = mock_dependencies
+    classifier_template, classifier_chain = mock_template_chain("NO_RAG")
+    refiner_template, _ = mock_template_chain("")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="안녕하세요")
+
+    run_rag_chain(ctx.base_llm, ctx.vectordb, "안녕")
+    run_rag_chain(ctx.base_llm, ctx.vectordb, "반가워")
+
+    ctx.base_llm.bind_tools.assert_called_once()
+    assert mock_prompt_template.from_template.call_count == 2
+    assert classifier_chain.invoke.call_count == 2
+
+    first_system, second_system = [call.args[0][0] for call in ctx.bound_llm.invoke.call_args_list]
+    assert first_system is second_system
+
+
+@patch("rag.chain.PromptTemplate")
+def test_get_pipeline_swaps_new_vectordb(mock_prompt_template, mock_dependencies):
+    """[Pipeline] 다른 vectordb(재로딩 등)는 swap_vectordb로 교체, 다른 llm이 들어올 때만 새 파이프라인 생성"""
+    ctx = mock_dependencies
+    mock_prompt_template.from_template.return_value = mock_template_chain("")[0]
+
+    pipeline = get_pipeline(ctx.base_llm, ctx.vectordb)
+    assert isinstance(pipeline, RagPipeline)
+    assert get_pipeline(ctx.base_llm, ctx.vectordb) is pipeline
+
+    new_vectordb = MagicMock(name="NewVectorDB")
+    with patch.object(RagPipeline, "swap_vectordb", autospec=True, side_effect=RagPipeline.swap_vectordb) as swap:
+        swapped = get_pipeline(ctx.base_llm, new_vectordb)
+    assert swapped is pipeline
+    assert swapped.vectordb is new_vectordb
+    swap.assert_called_once_with(pipeline, new_vectordb)
+
+    # hot reload로 교체된 vectordb로 다시 요청해도 파이프라인을 새로 만들지 않음
+    reloaded_vectordb = MagicMock(name="ReloadedVectorDB")
+    pipeline.swap_vectordb(reloaded_vectordb)
+    assert get_pipeline(ctx.base_llm, reloaded_vectordb) is pipeline
+
+    new_llm = MagicMock(name="NewLLM")
+    rebuilt = get_pipeline(new_llm, reloaded_vectordb)
+    assert rebuilt is not pipeline
+    assert rebuilt.llm is new_llm
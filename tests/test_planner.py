@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from chain_mocks import mock_template_chain
+from rag.chain import run_rag_chain, _parse_planner_output
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"need_rag": true, "search_query": "불용 처리 절차"}', {"need_rag": True, "search_query": "불용 처리 절차"}),
+    ('```json\n{"need_rag": false, "search_query": ""}\n```', {"need_rag": False, "search_query": ""}),
+    ("불용은 이렇게 처리합니다.", None),                 # JSON 아님 -> 다단계 경로
+    ('{"need_rag": "yes", "search_query": "x"}', None),   # 타입 불일치
+])
+def test_parse_planner_output(content, expected):
+    assert _parse_planner_output(content) == expected
+
+
+@patch("rag.chain.USE_METADATA_FILTER", True)
+def test_parse_planner_output_with_chapter():
+    """[Metadata Filter] 유효한 chapter만 필터로 변환"""
+    assert _parse_planner_output('{"need_rag": true, "search_query": "반납 절차", "chapter": "3"}') == {
+        "need_rag": True, "search_query": "반납 절차", "metadata_filter": {"chapter": "3"}
+    }
+    assert "metadata_filter" not in _parse_planner_output('{"need_rag": true, "search_query": "x", "chapter": "반납"}')
+
+
+@patch("rag.chain.USE_PLANNER", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_planner_skips_classifier_and_refiner(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Planner] Router 응답의 plan으로 분류/정제 LLM 호출을 생략"""
+    ctx = mock_dependencies
+
+    classifier_template, classifier_chain = mock_template_chain("NEED_RAG")
+    refiner_template, refiner_chain = mock_template_chain("무시될 검색어")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(
+        content='{"need_rag": true, "search_query": "반납 절차"}', tool_calls=[]
+    )
+    ctx.base_llm.invoke.return_value = AIMessage(content="반납은 이렇게 합니다.")
+
+    doc = Document(page_content="반납 절차 설명", metadata={"doc_id": "doc_2"})
+    mock_retrieve.return_value = [(doc, 0.2)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "반납 어떻게 해?")
+
+    assert result == {"answer": "반납은 이렇게 합니다.", "attribution": [{"doc_id": "doc_2"}]}
+    classifier_chain.invoke.assert_not_called()
+    refiner_chain.invoke.assert_not_called()
+    assert mock_retrieve.call_args.kwargs["query"] == "반납 절차"
+    # Router 시스템 프롬프트에 Planner 지침이 포함되어야 함
+    system_message = ctx.bound_llm.invoke.call_args.args[0][0]
+    assert "[플래너 모드" in system_message.content
+
+
+@patch("rag.chain.USE_METADATA_FILTER", True)
+@patch("rag.chain.USE_PLANNER", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+def test_planner_chapter_is_pushed_down_to_retrieval(mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Metadata Filter] Planner가 출력한 chapter가 검색 필터로 전달됨"""
+    ctx = mock_dependencies
+    ctx.bound_llm.invoke.return_value = AIMessage(
+        content='{"need_rag": true, "search_query": "물품 처리 절차", "chapter": "3"}', tool_calls=[]
+    )
+    ctx.base_llm.invoke.return_value = AIMessage(content="답변")
+
+    doc = Document(page_content="반납 절차 설명", metadata={"doc_id": "doc_2"})
+    mock_retrieve.return_value = [(doc, 0.2)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    run_rag_chain(ctx.base_llm, ctx.vectordb, "반납 어떻게 해?")
+
+    assert mock_retrieve.call_args.kwargs["metadata_filter"] == {"chapter": "3"}
+    system_message = ctx.bound_llm.invoke.call_args.args[0][0]
+    assert '"chapter"' in system_message.content
+
+
+@patch("rag.chain.USE_METADATA_FILTER", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_refined_query_keyword_infers_filter(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Metadata Filter] 다단계 경로에서는 정제된 검색어 키워드로 장을 추정"""
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("물품 불용 승인 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="답변")
+
+    doc = Document(page_content="불용 절차 설명", metadata={"doc_id": "doc_4"})
+    mock_retrieve.return_value = [(doc, 0.2)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    run_rag_chain(ctx.base_llm, ctx.vectordb, "못 쓰는 물건 어떻게 처리해?")
+
+    assert mock_retrieve.call_args.kwargs["metadata_filter"] == {"chapter": "4"}
@@ -0,0 +1,36 @@
+import numpy as np
+
+from vectorstore import quantization
+from vectorstore.quantization import approximate_similarities, dequantize_int8, quantize_int8
+
+
+def test_quantize_roundtrip_error_is_small():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 32)).astype(np.float32)
+
+    codes, scale = quantize_int8(vectors)
+
+    assert codes.dtype == np.int8 and scale.shape == (32,)
+    # 차원별 최대 오차는 scale의 절반 이하
+    assert np.all(np.abs(dequantize_int8(codes, scale) - vectors) <= scale / 2 + 1e-6)
+
+
+def test_approximate_similarities_blockwise(monkeypatch):
+    """블록 단위 계산 결과가 전체 dequantize 후 내적과 같아야 함"""
+    monkeypatch.setattr(quantization, "BLOCK_SIZE", 7)
+    rng = np.random.default_rng(1)
+    codes, scale = quantize_int8(rng.normal(size=(50, 16)).astype(np.float32))
+    query = rng.normal(size=16).astype(np.float32)
+
+    np.testing.assert_allclose(
+        approximate_similarities(codes, scale, query),
+        dequantize_int8(codes, scale) @ query,
+        rtol=1e-5, atol=1e-5
+    )
+
+
+def test_zero_column_does_not_divide_by_zero():
+    codes, scale = quantize_int8(np.array([[0.0, 1.0], [0.0, -0.5]], dtype=np.float32))
+
+    assert np.all(codes[:, 0] == 0)
+    assert codes[0, 1] == 127
@@ -0,0 +1,86 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from rag.metrics import get_metrics_registry
+from rag.rerank_cache import RerankScoreCache, model_version_hash
+from rag.reranker import CrossEncoderReranker
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry():
+    get_metrics_registry().reset()
+    yield
+    get_metrics_registry().reset()
+
+
+def _doc(doc_id, content=None):
+    return Document(page_content=content or f"본문 {doc_id}", metadata={"doc_id": doc_id})
+
+
+def test_key_collapses_whitespace_and_tracks_content_and_model():
+    doc = _doc("d1")
+    key = RerankScoreCache.make_key("불용 처리 절차", doc, "m1")
+
+    assert RerankScoreCache.make_key("  불용 처리\n  절차 ", doc, "m1") == key
+    # 공백 외의 차이(문장부호, 대소문자)는 점수가 달라질 수 있으므로 별도 key
+    assert RerankScoreCache.make_key("불용 처리 절차?", doc, "m1") != key
+    assert RerankScoreCache.make_key("G2B 조회", doc, "m1") != RerankScoreCache.make_key("g2b 조회", doc, "m1")
+    assert RerankScoreCache.make_key("불용 처리 절차", _doc("d1", "바뀐 본문"), "m1") != key
+    assert RerankScoreCache.make_key("불용 처리 절차", doc, "m2") != key
+    assert RerankScoreCache.make_key("불용 처리 절차", Document(page_content="doc_id 없음"), "m1") is None
+    assert model_version_hash("model", 512) != model_version_hash("model", 256)
+
+
+def test_lru_bound_and_hit_metrics():
+    cache = RerankScoreCache(max_size=2)
+    cache.set_many(["a", "b", None], [0.1, 0.2, 0.3])
+    cache.set_many(["c"], [0.4])
+
+    assert len(cache) == 2
+    assert cache.get_many(["a", "b", "c", None]) == [None, pytest.approx(0.2), pytest.approx(0.4), None]
+    assert cache.hit_rate() == 0.5
+
+    registry = get_metrics_registry()
+    assert registry.counter("rag.rerank_cache.hits") == 2
+    assert registry.counter("rag.rerank_cache.misses") == 2
+
+
+@patch("rag.reranker.get_rerank_cache")
+@patch("rag.reranker.USE_RERANK_CACHE", True)
+@patch("rag.reranker.get_reranker")
+def test_reranker_predicts_only_unseen_pairs(mock_get_reranker, mock_get_cache):
+    model = MagicMock(name="cross_encoder")
+    model.predict.side_effect = lambda pairs, **kwargs: [float(len(text)) for _, text in pairs]
+    mock_get_reranker.return_value = model
+    mock_get_cache.return_value = RerankScoreCache(max_size=100)
+
+    reranker = CrossEncoderReranker("dummy-model")
+    first = [(_doc("d1", "aa"), 0.1), (_doc("d2", "bbbb"), 0.2)]
+    reranker.rerank("불용 절차", first, top_n=2)
+
+    second = first + [(_doc("d3", "ccc"), 0.3)]
+    results = reranker.rerank("불용  절차 ", second, top_n=3)
+
+    assert model.predict.call_count == 2
+    assert model.predict.call_args.args[0] == [("불용  절차 ", "ccc")]
+    assert [doc.metadata["doc_id"] for doc in results] == ["d2", "d3", "d1"]
+    assert get_metrics_registry().counter("rag.rerank_cache.hits") == 2
+
+
+@patch("rag.reranker.get_rerank_cache")
+@patch("rag.reranker.USE_RERANK_CACHE", True)
+@patch("rag.reranker.get_reranker")
+def test_rerank_batch_skips_predict_when_all_cached(mock_get_reranker, mock_get_cache):
+    model = MagicMock(name="cross_encoder")
+    model.predict.side_effect = lambda pairs, **kwargs: [0.5] * len(pairs)
+    mock_get_reranker.return_value = model
+    mock_get_cache.return_value = RerankScoreCache(max_size=100)
+
+    reranker = CrossEncoderReranker("dummy-model")
+    batch = [[(_doc("d1"), 0.1)], [(_doc("d2"), 0.1)]]
+    reranker.rerank_batch(["q1", "q2"], batch, top_n=1)
+    reranker.rerank_batch(["q1", "q2"], batch, top_n=1)
+
+    model.predict.assert_called_once()
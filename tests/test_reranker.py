@@ -0,0 +1,79 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from rag.reranker import CrossEncoderReranker, get_reranker
+
+
+def _docs(*names):
+    return [(Document(page_content=name, metadata={"doc_id": name}), 0.1 * i) for i, name in enumerate(names)]
+
+
+@patch("rag.reranker.get_reranker")
+def test_rerank_batch_single_predict_per_query_order(mock_get_reranker):
+    """[Batch] 모든 (query, doc) 쌍을 predict 1회로 채점하고 질의별로 분리해 정렬"""
+    model = MagicMock(name="cross_encoder")
+    model.predict.return_value = [0.1, 0.9, 0.5, 0.7, 0.2]
+    mock_get_reranker.return_value = model
+
+    reranker = CrossEncoderReranker("dummy-model")
+    results = reranker.rerank_batch(
+        queries=["q1", "q2"],
+        docs_with_scores_list=[_docs("a", "b", "c"), _docs("d", "e")],
+        top_n=2
+    )
+
+    model.predict.assert_called_once()
+    pairs = model.predict.call_args.args[0]
+    assert pairs == [("q1", "a"), ("q1", "b"), ("q1", "c"), ("q2", "d"), ("q2", "e")]
+    assert [[d.page_content for d in docs] for docs in results] == [["b", "c"], ["d", "e"]]
+
+
+@patch("rag.reranker.get_reranker")
+def test_rerank_batch_falls_back_to_retrieval_order(mock_get_reranker):
+    """[Batch] predict 실패 시 질의별 검색 순서 상위 top_n 반환"""
+    model = MagicMock(name="cross_encoder")
+    model.predict.side_effect = RuntimeError("OOM")
+    mock_get_reranker.return_value = model
+
+    reranker = CrossEncoderReranker("dummy-model")
+    results = reranker.rerank_batch(["q1", "q2"], [_docs("a", "b", "c"), []], top_n=2)
+
+    assert [[d.page_content for d in docs] for docs in results] == [["a", "b"], []]
+
+
+@patch("rag.reranker.get_reranker")
+def test_length_bucketing_sorts_pairs_and_restores_order(mock_get_reranker):
+    """[Bucketing] 길이순으로 정렬해 채점하고, 점수는 원래 후보 순서로 복원"""
+    model = MagicMock(name="cross_encoder")
+    # 정렬된 입력(짧은 순서)에 대해 길이에 비례한 점수 반환
+    model.predict.side_effect = lambda pairs, **kwargs: [float(len(text)) for _, text in pairs]
+    mock_get_reranker.return_value = model
+
+    reranker = CrossEncoderReranker("dummy-model", batch_size=4, length_bucketing=True)
+    results = reranker.rerank("q", _docs("ccc", "a", "dddd", "bb"), top_n=4)
+
+    pairs = model.predict.call_args.args[0]
+    assert [text for _, text in pairs] == ["a", "bb", "ccc", "dddd"]
+    assert model.predict.call_args.kwargs["batch_size"] == 4
+    # 점수 = 문서 길이이므로 길이 내림차순이 되어야 원래 순서 복원이 맞음
+    assert [d.page_content for d in results] == ["dddd", "ccc", "bb", "a"]
+
+
+@patch("rag.reranker.get_reranker")
+def test_bucketing_disabled_keeps_candidate_order(mock_get_reranker):
+    model = MagicMock(name="cross_encoder")
+    model.predict.return_value = [0.2, 0.9, 0.1]
+    mock_get_reranker.return_value = model
+
+    reranker = CrossEncoderReranker("dummy-model", batch_size=8, length_bucketing=False)
+    results = reranker.rerank("q", _docs("ccc", "a", "bb"), top_n=2)
+
+    assert model.predict.call_args.args[0] == [("q", "ccc"), ("q", "a"), ("q", "bb")]
+    assert [d.page_content for d in results] == ["a", "ccc"]
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        get_reranker("dummy-model", backend="tensorrt")
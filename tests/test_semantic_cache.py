@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import patch
+
+from rag.semantic_cache import SemanticAnswerCache
+
+# --------------------------------------------------------------------------
+# SemanticAnswerCache 단위 테스트
+# --------------------------------------------------------------------------
+
+FINGERPRINT = ("collection-1", 0.0, 0.0)
+
+
+@pytest.fixture
+def cache():
+    return SemanticAnswerCache(threshold=0.9, ttl_seconds=60, max_size=2)
+
+
+def test_hit_above_threshold(cache):
+    """[Hit] 유사도가 threshold 이상이면 저장된 답변/attribution 반환"""
+    result = {"answer": "불용 절차 답변", "attribution": [{"doc_id": "doc_1"}]}
+    cache.store([1.0, 0.0, 0.0], result, FINGERPRINT)
+
+    assert cache.lookup([0.99, 0.05, 0.0], FINGERPRINT) == result
+    assert cache.hits == 1
+
+
+def test_miss_below_threshold(cache):
+    """[Miss] 다른 방향의 질의 벡터는 적중하지 않음"""
+    cache.store([1.0, 0.0, 0.0], {"answer": "A", "attribution": []}, FINGERPRINT)
+
+    assert cache.lookup([0.0, 1.0, 0.0], FINGERPRINT) is None
+    assert cache.misses == 1
+
+
+def test_returned_result_is_a_copy(cache):
+    """[Isolation] 반환값을 수정해도 캐시 원본은 유지"""
+    cache.store([1.0, 0.0, 0.0], {"answer": "A", "attribution": [{"doc_id": "doc_1"}]}, FINGERPRINT)
+
+    cache.lookup([1.0, 0.0, 0.0], FINGERPRINT)["attribution"].clear()
+
+    assert cache.lookup([1.0, 0.0, 0.0], FINGERPRINT)["attribution"] == [{"doc_id": "doc_1"}]
+
+
+def test_lru_eviction(cache):
+    """[LRU] 최대 개수 초과 시 가장 오래 사용되지 않은 항목 제거"""
+    cache.store([1.0, 0.0, 0.0], {"answer": "A"}, FINGERPRINT)
+    cache.store([0.0, 1.0, 0.0], {"answer": "B"}, FINGERPRINT)
+
+    # A를 최근 사용으로 갱신 -> B가 제거 대상
+    assert cache.lookup([1.0, 0.0, 0.0], FINGERPRINT) == {"answer": "A"}
+    cache.store([0.0, 0.0, 1.0], {"answer": "C"}, FINGERPRINT)
+
+    assert len(cache) == 2
+    assert cache.lookup([0.0, 1.0, 0.0], FINGERPRINT) is None
+    assert cache.lookup([0.0, 0.0, 1.0], FINGERPRINT) == {"answer": "C"}
+
+
+@patch("rag.semantic_cache.time.monotonic")
+def test_ttl_expiry(mock_monotonic, cache):
+    """[TTL] 유효 시간이 지난 항목은 적중하지 않음"""
+    mock_monotonic.return_value = 100.0
+    cache.store([1.0, 0.0, 0.0], {"answer": "A"}, FINGERPRINT)
+
+    mock_monotonic.return_value = 161.0
+    assert cache.lookup([1.0, 0.0, 0.0], FINGERPRINT) is None
+    assert len(cache) == 0
+
+
+def test_invalidated_when_knowledge_changes(cache):
+    """[Invalidation] 벡터 DB/FAQ 지문이 바뀌면 전체 캐시 폐기"""
+    cache.store([1.0, 0.0, 0.0], {"answer": "A"}, FINGERPRINT)
+
+    assert cache.lookup([1.0, 0.0, 0.0], ("collection-2", 0.0, 0.0)) is None
+    assert len(cache) == 0
@@ -0,0 +1,174 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.documents import Document
+
+from app.config import LEXICAL_INDEX_PATH
+from vectorstore.hot_reload import VectorStoreReloader
+from vectorstore.lexical_index import BM25Index
+from vectorstore.numpy_store import create_numpy_store
+from vectorstore.snapshots import (
+    current_snapshot_version,
+    new_snapshot_dir,
+    prune_snapshots,
+    published_versions,
+    publish_snapshot,
+    resolve_snapshot_dir,
+)
+from vectorstore.retriever import retrieve_docs
+from vectorstore.store_factory import load_vector_store
+
+
+class _FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+def _build_snapshot(root, contents):
+    snapshot_dir = new_snapshot_dir(str(root))
+    documents = [Document(page_content=text, metadata={"doc_id": text}) for text in contents]
+    create_numpy_store(documents, _FakeEmbeddings(), snapshot_dir)
+    return snapshot_dir
+
+
+def test_resolve_without_current_uses_legacy_root(tmp_path):
+    assert current_snapshot_version(str(tmp_path)) is None
+    assert resolve_snapshot_dir(str(tmp_path)) == str(tmp_path)
+
+
+def test_publish_switches_current_atomically(tmp_path):
+    first = _build_snapshot(tmp_path, ["a"])
+    publish_snapshot(str(tmp_path), first)
+    second = _build_snapshot(tmp_path, ["a", "bb"])
+
+    # 새 버전을 만드는 중에도 CURRENT는 이전 버전을 가리킴
+    assert resolve_snapshot_dir(str(tmp_path)) == first
+
+    publish_snapshot(str(tmp_path), second)
+
+    assert resolve_snapshot_dir(str(tmp_path)) == second
+    assert not os.path.exists(os.path.join(str(tmp_path), "CURRENT.tmp"))
+    assert len(load_vector_store(_FakeEmbeddings(), str(tmp_path), backend="numpy")) == 2
+
+
+def test_publish_rejects_unknown_snapshot(tmp_path):
+    with pytest.raises(ValueError):
+        publish_snapshot(str(tmp_path), str(tmp_path / "versions" / "missing"))
+
+
+def _remaining(tmp_path):
+    return sorted(os.listdir(tmp_path / "versions"))
+
+
+def _names(*paths):
+    return sorted(os.path.basename(path) for path in paths)
+
+
+def test_prune_keeps_current_and_recent_published(tmp_path):
+    snapshots = [_build_snapshot(tmp_path, ["a"]) for _ in range(4)]
+    for snapshot in snapshots:
+        publish_snapshot(str(tmp_path), snapshot)
+
+    prune_snapshots(str(tmp_path), keep=1)
+
+    assert _remaining(tmp_path) == _names(snapshots[2], snapshots[3])
+    assert published_versions(str(tmp_path)) == [os.path.basename(path) for path in snapshots[2:]]
+
+
+def test_prune_ignores_unpublished_failed_build(tmp_path):
+    """실패로 남은 최신 폴더 때문에 마지막 정상 롤백 스냅샷이 삭제되지 않음"""
+    first, second = _build_snapshot(tmp_path, ["a"]), _build_snapshot(tmp_path, ["a"])
+    publish_snapshot(str(tmp_path), first)
+    publish_snapshot(str(tmp_path), second)
+    failed = new_snapshot_dir(str(tmp_path))   # 공개되지 않은 폴더
+
+    prune_snapshots(str(tmp_path), keep=1)
+
+    assert _remaining(tmp_path) == _names(first, second, failed)
+
+
+def test_prune_always_keeps_previous_after_rollback(tmp_path):
+    snapshots = [_build_snapshot(tmp_path, ["a"]) for _ in range(3)]
+    for snapshot in snapshots:
+        publish_snapshot(str(tmp_path), snapshot)
+    publish_snapshot(str(tmp_path), snapshots[0])   # 롤백
+
+    prune_snapshots(str(tmp_path), keep=0)
+
+    # 현재(롤백된 0번)와 직전 공개 버전(2번)은 keep=0이어도 보관
+    assert _remaining(tmp_path) == _names(snapshots[0], snapshots[2])
+
+
+def test_reloader_loads_in_background_and_swaps_between_requests(tmp_path):
+    """[Hot Reload] 새 스냅샷은 check()에서 미리 로딩되고, swap_into() 호출 시점에만 교체"""
+    publish_snapshot(str(tmp_path), _build_snapshot(tmp_path, ["a"]))
+    reloader = VectorStoreReloader(_FakeEmbeddings(), str(tmp_path), backend="numpy", interval=60)
+    pipeline = MagicMock()
+
+    assert reloader.check() is False
+    assert reloader.swap_into(pipeline) is False
+
+    new_snapshot = _build_snapshot(tmp_path, ["a", "bb", "ccc"])
+    publish_snapshot(str(tmp_path), new_snapshot)
+
+    assert reloader.check() is True
+    assert len(reloader.vectordb) == 1              # 아직 교체 전
+    pipeline.swap_vectordb.assert_not_called()
+
+    assert reloader.swap_into(pipeline) is True
+    swapped = pipeline.swap_vectordb.call_args.args[0]
+    assert len(swapped) == 3 and reloader.vectordb is swapped
+    assert reloader.version == os.path.basename(new_snapshot)
+    assert reloader.check() is False
+
+
+def test_reloader_keeps_serving_on_broken_snapshot(tmp_path):
+    publish_snapshot(str(tmp_path), _build_snapshot(tmp_path, ["a"]))
+    reloader = VectorStoreReloader(_FakeEmbeddings(), str(tmp_path), backend="numpy", interval=60)
+
+    broken = new_snapshot_dir(str(tmp_path))   # 인덱스 파일 없음
+    publish_snapshot(str(tmp_path), broken)
+
+    assert reloader.check() is False
+    assert reloader.swap_into(MagicMock()) is False
+    assert len(reloader.vectordb) == 1
+
+
+@patch("vectorstore.retriever.USE_HYBRID_SEARCH", True)
+@patch("vectorstore.hot_reload.USE_HYBRID_SEARCH", True)
+def test_reloader_swaps_lexical_index_with_dense_snapshot(tmp_path):
+    """[Hot Reload] BM25 색인은 스냅샷 폴더에 함께 저장되어 dense 인덱스와 같은 버전으로만 교체"""
+    def build_versioned(version, contents):
+        snapshot_dir = new_snapshot_dir(str(tmp_path))
+        documents = [
+            Document(page_content=text, metadata={"doc_id": f"{version}_{i}", "version": version})
+            for i, text in enumerate(contents)
+        ]
+        create_numpy_store(documents, _FakeEmbeddings(), snapshot_dir)
+        BM25Index.build(documents).save(os.path.join(snapshot_dir, LEXICAL_INDEX_PATH))
+        return snapshot_dir
+
+    publish_snapshot(str(tmp_path), build_versioned("v1", ["물품 반납 절차", "물품 불용 신청"]))
+    reloader = VectorStoreReloader(_FakeEmbeddings(), str(tmp_path), backend="numpy", interval=60)
+    pipeline = MagicMock()
+
+    def served_versions():
+        results = retrieve_docs(reloader.vectordb, "불용 신청", top_k=5)
+        return {doc.metadata["version"] for doc, _ in results}
+
+    publish_snapshot(str(tmp_path), build_versioned("v2", ["물품 반납 절차 변경", "물품 불용 신청 승인", "처분 신청"]))
+
+    # CURRENT는 v2를 가리키지만 교체 전에는 dense / lexical 모두 v1
+    assert served_versions() == {"v1"}
+
+    assert reloader.check() is True
+    assert served_versions() == {"v1"}
+
+    assert reloader.swap_into(pipeline) is True
+    swapped = pipeline.swap_vectordb.call_args.args[0]
+    assert swapped.lexical_index is not None and len(swapped.lexical_index) == 3
+    assert served_versions() == {"v2"}
@@ -0,0 +1,66 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+
+from chain_mocks import mock_template_chain
+from rag.chain import run_rag_chain, arun_rag_chain
+
+
+@patch("rag.chain.USE_SPECULATIVE_EXECUTION", True)
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_speculative_rag_path_reuses_prefetched_results(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Speculative] 도구 미사용 시 선행 실행된 분류/정제/검색 결과를 그대로 사용"""
+    ctx = mock_dependencies
+
+    classifier_template, classifier_chain = mock_template_chain("NEED_RAG")
+    refiner_template, refiner_chain = mock_template_chain("불용 처리 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.invoke.return_value = AIMessage(content="불용 답변")
+
+    doc = Document(page_content="불용 절차", metadata={"doc_id": "doc_4"})
+    mock_retrieve.return_value = [(doc, 0.2)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    result = run_rag_chain(ctx.base_llm, ctx.vectordb, "불용 어떻게 해?")
+
+    assert result == {"answer": "불용 답변", "attribution": [{"doc_id": "doc_4"}]}
+    classifier_chain.invoke.assert_called_once()
+    refiner_chain.invoke.assert_called_once()
+    mock_retrieve.assert_called_once()
+    assert mock_retrieve.call_args.kwargs["query"] == "불용 처리 절차"
+
+
+@patch("rag.chain.USE_SPECULATIVE_EXECUTION", True)
+@patch("rag.chain.TOOL_MAP")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_speculative_results_discarded_on_tool_path(mock_prompt_template, mock_retrieve, mock_tool_map, mock_dependencies):
+    """[Speculative/Async] 도구 경로 선택 시 선행 작업 결과는 사용되지 않음"""
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("검색어")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+    mock_retrieve.return_value = []
+
+    search_tool = MagicMock(name="search_tool")
+    search_tool.invoke.return_value = json.dumps({"results": ["노트북"]}, ensure_ascii=False)
+    mock_tool_map.__contains__.side_effect = lambda name: True
+    mock_tool_map.__getitem__.side_effect = lambda name: search_tool
+
+    ctx.bound_llm.ainvoke = AsyncMock(return_value=AIMessage(
+        content="",
+        tool_calls=[{"name": "get_item_detail_info", "args": {"asset_name": "노트북"}, "id": "call_1"}]
+    ))
+    ctx.base_llm.ainvoke = AsyncMock(return_value=AIMessage(content="노트북 조회 결과입니다."))
+
+    result = asyncio.run(arun_rag_chain(ctx.base_llm, ctx.vectordb, "노트북 상태 알려줘"))
+
+    assert result == {"answer": "노트북 조회 결과입니다.", "attribution": []}
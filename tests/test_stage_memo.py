@@ -0,0 +1,66 @@
+import pytest
+
+from rag.stage_memo import StageMemo, llm_config_key, normalize_question
+
+# --------------------------------------------------------------------------
+# StageMemo 단위 테스트
+# --------------------------------------------------------------------------
+
+TEMPLATE = "질문: {question}\n판단:"
+LLM_CONFIG = llm_config_key()
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("  불용 처리 방법?? ", "불용 처리 방법"),
+    ("반납   절차\n알려줘.", "반납 절차 알려줘"),
+    ("G2B목록번호 조회", "g2b목록번호 조회"),
+])
+def test_normalize_question(raw, expected):
+    assert normalize_question(raw) == expected
+
+
+def test_near_repeat_questions_share_entry():
+    """[Key] 공백/문장부호만 다른 질문은 같은 결과를 재사용"""
+    memo = StageMemo(max_size=8)
+    memo.set("classifier", LLM_CONFIG, TEMPLATE, "불용 처리 방법?", "NEED_RAG")
+
+    assert memo.get("classifier", LLM_CONFIG, TEMPLATE, "불용  처리 방법") == "NEED_RAG"
+    # 단계가 다르거나 템플릿이 바뀌면 별도 key
+    assert memo.get("refine", LLM_CONFIG, TEMPLATE, "불용 처리 방법") is None
+    assert memo.get("classifier", LLM_CONFIG, TEMPLATE + " ", "불용 처리 방법") is None
+
+
+def test_lru_bound():
+    """[LRU] 최대 개수 초과 시 가장 오래된 항목 제거"""
+    memo = StageMemo(max_size=2)
+    memo.set("refine", LLM_CONFIG, TEMPLATE, "q1", "a1")
+    memo.set("refine", LLM_CONFIG, TEMPLATE, "q2", "a2")
+    memo.get("refine", LLM_CONFIG, TEMPLATE, "q1")
+    memo.set("refine", LLM_CONFIG, TEMPLATE, "q3", "a3")
+
+    assert memo.get("refine", LLM_CONFIG, TEMPLATE, "q2") is None
+    assert memo.get("refine", LLM_CONFIG, TEMPLATE, "q1") == "a1"
+
+
+def test_sqlite_persistence_survives_restart(tmp_path):
+    """[Persistence] SQLite 파일에 저장된 결과는 새 인스턴스에서도 조회"""
+    db_path = str(tmp_path / "memo" / "stage_memo.sqlite3")
+    StageMemo(max_size=8, db_path=db_path).set("refine", LLM_CONFIG, TEMPLATE, "반납 절차", "물품 반납 절차")
+
+    restarted = StageMemo(max_size=8, db_path=db_path)
+    assert restarted.get("refine", LLM_CONFIG, TEMPLATE, "반납 절차") == "물품 반납 절차"
+
+
+def test_llm_config_change_misses_memo():
+    """[Key] 모델 이름이나 temperature가 바뀌면 이전 LLM의 결과를 재사용하지 않음"""
+    class FakeLLM:
+        def __init__(self, model_name, temperature):
+            self.model_name = model_name
+            self.temperature = temperature
+
+    memo = StageMemo(max_size=8)
+    memo.set("refine", llm_config_key(FakeLLM("gpt-4o", 0.1)), TEMPLATE, "반납 절차", "물품 반납 절차")
+
+    assert memo.get("refine", llm_config_key(FakeLLM("gpt-4o", 0.1)), TEMPLATE, "반납 절차") == "물품 반납 절차"
+    assert memo.get("refine", llm_config_key(FakeLLM("gpt-4o-mini", 0.1)), TEMPLATE, "반납 절차") is None
+    assert memo.get("refine", llm_config_key(FakeLLM("gpt-4o", 0.7)), TEMPLATE, "반납 절차") is None
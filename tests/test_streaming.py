@@ -0,0 +1,150 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from chain_mocks import mock_template_chain
+from rag.chain import stream_rag_chain, astream_rag_chain
+
+
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_stream_rag_chain_tokens_then_final(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Streaming] 생성 토큰이 순서대로 나오고, attribution은 마지막 이벤트로 전달"""
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("반납 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.stream.return_value = iter([
+        AIMessageChunk(content="반납은 "),
+        AIMessageChunk(content=""),
+        AIMessageChunk(content="이렇게 합니다."),
+    ])
+
+    doc = Document(page_content="반납 절차 설명", metadata={"doc_id": "doc_3"})
+    mock_retrieve.return_value = [(doc, 0.1)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    events = list(stream_rag_chain(ctx.base_llm, ctx.vectordb, "반납 어떻게 해?"))
+
+    assert events == [
+        {"type": "token", "content": "반납은 "},
+        {"type": "token", "content": "이렇게 합니다."},
+        {"type": "final", "result": {"answer": "반납은 이렇게 합니다.", "attribution": [{"doc_id": "doc_3"}]}, "route": "rag"},
+    ]
+    ctx.base_llm.invoke.assert_not_called()
+
+
+@patch("rag.chain.TOOL_MAP")
+def test_astream_tool_summary_tokens(mock_tool_map, mock_dependencies):
+    """[Streaming/Async] 도구 결과 요약 단계도 토큰 단위로 전달"""
+    ctx = mock_dependencies
+
+    search_tool = MagicMock(name="search_tool")
+    search_tool.invoke.return_value = json.dumps({"results": ["노트북"]}, ensure_ascii=False)
+    mock_tool_map.__contains__.side_effect = lambda name: True
+    mock_tool_map.__getitem__.side_effect = lambda name: search_tool
+
+    ctx.bound_llm.ainvoke = AsyncMock(return_value=AIMessage(
+        content="",
+        tool_calls=[{"name": "get_item_detail_info", "args": {"asset_name": "노트북"}, "id": "call_1"}]
+    ))
+
+    async def _astream(_messages, **kwargs):
+        for text in ["노트북은 ", "운용 중입니다."]:
+            yield AIMessageChunk(content=text)
+
+    ctx.base_llm.astream = _astream
+
+    async def _collect():
+        return [event async for event in astream_rag_chain(ctx.base_llm, ctx.vectordb, "노트북 상태")]
+
+    events = asyncio.run(_collect())
+
+    assert [e["content"] for e in events if e["type"] == "token"] == ["노트북은 ", "운용 중입니다."]
+    assert events[-1] == {
+        "type": "final",
+        "result": {"answer": "노트북은 운용 중입니다.", "attribution": []},
+        "route": "tool",
+    }
+
+
+def _failing_stream(*texts):
+    """토큰 일부를 내보낸 뒤 오류가 나는 llm.stream Mock"""
+    def _stream(_messages, **kwargs):
+        for text in texts:
+            yield AIMessageChunk(content=text)
+        raise RuntimeError("stream disconnected")
+    return _stream
+
+
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_stream_failure_after_tokens_emits_reset(mock_prompt_template, mock_retrieve, mock_reranker_cls, mock_dependencies):
+    """[Streaming] 토큰 일부 출력 후 생성 오류 -> reset 이벤트 후 오류 안내로 대체"""
+    from app.config import TECHNICAL_ERROR_RESPONSE
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("반납 절차")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    ctx.bound_llm.invoke.return_value = AIMessage(content="", tool_calls=[])
+    ctx.base_llm.stream.side_effect = _failing_stream("반납은 ")
+
+    doc = Document(page_content="반납 절차 설명", metadata={"doc_id": "doc_3"})
+    mock_retrieve.return_value = [(doc, 0.1)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    events = list(stream_rag_chain(ctx.base_llm, ctx.vectordb, "반납 어떻게 해?"))
+
+    assert events == [
+        {"type": "token", "content": "반납은 "},
+        {"type": "reset"},
+        {"type": "final", "result": {"answer": TECHNICAL_ERROR_RESPONSE, "attribution": []}, "route": "error"},
+    ]
+
+
+@patch("rag.chain.TOOL_MAP")
+@patch("rag.chain.CrossEncoderReranker")
+@patch("rag.chain.retrieve_docs")
+@patch("rag.chain.PromptTemplate")
+def test_tool_summary_failure_resets_before_rag_fallback(mock_prompt_template, mock_retrieve, mock_reranker_cls,
+                                                         mock_tool_map, mock_dependencies):
+    """[Streaming] 도구 요약 일부 출력 후 오류 -> reset 이벤트 후 RAG 답변만 이어서 출력"""
+    ctx = mock_dependencies
+
+    classifier_template, _ = mock_template_chain("NEED_RAG")
+    refiner_template, _ = mock_template_chain("노트북 상태")
+    mock_prompt_template.from_template.side_effect = [classifier_template, refiner_template]
+
+    search_tool = MagicMock(name="search_tool")
+    search_tool.invoke.return_value = json.dumps({"results": ["노트북"]}, ensure_ascii=False)
+    mock_tool_map.__contains__.side_effect = lambda name: True
+    mock_tool_map.__getitem__.side_effect = lambda name: search_tool
+
+    ctx.bound_llm.invoke.return_value = AIMessage(
+        content="",
+        tool_calls=[{"name": "get_item_detail_info", "args": {"asset_name": "노트북"}, "id": "call_1"}]
+    )
+    ctx.base_llm.stream.side_effect = [
+        _failing_stream("노트북은 ")(None),
+        iter([AIMessageChunk(content="매뉴얼 답변")]),
+    ]
+
+    doc = Document(page_content="노트북 상태 조회 방법", metadata={"doc_id": "doc_7"})
+    mock_retrieve.return_value = [(doc, 0.1)]
+    mock_reranker_cls.return_value.rerank.return_value = [doc]
+
+    events = list(stream_rag_chain(ctx.base_llm, ctx.vectordb, "노트북 상태"))
+
+    assert [event["type"] for event in events] == ["token", "reset", "token", "final"]
+    assert events[-1]["route"] == "rag"
+    assert events[-1]["result"]["answer"] == "매뉴얼 답변"
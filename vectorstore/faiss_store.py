@@ -0,0 +1,204 @@
+# FAISS 벡터 저장소
+# - 인덱스 종류: Flat(정확 검색) / HNSW(그래프 근사 검색) / IVF-PQ(압축 + 클러스터 근사 검색)
+# - index.faiss + documents.json(문서 본문/메타데이터)으로 저장, 로딩 시 memory mapping 사용
+
+import logging
+import math
+import os
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+from app.config import (
+    FAISS_INDEX_TYPE,
+    FAISS_HNSW_M,
+    FAISS_HNSW_EF_CONSTRUCTION,
+    FAISS_HNSW_EF_SEARCH,
+    FAISS_IVF_NLIST,
+    FAISS_IVF_NPROBE,
+    FAISS_PQ_M,
+    FAISS_PQ_NBITS
+)
+from vectorstore.metadata_filter import matching_rows
+from vectorstore.numpy_store import embed_normalized, save_docstore, load_docstore
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.faiss"
+
+
+class FaissVectorStore:
+    """
+    retrieve_docs / retrieve_docs_by_vector가 사용하는 Chroma 검색 인터페이스를 제공하는 FAISS 저장소
+
+    정규화 벡터 + L2 metric이므로 반환 score는 Chroma 기본값과 같은 squared L2 거리(2 - 2 * cosine)입니다.
+    (IVF-PQ는 압축 코드 기준 근사 거리)
+
+    Parameters
+    ----------
+    index : faiss.Index
+        벡터 행 번호 = documents 순서인 FAISS 인덱스
+    documents : list
+        Document 리스트
+    embeddings :
+        질의 임베딩에 사용할 임베딩 모델 (embed_query)
+    persist_directory : str, optional
+        인덱스 저장 폴더 (캐시 무효화 판단용)
+    """
+
+    def __init__(self, index, documents: List[Document], embeddings, persist_directory: str = None):
+        if index.ntotal != len(documents):
+            raise ValueError(
+                f"인덱스 벡터 수({index.ntotal})와 문서 수({len(documents)})가 일치하지 않습니다."
+            )
+
+        self.index = index
+        self.documents = documents
+        self.embeddings = embeddings
+        self._persist_directory = persist_directory
+        self._filter_rows = {}   # where 절 -> 행 번호 (메타데이터 필터 부분 검색용)
+        self._doc_id_rows = None  # doc_id -> 행 번호 (document_vectors 첫 호출 시 생성)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def document_vectors(self, doc_ids: List[str]) -> Optional[np.ndarray]:
+        """
+        doc_id 순서대로 인덱스에 저장된 벡터 (색인에 없는 doc_id가 있거나 복원할 수 없는 인덱스면 None)
+        IVF-PQ는 압축 코드에서 복원한 근사 벡터
+        """
+        if self._doc_id_rows is None:
+            self._doc_id_rows = {doc.metadata.get("doc_id"): i for i, doc in enumerate(self.documents)}
+        rows = [self._doc_id_rows.get(doc_id) for doc_id in doc_ids]
+        if any(row is None for row in rows):
+            return None
+
+        try:
+            if isinstance(self.index, faiss.IndexIVF) and self.index.direct_map.type == faiss.DirectMap.NoMap:
+                # IVF 계열은 행 번호 -> 리스트 위치 매핑이 있어야 복원 가능 (최초 1회 생성)
+                self.index.make_direct_map()
+            return self.index.reconstruct_batch(np.asarray(rows, dtype=np.int64))
+        except RuntimeError as e:
+            logger.warning(f"[FAISS] 벡터 복원 불가 인덱스: {e}")
+            return None
+
+    def _search(self, query_vector, k: int, where: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        if not self.documents or k <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(query)
+
+        if where:
+            # 메타데이터 필터: 해당 행 id만 허용하는 selector로 인덱스 안에서 바로 걸러냄
+            rows = matching_rows(self.documents, where, self._filter_rows)
+            if len(rows) == 0:
+                return []
+            selector = faiss.IDSelectorBatch(rows)   # search 종료 시까지 참조 유지
+            params = _search_params(self.index, selector)
+            distances, ids = self.index.search(query, min(k, len(rows)), params=params)
+        else:
+            distances, ids = self.index.search(query, min(k, len(self.documents)))
+
+        # 근사 인덱스는 후보가 부족하면 -1을 채워서 반환
+        return [
+            (self.documents[i], float(distance))
+            for distance, i in zip(distances[0], ids[0])
+            if i >= 0
+        ]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        return self._search(self.embeddings.embed_query(query), k, filter)
+
+    def similarity_search_by_vector_with_relevance_scores(self, embedding: List[float], k: int = 4, filter: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        return self._search(embedding, k, filter)
+
+
+def _build_index(vectors: np.ndarray, index_type: str):
+    n, dimension = vectors.shape
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dimension)
+
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, FAISS_HNSW_M)
+        index.hnsw.efConstruction = FAISS_HNSW_EF_CONSTRUCTION
+
+    elif index_type == "ivfpq":
+        if dimension % FAISS_PQ_M != 0:
+            raise ValueError(f"FAISS_PQ_M({FAISS_PQ_M})은 임베딩 차원({dimension})의 약수여야 합니다.")
+
+        # 학습 데이터가 적으면 클러스터 수 / 코드북 크기를 줄임
+        # (FAISS 권장: 클러스터당 최소 39개 학습 벡터, 코드북 중심점 2^nbits개 이상)
+        nlist = max(1, min(FAISS_IVF_NLIST, n // 39))
+        nbits = max(1, min(FAISS_PQ_NBITS, int(math.log2(n)) if n > 1 else 1))
+        if (nlist, nbits) != (FAISS_IVF_NLIST, FAISS_PQ_NBITS):
+            logger.warning(
+                f"[FAISS] 문서 수({n})가 적어 IVF-PQ 설정 조정: nlist={nlist}, nbits={nbits}"
+            )
+
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFPQ(quantizer, dimension, nlist, FAISS_PQ_M, nbits)
+        index.train(vectors)
+
+    else:
+        raise ValueError(f"지원하지 않는 FAISS_INDEX_TYPE: {index_type}")
+
+    index.add(vectors)
+    return index
+
+
+def _apply_search_params(index):
+    # 검색 시점 파라미터는 저장 파일에 의존하지 않고 설정값을 적용
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = FAISS_IVF_NPROBE
+
+
+def _search_params(index, selector):
+    # 검색 파라미터 객체를 넘기면 인덱스에 설정된 efSearch / nprobe 대신 객체 값이 쓰이므로 함께 지정
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=FAISS_HNSW_EF_SEARCH)
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=FAISS_IVF_NPROBE)
+    return faiss.SearchParameters(sel=selector)
+
+
+def create_faiss_db(documents: List[Document], embeddings, persist_dir: str, index_type: str = FAISS_INDEX_TYPE):
+    """
+    문서를 임베딩하여 FAISS 인덱스를 만들고 index.faiss + documents.json으로 저장합니다.
+    """
+    os.makedirs(persist_dir, exist_ok=True)
+
+    vectors = embed_normalized(documents, embeddings)
+    index = _build_index(vectors, index_type)
+    _apply_search_params(index)
+
+    # 쓰는 도중 로딩되지 않도록 임시 파일에 저장 후 교체
+    index_path = os.path.join(persist_dir, INDEX_FILE)
+    faiss.write_index(index, index_path + ".tmp")
+    os.replace(index_path + ".tmp", index_path)
+
+    save_docstore(persist_dir, documents, vectors.shape[1])
+
+    return FaissVectorStore(index, documents, embeddings, persist_directory=persist_dir)
+
+
+def load_faiss_db(embeddings, persist_dir: str):
+    """
+    저장된 FAISS 인덱스를 memory mapping으로 로딩합니다.
+    (mmap을 지원하지 않는 인덱스 형식이면 일반 로딩)
+    """
+    index_path = os.path.join(persist_dir, INDEX_FILE)
+    try:
+        index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError as e:
+        logger.warning(f"[FAISS] mmap 로딩 실패 -> 일반 로딩: {e}")
+        index = faiss.read_index(index_path)
+
+    _apply_search_params(index)
+
+    return FaissVectorStore(index, load_docstore(persist_dir), embeddings, persist_directory=persist_dir)
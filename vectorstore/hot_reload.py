@@ -0,0 +1,149 @@
+# 서비스 중 벡터 인덱스 교체 (hot swap)
+# - 백그라운드 스레드가 CURRENT 변경을 감지하면 새 스냅샷을 로딩 + 예열(warm-up)
+# - 교체는 서비스 루프가 요청 사이에 swap_into()를 호출할 때만 적용 → 처리 중인 요청은 이전 인덱스로 끝까지 수행
+# - Hybrid 검색용 BM25 색인도 같은 스냅샷 폴더에서 로딩하여 저장소 객체에 묶어 함께 교체 (dense / lexical 버전 일치)
+
+import logging
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+
+from app.config import VECTOR_BACKEND, VECTOR_RELOAD_INTERVAL_SECONDS, USE_HYBRID_SEARCH
+from vectorstore.lexical_index import attach_lexical_index
+from vectorstore.snapshots import current_snapshot_version, resolve_snapshot_dir
+from vectorstore.store_factory import get_vector_store_path, load_vector_store
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up(vectordb):
+    """
+    첫 요청이 디스크 읽기 / 지연 초기화 비용을 내지 않도록 인덱스를 미리 읽어 둠
+    """
+    vectors = getattr(vectordb, "vectors", None)
+    if isinstance(vectors, np.ndarray):
+        # memmap 페이지를 page cache로 적재 (NumPy 백엔드)
+        float(np.asarray(vectors).sum())
+        codes = getattr(vectordb, "codes", None)
+        if isinstance(codes, np.ndarray):
+            int(np.asarray(codes).sum())
+        return
+
+    index = getattr(vectordb, "index", None)
+    if index is not None and hasattr(index, "d"):
+        # FAISS 백엔드: 검색 1회 수행
+        if getattr(index, "ntotal", 0) > 0:
+            index.search(np.zeros((1, index.d), dtype=np.float32), 1)
+        return
+
+    collection = getattr(vectordb, "_collection", None)
+    if collection is not None:
+        # Chroma 백엔드: 컬렉션 / 세그먼트 로딩
+        collection.count()
+
+
+class VectorStoreReloader:
+    """
+    스냅샷 CURRENT를 감시하여 새 버전을 백그라운드에서 로딩하고, 요청 사이에 교체합니다.
+
+    Parameters
+    ----------
+    embeddings :
+        질의 임베딩 모델 (저장소 로딩에 사용)
+    root : str, optional
+        인덱스 경로 (None이면 VECTOR_BACKEND 기본 경로)
+    backend : str
+        벡터 검색 백엔드
+    interval : float
+        CURRENT 확인 주기 (초)
+
+    Examples
+    --------
+    >>> reloader = VectorStoreReloader(embeddings)
+    >>> pipeline = RagPipeline(llm, reloader.vectordb)
+    >>> reloader.start()
+    >>> # 요청 처리 루프에서 매 요청 전
+    >>> reloader.swap_into(pipeline)
+    """
+
+    def __init__(self, embeddings, root: str = None, backend: str = VECTOR_BACKEND,
+                 interval: float = VECTOR_RELOAD_INTERVAL_SECONDS):
+        self.embeddings = embeddings
+        self.root = root or get_vector_store_path(backend)
+        self.backend = backend
+        self.interval = interval
+
+        self.version = current_snapshot_version(self.root)
+        self.vectordb = load_vector_store(embeddings, self.root, backend)
+        if USE_HYBRID_SEARCH:
+            attach_lexical_index(self.vectordb)
+
+        self._pending = None   # (버전, 로딩 + 예열이 끝난 저장소)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self) -> bool:
+        """
+        CURRENT가 바뀌었으면 새 버전을 로딩하여 교체 대기 상태로 둡니다. (백그라운드 스레드에서 주기 호출)
+        새 버전이 준비되면 True
+        """
+        version = current_snapshot_version(self.root)
+        with self._lock:
+            pending_version = self._pending[0] if self._pending else None
+        if version is None or version in (self.version, pending_version):
+            return False
+
+        try:
+            vectordb = load_vector_store(self.embeddings, self.root, self.backend)
+            if USE_HYBRID_SEARCH:
+                attach_lexical_index(vectordb)
+            _warm_up(vectordb)
+        except Exception as e:
+            # 쓰는 중이거나 손상된 스냅샷이면 기존 인덱스를 계속 사용하고 다음 주기에 재시도
+            logger.warning(f"[Hot Reload] 스냅샷 로딩 실패 ({version}) -> 기존 인덱스 유지: {e}")
+            return False
+
+        # 로딩 도중 CURRENT가 또 바뀌었으면 다음 주기에 최신 버전을 다시 로딩
+        loaded_dir = getattr(vectordb, "_persist_directory", None)
+        if loaded_dir and os.path.normpath(loaded_dir) != os.path.normpath(resolve_snapshot_dir(self.root)):
+            return False
+
+        with self._lock:
+            self._pending = (version, vectordb)
+        logger.info(f"[Hot Reload] 새 스냅샷 준비 완료: {version}")
+        return True
+
+    def swap_into(self, pipeline) -> bool:
+        """
+        준비된 새 인덱스가 있으면 파이프라인의 vectordb를 교체합니다. (요청 사이에 호출)
+        BM25 색인은 vectordb에 묶여 있으므로 같은 버전으로 함께 교체됩니다.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is None:
+            return False
+
+        version, vectordb = pending
+        previous_version = self.version
+        self.version, self.vectordb = version, vectordb
+        pipeline.swap_vectordb(vectordb)
+        logger.info(f"[Hot Reload] 인덱스 교체: {previous_version} -> {version}")
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="vector-store-reloader", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,215 @@
+# 한국어 문자 n-gram 기반 BM25 역색인 (lexical 검색)
+# - "G2B목록번호", "정리일자", "불용" 같은 정확한 용어 매칭을 dense 검색과 보완
+# - create_vector_db 시점에 벡터 인덱스와 같은 스냅샷 폴더에 JSON으로 저장, 서비스 시 로딩 후 메모리에서 검색
+#   (벡터 저장소 객체에 묶어 두므로 hot swap 시 dense / lexical 색인이 같은 버전으로 함께 교체됨)
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.config import LEXICAL_INDEX_PATH, BM25_K1, BM25_B
+from vectorstore.metadata_filter import matching_rows
+
+logger = logging.getLogger(__name__)
+
+# 영문/숫자 연속 구간은 단어 그대로, 한글 연속 구간은 문자 bigram으로 분해
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    BM25용 토큰화
+    예: "G2B목록번호 조회" -> ["g2b", "목록", "록번", "번호", "조회"]
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for chunk in _TOKEN_PATTERN.findall(text):
+        if chunk[0].isascii() or len(chunk) == 1:
+            tokens.append(chunk)
+        else:
+            tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    BM25 역색인
+
+    Parameters
+    ----------
+    documents : list
+        색인 대상 Document 리스트 (검색 결과로 그대로 반환)
+    postings : dict
+        term -> (문서 번호 배열, term frequency 배열)
+    doc_lengths : np.ndarray
+        문서별 토큰 수
+    """
+
+    def __init__(self, documents: List[Document], postings: dict, doc_lengths: np.ndarray,
+                 k1: float = BM25_K1, b: float = BM25_B):
+        self.documents = documents
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+        self._filter_rows = {}   # where 절 -> 행 번호 (메타데이터 필터용)
+
+        n_docs = len(documents)
+        avg_length = float(doc_lengths.mean()) if n_docs else 0.0
+
+        # 문서 길이 보정항은 질의와 무관하므로 미리 계산
+        self._length_norm = (
+            k1 * (1 - b + b * doc_lengths / avg_length) if avg_length > 0
+            else np.full(n_docs, k1, dtype=np.float32)
+        ).astype(np.float32)
+        self._idf = {
+            term: math.log(1 + (n_docs - len(doc_idx) + 0.5) / (len(doc_idx) + 0.5))
+            for term, (doc_idx, _) in postings.items()
+        }
+
+    def __len__(self):
+        return len(self.documents)
+
+    @classmethod
+    def build(cls, documents: List[Document], k1: float = BM25_K1, b: float = BM25_B) -> "BM25Index":
+        term_docs = {}
+        doc_lengths = np.zeros(len(documents), dtype=np.float32)
+
+        for i, doc in enumerate(documents):
+            tokens = tokenize(doc.page_content)
+            doc_lengths[i] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_docs.setdefault(term, []).append((i, tf))
+
+        postings = {
+            term: (
+                np.array([i for i, _ in entries], dtype=np.int32),
+                np.array([tf for _, tf in entries], dtype=np.float32),
+            )
+            for term, entries in term_docs.items()
+        }
+        return cls(documents, postings, doc_lengths, k1=k1, b=b)
+
+    def search(self, query: str, k: int, where: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        """
+        BM25 점수 상위 k개 (Document, score) 반환 (score가 높을수록 관련)
+        where(Chroma where 절 형식)를 넘기면 조건을 만족하는 문서만 반환
+        """
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        matched = False
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            doc_idx, tf = posting
+            scores[doc_idx] += self._idf[term] * tf * (self.k1 + 1) / (tf + self._length_norm[doc_idx])
+            matched = True
+
+        if not matched or k <= 0:
+            return []
+
+        candidates = np.flatnonzero(scores)
+        if where:
+            candidates = np.intersect1d(candidates, matching_rows(self.documents, where, self._filter_rows))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [(self.documents[i], float(scores[i])) for i in candidates]
+
+    def save(self, path: str):
+        """
+        JSON으로 저장 (쓰는 도중 로딩되지 않도록 임시 파일에 쓴 뒤 교체)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = {
+            "k1": self.k1,
+            "b": self.b,
+            "documents": [
+                {"page_content": doc.page_content, "metadata": doc.metadata}
+                for doc in self.documents
+            ],
+            "doc_lengths": self.doc_lengths.astype(int).tolist(),
+            "postings": {
+                term: [doc_idx.tolist(), tf.astype(int).tolist()]
+                for term, (doc_idx, tf) in self.postings.items()
+            },
+        }
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        documents = [
+            Document(page_content=item["page_content"], metadata=item["metadata"])
+            for item in data["documents"]
+        ]
+        postings = {
+            term: (np.array(doc_idx, dtype=np.int32), np.array(tf, dtype=np.float32))
+            for term, (doc_idx, tf) in data["postings"].items()
+        }
+        return cls(
+            documents,
+            postings,
+            np.array(data["doc_lengths"], dtype=np.float32),
+            k1=data["k1"],
+            b=data["b"]
+        )
+
+
+_lexical_lock = threading.Lock()
+
+
+def load_lexical_index(snapshot_dir: str) -> Optional[BM25Index]:
+    """
+    스냅샷 폴더에 저장된 BM25 색인 로딩 (없으면 None)
+    """
+    path = os.path.join(snapshot_dir, LEXICAL_INDEX_PATH)
+    if not os.path.exists(path):
+        logger.warning(f"[Lexical Index] 색인 파일 없음 -> dense 검색만 사용: {path}")
+        return None
+
+    index = BM25Index.load(path)
+    logger.info(f"[Lexical Index] 로딩 완료: 문서 {len(index)}건, term {len(index.postings)}개 ({path})")
+    return index
+
+
+def attach_lexical_index(vectordb) -> Optional[BM25Index]:
+    """
+    vectordb와 같은 스냅샷 폴더의 BM25 색인을 로딩하여 vectordb.lexical_index로 묶음
+    (dense / lexical 색인이 항상 같은 버전으로 함께 교체되도록 저장소 객체에 보관)
+    """
+    persist_dir = getattr(vectordb, "_persist_directory", None)
+    index = load_lexical_index(persist_dir) if persist_dir else None
+    vectordb.lexical_index = index
+    return index
+
+
+def get_lexical_index(vectordb) -> Optional[BM25Index]:
+    """
+    vectordb와 같은 버전의 BM25 색인 (최초 호출 시 로딩, 없으면 None)
+    """
+    if "lexical_index" not in vars(vectordb):
+        with _lexical_lock:
+            if "lexical_index" not in vars(vectordb):
+                attach_lexical_index(vectordb)
+    return vectordb.lexical_index
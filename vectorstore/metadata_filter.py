@@ -0,0 +1,133 @@
+# 메타데이터 필터 (장 / 카테고리 단위로 검색 범위 축소)
+# - 필터 명세: {"chapter": "3"} / {"category": "물품 반납 관리"} (둘 다 지정 가능)
+# - Chroma where 절로 변환하여 검색 엔진에 그대로 전달 (push-down)
+# - NumPy / FAISS / BM25는 같은 where 절로 부분 행 집합을 계산하여 그 안에서만 검색
+
+import json
+import re
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.config import METADATA_FILTER_CHAPTER_KEYWORDS
+
+# 필터 명세 key -> 문서 메타데이터 필드
+_FILTER_FIELDS = {
+    "chapter": "chapter_major",
+    "category": "category",
+}
+
+
+def chapter_major(chapter) -> str:
+    """
+    장 번호의 대분류 ("4.3.1" -> "4")
+    """
+    return str(chapter or "").strip().split(".")[0]
+
+
+def normalize_metadata_filter(raw) -> Optional[dict]:
+    """
+    Planner 출력 등 외부 입력을 필터 명세로 정리합니다. (지원하지 않는 key / 빈 값은 제외, 없으면 None)
+    """
+    if not isinstance(raw, dict):
+        return None
+
+    metadata_filter = {}
+    chapter = chapter_major(raw.get("chapter"))
+    if chapter.isdigit():
+        metadata_filter["chapter"] = chapter
+
+    category = raw.get("category")
+    if isinstance(category, str) and category.strip():
+        metadata_filter["category"] = category.strip()
+
+    return metadata_filter or None
+
+
+def infer_metadata_filter(query: str) -> Optional[dict]:
+    """
+    검색어에 한 장(chapter)의 키워드만 포함된 경우 해당 장으로 필터를 만듭니다.
+    여러 장에 걸친 질문(예: "반납과 불용의 차이")이나 키워드가 없으면 None (전체 검색)
+    """
+    compact = re.sub(r"\s+", "", query or "")
+    chapters = [
+        chapter
+        for chapter, keywords in METADATA_FILTER_CHAPTER_KEYWORDS.items()
+        if any(keyword in compact for keyword in keywords)
+    ]
+    if len(chapters) != 1:
+        return None
+    return {"chapter": chapters[0]}
+
+
+def build_where(metadata_filter: Optional[dict]) -> Optional[dict]:
+    """
+    필터 명세 -> Chroma where 절
+    """
+    if not metadata_filter:
+        return None
+
+    conditions = [
+        {_FILTER_FIELDS[key]: {"$eq": value}}
+        for key, value in metadata_filter.items()
+        if key in _FILTER_FIELDS
+    ]
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
+def match_where(metadata: dict, where: dict) -> bool:
+    """
+    Chroma where 절 부분 집합($and / $or / $eq / $ne / $in / $nin) 평가
+    """
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(match_where(metadata, sub) for sub in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(match_where(metadata, sub) for sub in condition):
+                return False
+            continue
+
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for operator, operand in condition.items():
+            if operator == "$eq":
+                matched = value == operand
+            elif operator == "$ne":
+                matched = value != operand
+            elif operator == "$in":
+                matched = value in operand
+            elif operator == "$nin":
+                matched = value not in operand
+            else:
+                raise ValueError(f"지원하지 않는 where 연산자: {operator}")
+            if not matched:
+                return False
+
+    return True
+
+
+def matching_rows(documents: List[Document], where: dict, cache: Optional[dict] = None) -> np.ndarray:
+    """
+    where 절을 만족하는 문서 행 번호 배열
+    cache(dict)를 넘기면 같은 where 절은 다시 계산하지 않음 (장별 부분 인덱스를 미리 나눠 둔 것과 같은 효과)
+    """
+    key = json.dumps(where, sort_keys=True, ensure_ascii=False)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    rows = np.array(
+        [i for i, doc in enumerate(documents) if match_where(doc.metadata, where)],
+        dtype=np.int64
+    )
+    if cache is not None:
+        cache[key] = rows
+    return rows
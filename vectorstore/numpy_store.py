@@ -0,0 +1,229 @@
+# NumPy 기반 브루트포스(Flat) 벡터 저장소
+# - 정규화된 float32 임베딩 행렬(.npy) + 문서 메타데이터 사이드카(.json)
+# - 로딩 시 memmap으로 열어서 여러 워커 프로세스가 같은 page cache를 공유
+# - top-k 검색: 행렬-벡터 곱 1회 + argpartition
+# - NUMPY_QUANTIZATION="int8"로 생성하면 int8 code 행렬만 전체 스캔하고, 상위 후보만 float32 행으로 정확히 재계산
+
+import json
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from app.config import NUMPY_QUANTIZATION, QUANTIZATION_RESCORE_FACTOR
+from vectorstore.metadata_filter import matching_rows
+from vectorstore.quantization import quantize_int8, approximate_similarities
+
+VECTORS_FILE = "vectors.npy"
+DOCUMENTS_FILE = "documents.json"
+INT8_CODES_FILE = "vectors_int8.npy"
+INT8_SCALE_FILE = "int8_scale.npy"
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def embed_normalized(documents: List[Document], embeddings) -> np.ndarray:
+    """
+    문서 임베딩 후 행 단위 L2 정규화한 float32 행렬 반환
+    """
+    vectors = np.asarray(
+        embeddings.embed_documents([doc.page_content for doc in documents]),
+        dtype=np.float32
+    )
+    return _normalize_rows(vectors).astype(np.float32)
+
+
+def _top_indices(similarities: np.ndarray, k: int) -> np.ndarray:
+    # 상위 k개만 부분 정렬 후, k개 안에서 내림차순 정렬
+    n = similarities.shape[0]
+    if k < n:
+        top_idx = np.argpartition(-similarities, k - 1)[:k]
+    else:
+        top_idx = np.arange(n)
+    return top_idx[np.argsort(-similarities[top_idx], kind="stable")]
+
+
+def _save_npy(path: str, array: np.ndarray):
+    # 쓰는 도중 로딩되지 않도록 임시 파일에 저장 후 교체
+    # (np.save는 확장자가 .npy가 아니면 자동으로 붙이므로 임시 파일명도 .npy로 끝나게 함)
+    tmp_path = path + ".tmp.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def save_docstore(persist_dir: str, documents: List[Document], dimension: int):
+    """
+    문서 본문 + 메타데이터 사이드카 저장 (벡터 행 순서와 동일)
+    """
+    documents_path = os.path.join(persist_dir, DOCUMENTS_FILE)
+    tmp_documents_path = documents_path + ".tmp"
+    with open(tmp_documents_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "dimension": dimension,
+            "documents": [
+                {"page_content": doc.page_content, "metadata": doc.metadata}
+                for doc in documents
+            ],
+        }, f, ensure_ascii=False)
+    os.replace(tmp_documents_path, documents_path)
+
+
+def load_docstore(persist_dir: str) -> List[Document]:
+    with open(os.path.join(persist_dir, DOCUMENTS_FILE), "r", encoding="utf-8") as f:
+        sidecar = json.load(f)
+
+    return [
+        Document(page_content=item["page_content"], metadata=item["metadata"])
+        for item in sidecar["documents"]
+    ]
+
+
+class NumpyVectorStore:
+    """
+    retrieve_docs / retrieve_docs_by_vector가 사용하는 Chroma 검색 인터페이스를 그대로 제공하는 Flat 인덱스
+
+    반환 score는 Chroma 기본값과 같은 squared L2 거리입니다.
+    (정규화 벡터이므로 2 - 2 * cosine, 낮을수록 유사 → SIMILARITY_SCORE_THRESHOLD 그대로 사용 가능)
+
+    Parameters
+    ----------
+    vectors : np.ndarray
+        (문서 수, 차원) 정규화된 float32 행렬 (np.memmap 가능)
+    documents : list
+        vectors 행 순서와 같은 Document 리스트
+    embeddings :
+        질의 임베딩에 사용할 임베딩 모델 (embed_query)
+    persist_directory : str, optional
+        인덱스 저장 폴더 (캐시 무효화 판단용)
+    codes, scale : np.ndarray, optional
+        int8 양자화 code 행렬 / 차원별 scale. 있으면 code로 후보를 좁힌 뒤 vectors로 정확히 재계산
+    """
+
+    def __init__(self, vectors: np.ndarray, documents: List[Document], embeddings, persist_directory: str = None,
+                 codes: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None):
+        if vectors.shape[0] != len(documents):
+            raise ValueError(
+                f"벡터 수({vectors.shape[0]})와 문서 수({len(documents)})가 일치하지 않습니다."
+            )
+        if codes is not None and codes.shape != vectors.shape:
+            raise ValueError(f"int8 code 크기{codes.shape}가 벡터 크기{vectors.shape}와 일치하지 않습니다.")
+
+        self.vectors = vectors
+        self.documents = documents
+        self.embeddings = embeddings
+        self.codes = codes
+        self.scale = scale
+        self._persist_directory = persist_directory
+        self._filter_rows = {}   # where 절 -> 행 번호 (메타데이터 필터 부분 검색용)
+        self._doc_id_rows = None  # doc_id -> 행 번호 (document_vectors 첫 호출 시 생성)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def document_vectors(self, doc_ids: List[str]) -> Optional[np.ndarray]:
+        """
+        doc_id 순서대로 저장된 정규화 임베딩 행 (색인에 없는 doc_id가 있으면 None)
+        """
+        if self._doc_id_rows is None:
+            self._doc_id_rows = {doc.metadata.get("doc_id"): i for i, doc in enumerate(self.documents)}
+        rows = [self._doc_id_rows.get(doc_id) for doc_id in doc_ids]
+        if any(row is None for row in rows):
+            return None
+        return np.asarray(self.vectors[rows], dtype=np.float32)
+
+    def _shortlist(self, query: np.ndarray, rows: Optional[np.ndarray], k: int) -> np.ndarray:
+        """
+        int8 근사 점수 상위 k * QUANTIZATION_RESCORE_FACTOR개 행 번호 (memmap 순차 접근을 위해 정렬)
+        """
+        codes = self.codes if rows is None else self.codes[rows]
+        approx = approximate_similarities(codes, self.scale, query)
+        shortlist = _top_indices(approx, min(codes.shape[0], k * QUANTIZATION_RESCORE_FACTOR))
+        return np.sort(shortlist if rows is None else rows[shortlist])
+
+    def _top_k(self, query_vector, k: int, where: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        # 메타데이터 필터가 있으면 해당 행만 대상으로 검색
+        rows = matching_rows(self.documents, where, self._filter_rows) if where else None
+
+        n = len(self.documents) if rows is None else len(rows)
+        if n == 0 or k <= 0:
+            return []
+        k = min(k, n)
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        # 코사인 유사도 (행렬-벡터 곱 1회)
+        # 양자화 인덱스는 short list의 float32 행만 읽어서 정확한 점수로 재계산
+        if self.codes is not None:
+            candidate_rows = self._shortlist(query, rows, k)
+        else:
+            candidate_rows = rows
+        vectors = self.vectors if candidate_rows is None else self.vectors[candidate_rows]
+        similarities = vectors @ query
+
+        return [
+            (self.documents[i if candidate_rows is None else candidate_rows[i]], float(2.0 - 2.0 * similarities[i]))
+            for i in _top_indices(similarities, k)
+        ]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        return self._top_k(self.embeddings.embed_query(query), k, filter)
+
+    def similarity_search_by_vector_with_relevance_scores(self, embedding: List[float], k: int = 4, filter: Optional[dict] = None) -> List[Tuple[Document, float]]:
+        return self._top_k(embedding, k, filter)
+
+
+def create_numpy_store(documents: List[Document], embeddings, persist_dir: str,
+                       quantization: Optional[str] = NUMPY_QUANTIZATION) -> NumpyVectorStore:
+    """
+    문서를 임베딩하여 .npy(정규화 float32) + .json(문서/메타데이터)으로 저장합니다.
+    quantization="int8"이면 int8 code 행렬 + 차원별 scale도 함께 저장합니다.
+    """
+    if quantization not in (None, "int8"):
+        raise ValueError(f"지원하지 않는 NUMPY_QUANTIZATION: {quantization}")
+
+    os.makedirs(persist_dir, exist_ok=True)
+
+    vectors = embed_normalized(documents, embeddings)
+    _save_npy(os.path.join(persist_dir, VECTORS_FILE), vectors)
+
+    codes_path = os.path.join(persist_dir, INT8_CODES_FILE)
+    scale_path = os.path.join(persist_dir, INT8_SCALE_FILE)
+    codes, scale = None, None
+    if quantization == "int8":
+        codes, scale = quantize_int8(vectors)
+        _save_npy(scale_path, scale)
+        _save_npy(codes_path, codes)
+    else:
+        # 이전 빌드의 code가 남아 있으면 새 벡터와 어긋나므로 삭제
+        for path in (codes_path, scale_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    save_docstore(persist_dir, documents, int(vectors.shape[1]) if vectors.ndim == 2 else 0)
+
+    return NumpyVectorStore(vectors, documents, embeddings, persist_directory=persist_dir, codes=codes, scale=scale)
+
+
+def load_numpy_store(embeddings, persist_dir: str) -> NumpyVectorStore:
+    """
+    저장된 인덱스를 memmap으로 로딩합니다. (행렬 전체를 프로세스 메모리로 복사하지 않음)
+    int8 code가 있으면 양자화 검색을 사용하며, float32 행렬은 재계산 대상 행만 실제로 읽힙니다.
+    """
+    vectors = np.load(os.path.join(persist_dir, VECTORS_FILE), mmap_mode="r")
+    documents = load_docstore(persist_dir)
+
+    codes, scale = None, None
+    codes_path = os.path.join(persist_dir, INT8_CODES_FILE)
+    if os.path.exists(codes_path):
+        codes = np.load(codes_path, mmap_mode="r")
+        scale = np.load(os.path.join(persist_dir, INT8_SCALE_FILE))
+
+    return NumpyVectorStore(vectors, documents, embeddings, persist_directory=persist_dir, codes=codes, scale=scale)
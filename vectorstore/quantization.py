@@ -0,0 +1,39 @@
+# 임베딩 int8 스칼라 양자화
+# - 차원별 대칭 scale (scale_d = max|v_d| / 127), code = round(v / scale)
+# - 근사 유사도: code @ (query * scale) → float32 대비 1/4 크기의 행렬만 전체 스캔
+# - 상위 후보(short list)는 원본 float32 행으로 다시 계산하여 정확한 점수 반환 (NumpyVectorStore)
+
+import numpy as np
+
+# 근사 점수 계산 시 한 번에 float32로 변환할 행 수 (임시 메모리 상한)
+BLOCK_SIZE = 8192
+
+
+def quantize_int8(vectors: np.ndarray):
+    """
+    float32 행렬 -> (int8 code 행렬, 차원별 float32 scale)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.size == 0:
+        return np.zeros(vectors.shape, dtype=np.int8), np.ones(vectors.shape[1:], dtype=np.float32)
+
+    scale = np.abs(vectors).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+    return codes, scale.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    return codes.astype(np.float32) * scale
+
+
+def approximate_similarities(codes: np.ndarray, scale: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    int8 code 기반 근사 내적 (블록 단위로 변환하여 전체 행렬을 float32로 만들지 않음)
+    """
+    scaled_query = (np.asarray(query, dtype=np.float32) * scale).astype(np.float32)
+    similarities = np.empty(codes.shape[0], dtype=np.float32)
+    for start in range(0, codes.shape[0], BLOCK_SIZE):
+        block = codes[start:start + BLOCK_SIZE]
+        similarities[start:start + block.shape[0]] = block.astype(np.float32) @ scaled_query
+    return similarities
@@ -2,13 +2,49 @@
 # similarity search
 # top-k 문서 반환
 
-from typing import List, Tuple
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
-def retrieve_docs(vectordb, query: str, top_k: int) -> List[Tuple]:
+import numpy as np
+
+from app.config import (
+    USE_HYBRID_SEARCH,
+    HYBRID_LEXICAL_TOP_K,
+    RRF_K,
+    METADATA_FILTER_MIN_RESULTS,
+    MULTI_QUERY_MAX_WORKERS
+)
+from rag.metrics import get_metrics_registry
+from vectorstore.lexical_index import get_lexical_index
+from vectorstore.metadata_filter import build_where
+
+logger = logging.getLogger(__name__)
+
+# Multi-query 변형별 검색을 병렬 실행할 스레드 풀 (요청 간 공유)
+_MULTI_QUERY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MULTI_QUERY_MAX_WORKERS,
+    thread_name_prefix="rag-multi-query"
+)
+
+def retrieve_docs(vectordb, query: str, top_k: int, metadata_filter: Optional[dict] = None) -> List[Tuple]:
     """
 Chroma VectorStore를 통해 유사 문서 검색 수행
 내부적으로 ChromaDB의 HNSW 기반 벡터 인덱싱 사용
+USE_HYBRID_SEARCH 활성화 시 BM25 lexical 결과와 RRF로 병합
+metadata_filter({"chapter": "3"} 등)를 넘기면 where 절로 검색 범위를 좁힘
 """
+    where = build_where(metadata_filter)
+    if where:
+        # 필터 결과가 부족하면 전체 검색으로 재시도하므로 질의 임베딩은 1회만 계산
+        return retrieve_docs_by_vector(
+            vectordb,
+            vectordb.embeddings.embed_query(query),
+            top_k,
+            query=query,
+            metadata_filter=metadata_filter
+        )
+
     # similarity_search_with_score
     # 반환값: [(Document, score), ...]
     results = vectordb.similarity_search_with_score(
@@ -16,4 +52,163 @@ Chroma VectorStore를 통해 유사 문서 검색 수행
         k=top_k        # 충분히 큰 후보군
     )
 
+    if USE_HYBRID_SEARCH:
+        results = _fuse_with_lexical(vectordb, query, results, top_k)
+
+    return results
+
+
+def retrieve_docs_by_vector(vectordb, embedding: List[float], top_k: int, query: str = None,
+                            metadata_filter: Optional[dict] = None) -> List[Tuple]:
+    """
+미리 계산된 질의 임베딩으로 유사 문서 검색
+배치 처리 시 여러 질의의 임베딩을 embed_documents 1회로 묶기 위해 사용
+반환 score의 의미는 retrieve_docs와 동일 (거리 값, 낮을수록 유사)
+query를 함께 넘기면 Hybrid 검색(lexical 병합)도 적용
+"""
+    where = build_where(metadata_filter)
+    results = None
+
+    if where:
+        results = vectordb.similarity_search_by_vector_with_relevance_scores(
+            embedding=embedding,
+            k=top_k,
+            filter=where
+        )
+        registry = get_metrics_registry()
+        registry.increment("rag.retrieval.metadata_filter.applied")
+
+        # 필터가 잘못 추정된 경우(결과 부족) 전체 검색으로 재시도
+        if len(results) < METADATA_FILTER_MIN_RESULTS:
+            logger.info(f"[Metadata Filter] {metadata_filter} 결과 {len(results)}건 -> 전체 검색으로 재시도")
+            registry.increment("rag.retrieval.metadata_filter.fallback")
+            where, results = None, None
+        else:
+            logger.info(f"[Metadata Filter] {metadata_filter} 적용: 후보 {len(results)}건")
+
+    if results is None:
+        results = vectordb.similarity_search_by_vector_with_relevance_scores(
+            embedding=embedding,
+            k=top_k
+        )
+
+    if USE_HYBRID_SEARCH and query:
+        results = _fuse_with_lexical(vectordb, query, results, top_k, where)
+
     return results
+
+
+def retrieve_docs_multi(vectordb, queries: List[str], top_k: int, metadata_filter: Optional[dict] = None,
+                        query_vectors: Optional[dict] = None) -> List[Tuple]:
+    """
+여러 검색어 변형으로 검색 후 RRF로 병합 (Multi-query)
+모든 검색어를 embed_documents 1회로 임베딩하고, 변형별 벡터 검색은 병렬 실행
+query_vectors({검색어: 벡터})에 있는 검색어는 임베딩을 다시 계산하지 않음
+반환 score는 1 - rrf / (최대 가능 rrf) 형태의 0~1 의사 거리 (낮을수록 상위)
+"""
+    query_vectors = query_vectors or {}
+    if len(queries) == 1 and queries[0] not in query_vectors:
+        return retrieve_docs(vectordb, queries[0], top_k, metadata_filter=metadata_filter)
+
+    missing = [query for query in queries if query not in query_vectors]
+    vectors = dict(query_vectors)
+    if missing:
+        vectors.update(zip(missing, vectordb.embeddings.embed_documents(missing)))
+    embeddings = [vectors[query] for query in queries]
+
+    futures = [
+        _MULTI_QUERY_EXECUTOR.submit(
+            retrieve_docs_by_vector, vectordb, embedding, top_k,
+            query=query, metadata_filter=metadata_filter
+        )
+        for query, embedding in zip(queries, embeddings)
+    ]
+    return fuse_ranked_results([future.result() for future in futures], top_k)
+
+
+def fuse_ranked_results(results_list: List[List[Tuple]], top_k: int) -> List[Tuple]:
+    """
+여러 검색 결과([(Document, score), ...] 목록들)를 RRF로 병합
+반환 score는 1 - rrf / (최대 가능 rrf) 형태의 0~1 의사 거리 (낮을수록 상위)
+"""
+    ranked_lists = [[doc for doc, _ in results] for results in results_list]
+    max_score = len(ranked_lists) / (RRF_K + 1)
+
+    fused = reciprocal_rank_fusion(ranked_lists)[:top_k]
+    return [(doc, 1.0 - score / max_score) for doc, score in fused]
+
+
+def _doc_key(doc):
+    # 같은 문서 판별: doc_id 우선, 없으면 본문
+    return doc.metadata.get("doc_id") or doc.page_content
+
+
+def reciprocal_rank_fusion(ranked_lists: List[list], k: int = RRF_K) -> List[Tuple]:
+    """
+여러 검색 결과 목록을 RRF(Reciprocal Rank Fusion)로 병합
+ranked_lists: 순위 순으로 정렬된 Document 리스트들
+반환값: [(Document, rrf_score), ...] rrf_score 내림차순
+"""
+    scores = {}
+    documents = {}
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked, start=1):
+            key = _doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(key, doc)   # 먼저 나온 목록(dense)의 Document 객체 유지
+
+    ordered = sorted(scores, key=lambda key: scores[key], reverse=True)
+    return [(documents[key], scores[key]) for key in ordered]
+
+
+def _fuse_with_lexical(vectordb, query: str, dense_results: List[Tuple], top_k: int,
+                       where: Optional[dict] = None) -> List[Tuple]:
+    """
+dense 결과와 BM25 결과를 RRF로 병합 (BM25 색인은 vectordb와 같은 스냅샷 버전)
+반환 score는 1 - rrf / (최대 가능 rrf) 형태의 0~1 의사 거리 (낮을수록 상위)
+where가 있으면 lexical 결과도 같은 조건으로 제한
+"""
+    lexical_index = get_lexical_index(vectordb)
+    if lexical_index is None:
+        return dense_results
+
+    lexical_results = lexical_index.search(query, HYBRID_LEXICAL_TOP_K or top_k, where=where)
+
+    return fuse_ranked_results([dense_results, lexical_results], top_k)
+
+
+def get_document_vectors(vectordb, docs) -> Optional[np.ndarray]:
+    """
+색인에 저장된 문서 임베딩을 docs 순서대로 반환 (임베딩 API 호출 없음)
+NumPy / FAISS: 저장소의 document_vectors, Chroma: 컬렉션에서 doc_id로 조회
+doc_id가 없거나 색인에서 찾지 못한 문서가 있으면 None
+"""
+    doc_ids = [doc.metadata.get("doc_id") for doc in docs]
+    if not doc_ids or any(doc_id is None for doc_id in doc_ids):
+        return None
+
+    try:
+        if hasattr(vectordb, "document_vectors"):
+            return vectordb.document_vectors(doc_ids)
+
+        collection = getattr(vectordb, "_collection", None)
+        if collection is None:
+            return None
+
+        found = collection.get(
+            where={"doc_id": {"$in": list(dict.fromkeys(doc_ids))}},
+            include=["embeddings", "metadatas"]
+        )
+        if found.get("embeddings") is None:
+            return None
+        vectors = {
+            metadata.get("doc_id"): embedding
+            for metadata, embedding in zip(found["metadatas"], found["embeddings"])
+        }
+        if any(doc_id not in vectors for doc_id in doc_ids):
+            return None
+        return np.asarray([vectors[doc_id] for doc_id in doc_ids], dtype=np.float32)
+
+    except Exception as e:
+        logger.warning(f"[Retriever] 문서 임베딩 조회 실패: {e}")
+        return None
@@ -0,0 +1,140 @@
+# 버전별 벡터 인덱스 스냅샷
+# - 레이아웃: <인덱스 경로>/versions/<버전>/ (백엔드별 인덱스 파일) + <인덱스 경로>/CURRENT (현재 버전 이름)
+# - create_vector_db는 새 버전 폴더에 인덱스를 만든 뒤 CURRENT만 원자적으로 교체 (os.replace)
+#   → 서비스 중인 프로세스는 재생성 도중에도 이전 버전을 계속 읽음
+# - CURRENT가 없으면 기존 방식(인덱스 경로 자체에 저장된 인덱스)으로 간주
+# - 공개(publish)된 버전은 <인덱스 경로>/PUBLISHED에 순서대로 기록하고, 정리(prune)는 이 목록에서만 수행
+#   (생성 도중이거나 실패로 남은 폴더는 공개된 적이 없으므로 보관 / 삭제 대상으로 세지 않음)
+
+import logging
+import os
+import shutil
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+PUBLISHED_FILE = "PUBLISHED"
+VERSIONS_DIR = "versions"
+
+
+def new_snapshot_dir(root: str) -> str:
+    """
+    새 스냅샷 폴더 생성 후 경로 반환 (버전 이름 = 생성 시각, 이름 순서 = 생성 순서)
+    """
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    os.makedirs(versions_dir, exist_ok=True)
+
+    base = time.strftime("%Y%m%d-%H%M%S")
+    version, suffix = base, 1
+    while os.path.exists(os.path.join(versions_dir, version)):
+        version = f"{base}-{suffix}"
+        suffix += 1
+
+    snapshot_dir = os.path.join(versions_dir, version)
+    os.makedirs(snapshot_dir)
+    return snapshot_dir
+
+
+def publish_snapshot(root: str, snapshot_dir: str):
+    """
+    CURRENT가 snapshot_dir을 가리키도록 원자적으로 교체
+    """
+    version = os.path.basename(os.path.normpath(snapshot_dir))
+    if not os.path.isdir(os.path.join(root, VERSIONS_DIR, version)):
+        raise ValueError(f"스냅샷 폴더가 없습니다: {snapshot_dir}")
+
+    current_path = os.path.join(root, CURRENT_FILE)
+    tmp_path = current_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, current_path)
+    _append_published(root, version)
+    logger.info(f"[Snapshot] 현재 버전 교체: {version}")
+
+
+def _append_published(root: str, version: str):
+    with open(os.path.join(root, PUBLISHED_FILE), "a", encoding="utf-8") as f:
+        f.write(version + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _write_published(root: str, versions: List[str]):
+    path = os.path.join(root, PUBLISHED_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("".join(version + "\n" for version in versions))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def published_versions(root: str) -> List[str]:
+    """
+    공개된 버전 목록 (오래된 순, 다시 공개(롤백)된 버전은 마지막 공개 위치 기준)
+    """
+    try:
+        with open(os.path.join(root, PUBLISHED_FILE), "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+    except OSError:
+        return []
+
+    versions = []
+    for version in lines:
+        if version:
+            if version in versions:
+                versions.remove(version)
+            versions.append(version)
+    return versions
+
+
+def current_snapshot_version(root: str) -> Optional[str]:
+    """
+    CURRENT가 가리키는 버전 이름 (없으면 None)
+    """
+    try:
+        with open(os.path.join(root, CURRENT_FILE), "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return version or None
+
+
+def resolve_snapshot_dir(root: str) -> str:
+    """
+    로딩할 인덱스 폴더 (CURRENT가 없으면 root 자체 - 기존 방식)
+    """
+    version = current_snapshot_version(root)
+    if version is None:
+        return root
+    return os.path.join(root, VERSIONS_DIR, version)
+
+
+def prune_snapshots(root: str, keep: int):
+    """
+    공개된 적이 있는 버전 중 현재 버전을 제외하고 최근 keep개만 남기고 삭제
+    현재 버전과 그 직전에 공개된 버전(롤백 대상)은 keep과 무관하게 항상 보관하며,
+    공개된 적 없는 폴더(생성 중 / 실패)는 건드리지 않습니다.
+    """
+    versions_dir = os.path.join(root, VERSIONS_DIR)
+    published = published_versions(root)
+    if not os.path.isdir(versions_dir) or not published:
+        return
+
+    current = current_snapshot_version(root)
+    protected = {current}
+    if current in published and published.index(current) > 0:
+        protected.add(published[published.index(current) - 1])
+
+    previous = [version for version in reversed(published) if version != current]
+    kept = protected | set(previous[:max(keep, 0)])
+
+    for name in previous:
+        if name not in kept:
+            shutil.rmtree(os.path.join(versions_dir, name), ignore_errors=True)
+            logger.info(f"[Snapshot] 이전 버전 삭제: {name}")
+    _write_published(root, [version for version in published if version in kept])
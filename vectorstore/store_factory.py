@@ -0,0 +1,49 @@
+# 설정(VECTOR_BACKEND)에 따라 벡터 저장소 생성 / 로딩 함수를 선택
+
+from typing import List
+
+from langchain_core.documents import Document
+
+from app.config import VECTOR_BACKEND, VECTOR_DB_PATH, NUMPY_INDEX_PATH, FAISS_INDEX_PATH
+from vectorstore.chroma_store import create_chroma_db, load_chroma_db
+from vectorstore.numpy_store import create_numpy_store, load_numpy_store
+from vectorstore.snapshots import resolve_snapshot_dir
+
+
+def get_vector_store_path(backend: str = VECTOR_BACKEND) -> str:
+    """
+    백엔드별 저장 경로
+    """
+    if backend == "chroma":
+        return VECTOR_DB_PATH
+    if backend == "numpy":
+        return NUMPY_INDEX_PATH
+    if backend == "faiss":
+        return FAISS_INDEX_PATH
+    raise ValueError(f"지원하지 않는 VECTOR_BACKEND: {backend}")
+
+
+def create_vector_store(documents: List[Document], embeddings, persist_dir: str = None, backend: str = VECTOR_BACKEND):
+    persist_dir = persist_dir or get_vector_store_path(backend)
+    if backend == "numpy":
+        return create_numpy_store(documents, embeddings, persist_dir)
+    if backend == "faiss":
+        # faiss-cpu는 FAISS 백엔드를 쓸 때만 필요하므로 지연 import
+        from vectorstore.faiss_store import create_faiss_db
+        return create_faiss_db(documents, embeddings, persist_dir)
+    if backend == "chroma":
+        return create_chroma_db(documents, embeddings, persist_dir)
+    raise ValueError(f"지원하지 않는 VECTOR_BACKEND: {backend}")
+
+
+def load_vector_store(embeddings, persist_dir: str = None, backend: str = VECTOR_BACKEND):
+    # 버전별 스냅샷이 있으면 CURRENT가 가리키는 버전을 로딩
+    persist_dir = resolve_snapshot_dir(persist_dir or get_vector_store_path(backend))
+    if backend == "numpy":
+        return load_numpy_store(embeddings, persist_dir)
+    if backend == "faiss":
+        from vectorstore.faiss_store import load_faiss_db
+        return load_faiss_db(embeddings, persist_dir)
+    if backend == "chroma":
+        return load_chroma_db(embeddings, persist_dir)
+    raise ValueError(f"지원하지 않는 VECTOR_BACKEND: {backend}")